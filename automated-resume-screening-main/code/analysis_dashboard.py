@@ -2,17 +2,28 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
-import pandas as pd
 import numpy as np
 from matplotlib.figure import Figure
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import platform
+from results_summary import ResultsSummary
+from email_outbox import load_outbox, SMTPConnectionPool, BulkEmailSender
+from mail_merge import MailMergeTemplate, TemplateError, MERGE_FIELDS
+
+# Figures kept for the next dashboard window: name -> (summary version, figure, owner window).
+# A figure is embedded in one window at a time, it is handed over once its owner is closed
+_FIGURE_CACHE = {}
+
+# Background email senders outliving any one dashboard: SMTP settings -> sender
+_EMAIL_SENDERS = {}
 
 class AnalysisDashboard:
-    def __init__(self, parent, results, colors):
+    # Candidate cards materialized at once on the Recommendations tab
+    RECOMMENDATIONS_PAGE_SIZE = 10
+    
+    def __init__(self, parent, results, colors, summary=None, required_skills=()):
         self.window = tk.Toplevel(parent)
         self.window.title("Resume Analysis Dashboard")
         
@@ -31,6 +42,8 @@ class AnalysisDashboard:
         self.window.configure(bg=colors['background'])
         self.results = results
         self.colors = colors
+        # Skills of the job description, for the mail merge skill placeholders
+        self.required_skills = set(required_skills)
         
         # Configure styles for better appearance
         style = ttk.Style()
@@ -48,12 +61,69 @@ class AnalysisDashboard:
         self.notebook = ttk.Notebook(self.window, style='Dashboard.TNotebook')
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Create tabs
-        self.create_overview_tab()
-        self.create_skills_tab()
-        self.create_comparison_tab()
-        self.create_recommendations_tab()
-        self.create_email_tab()
+        # Aggregates come from the app's summary when it already has one
+        self.summary = summary if summary is not None else ResultsSummary(results)
+        
+        # Create empty tabs, each is rendered the first time it is selected
+        self.tabs = {}
+        self.built_tabs = set()
+        for name, text, builder in [
+            ('overview', 'Overview', self.create_overview_tab),
+            ('skills', 'Skills Analysis', self.create_skills_tab),
+            ('comparison', 'Candidate Comparison', self.create_comparison_tab),
+            ('recommendations', 'Recommendations', self.create_recommendations_tab),
+            ('email', 'Email Management', self.create_email_tab)
+        ]:
+            tab = ttk.Frame(self.notebook, style='Dashboard.TFrame')
+            self.notebook.add(tab, text=text)
+            self.tabs[name] = (tab, builder)
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.ensure_tab_built('overview')
+        
+    def on_tab_changed(self, event=None):
+        """Render the selected tab on first selection"""
+        selected = self.notebook.select()
+        for name, (tab, _) in self.tabs.items():
+            if str(tab) == selected:
+                self.ensure_tab_built(name)
+                break
+                
+    def ensure_tab_built(self, name):
+        """Build a tab's content once"""
+        if name in self.built_tabs:
+            return
+        self.built_tabs.add(name)
+        tab, builder = self.tabs[name]
+        builder(tab)
+        
+    def cached_figure(self, name, build_figure):
+        """Figure for the current results, rebuilt only when the results change"""
+        cached = _FIGURE_CACHE.get(name)
+        if cached is not None and cached[0] == self.summary.version:
+            version, fig, owner = cached
+            if not self.window_is_open(owner):
+                _FIGURE_CACHE[name] = (version, fig, self.window)
+                return fig
+            # Still shown in another open dashboard, this window gets its own copy
+            return build_figure()
+        fig = build_figure()
+        _FIGURE_CACHE[name] = (self.summary.version, fig, self.window)
+        return fig
+        
+    @staticmethod
+    def window_is_open(window):
+        try:
+            return bool(window.winfo_exists())
+        except tk.TclError:
+            return False
+        
+    def show_figure(self, fig, parent):
+        """Embed a (possibly cached) figure in a frame"""
+        canvas = FigureCanvasTkAgg(fig, master=parent)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return canvas
         
     def create_scrollable_container(self, parent):
         """Create a scrollable container for tab content"""
@@ -118,10 +188,8 @@ class AnalysisDashboard:
         
         return scrollable_frame
         
-    def create_overview_tab(self):
+    def create_overview_tab(self, overview_tab):
         """Create enhanced overview dashboard tab"""
-        overview_tab = ttk.Frame(self.notebook, style='Dashboard.TFrame')
-        self.notebook.add(overview_tab, text='Overview')
         
         content_frame = self.create_scrollable_container(overview_tab)
         
@@ -129,21 +197,12 @@ class AnalysisDashboard:
         metrics_frame = ttk.Frame(content_frame, style='Dashboard.TFrame')
         metrics_frame.pack(fill=tk.X, pady=10, padx=20)
         
-        # Calculate metrics
-        avg_score = sum(r['similarity_score'] for r in self.results) / len(self.results)
-        max_score = max(r['similarity_score'] for r in self.results)
-        total_skills = len(set(
-            skill for r in self.results 
-            for skills in r['skills'].values() 
-            for skill in skills
-        ))
-        
         # Create enhanced metric cards
         metrics = [
-            ('Total Resumes', len(self.results), '📄'),
-            ('Average Match', f"{avg_score:.1f}%", '📊'),
-            ('Top Match', f"{max_score:.1f}%", '🏆'),
-            ('Total Skills', total_skills, '🔧')
+            ('Total Resumes', len(self.summary), '📄'),
+            ('Average Match', f"{self.summary.mean_score:.1f}%", '📊'),
+            ('Top Match', f"{self.summary.max_score:.1f}%", '🏆'),
+            ('Total Skills', self.summary.unique_skills, '🔧')
         ]
         
         for icon, title, value in metrics:
@@ -176,16 +235,26 @@ class AnalysisDashboard:
         charts_frame = ttk.Frame(content_frame, style='Dashboard.TFrame')
         charts_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=20)
         
+        fig = self.cached_figure('overview', self.build_overview_figure)
+        self.show_figure(fig, charts_frame)
+        
+    def build_overview_figure(self):
+        """Score distribution and top candidates charts"""
         fig = Figure(figsize=(12, 6), dpi=100)
         fig.set_facecolor(self.colors['background'])
         
         # Enhanced score distribution
         ax1 = fig.add_subplot(121)
-        scores = [r['similarity_score'] for r in self.results]
-        n, bins, patches = ax1.hist(scores, bins=10, color=self.colors['accent'], alpha=0.7)
+        n, bins, patches = ax1.hist(
+            self.summary.bin_edges[:-1],
+            bins=self.summary.bin_edges,
+            weights=self.summary.histogram,
+            color=self.colors['accent'],
+            alpha=0.7
+        )
         
         # Add mean line
-        mean_score = np.mean(scores)
+        mean_score = self.summary.mean_score
         ax1.axvline(mean_score, color='red', linestyle='--', alpha=0.8)
         ax1.text(mean_score + 2, ax1.get_ylim()[1]*0.9, 
                  f'Mean: {mean_score:.1f}%', 
@@ -198,11 +267,7 @@ class AnalysisDashboard:
         
         # Enhanced top candidates visualization
         ax2 = fig.add_subplot(122)
-        top_candidates = sorted(
-            self.results,
-            key=lambda x: x['similarity_score'],
-            reverse=True
-        )[:5]
+        top_candidates = self.summary.top_candidates(5)
         
         names = [r['name'] or f'Candidate {i+1}' for i, r in enumerate(top_candidates)]
         scores = [r['similarity_score'] for r in top_candidates]
@@ -225,14 +290,10 @@ class AnalysisDashboard:
         ax2.grid(True, alpha=0.3)
         
         fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=charts_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return fig
         
-    def create_skills_tab(self):
+    def create_skills_tab(self, skills_tab):
         """Create enhanced skills analysis tab"""
-        skills_tab = ttk.Frame(self.notebook, style='Dashboard.TFrame')
-        self.notebook.add(skills_tab, text='Skills Analysis')
         
         content_frame = self.create_scrollable_container(skills_tab)
         
@@ -244,18 +305,10 @@ class AnalysisDashboard:
         summary_frame = ttk.Frame(top_frame, style='Dashboard.TFrame')
         summary_frame.pack(fill=tk.X, pady=10)
         
-        # Calculate skills metrics
-        all_skills = []
-        category_skills = {}
-        for result in self.results:
-            for category, skills in result['skills'].items():
-                if category not in category_skills:
-                    category_skills[category] = set()
-                category_skills[category].update(skills)
-                all_skills.extend(skills)
-        
-        unique_skills = len(set(all_skills))
-        avg_skills_per_candidate = len(all_skills) / len(self.results)
+        # Skills metrics from the shared summary
+        category_skills = self.summary.skills_by_category()
+        unique_skills = self.summary.unique_skills
+        avg_skills_per_candidate = self.summary.total_skill_mentions / max(len(self.summary), 1)
         
         # Create summary cards
         metrics = [
@@ -282,6 +335,13 @@ class AnalysisDashboard:
         charts_frame = ttk.Frame(content_frame, style='Dashboard.TFrame')
         charts_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
+        fig = self.cached_figure('skills', self.build_skills_figure)
+        self.show_figure(fig, charts_frame)
+        
+    def build_skills_figure(self):
+        """Skills by category and most common skills charts"""
+        category_skills = self.summary.skills_by_category()
+        
         fig = Figure(figsize=(12, 8), dpi=100)
         fig.set_facecolor(self.colors['background'])
         
@@ -306,7 +366,7 @@ class AnalysisDashboard:
         
         # Top skills bar chart
         ax2 = fig.add_subplot(122)
-        skill_counts = pd.Series(all_skills).value_counts()[:10]
+        skill_counts = self.summary.top_skills(10)
         
         bars = ax2.barh(
             range(len(skill_counts)),
@@ -331,14 +391,10 @@ class AnalysisDashboard:
         ax2.grid(True, alpha=0.3)
         
         fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=charts_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        return fig
         
-    def create_comparison_tab(self):
+    def create_comparison_tab(self, comparison_tab):
         """Create enhanced candidate comparison tab"""
-        comparison_tab = ttk.Frame(self.notebook, style='Dashboard.TFrame')
-        self.notebook.add(comparison_tab, text='Candidate Comparison')
         
         content_frame = self.create_scrollable_container(comparison_tab)
         
@@ -411,9 +467,94 @@ class AnalysisDashboard:
                 command=lambda c=id(candidate): self.update_comparison(c)
             ).pack(pady=(0, 10))
         
-        # Comparison visualization area
+        # Comparison visualization area, one figure and canvas reused for every toggle
         self.comparison_frame = ttk.Frame(content_frame, style='Dashboard.TFrame')
         self.comparison_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        self.create_comparison_chart(self.comparison_frame)
+        
+    def create_comparison_chart(self, parent):
+        """Create the comparison figure once, with artists updated in place"""
+        categories = ['Match Score', 'Skills', 'Experience', 'Education']
+        num_vars = len(categories)
+        self.comparison_angles = [n / float(num_vars) * 2 * np.pi for n in range(num_vars)]
+        self.comparison_angles += self.comparison_angles[:1]
+        
+        fig = Figure(figsize=(12, 8), dpi=100)
+        fig.set_facecolor(self.colors['background'])
+        
+        # Radar chart for skills comparison
+        ax1 = fig.add_subplot(121, projection='polar')
+        ax1.set_theta_offset(np.pi / 2)
+        ax1.set_theta_direction(-1)
+        ax1.set_rlabel_position(0)
+        ax1.set_xticks(self.comparison_angles[:-1])
+        ax1.set_xticklabels(categories)
+        # Fixed limits, autoscaling would invalidate the blitted background
+        ax1.set_ylim(0, 100)
+        ax1.set_title("Candidate Comparison (Normalized)", pad=20)
+        
+        # One line and fill per selectable candidate (at most 3)
+        self.comparison_lines = [
+            ax1.plot([], [], linewidth=1, linestyle='solid', animated=True)[0]
+            for _ in range(3)
+        ]
+        self.comparison_fills = [
+            ax1.fill([0], [0], alpha=0.1, color=line.get_color(), animated=True)[0]
+            for line in self.comparison_lines
+        ]
+        self.comparison_legend = ax1.legend(
+            self.comparison_lines, [''] * 3,
+            loc='upper right', bbox_to_anchor=(0.1, 0.1)
+        )
+        self.comparison_legend.set_animated(True)
+        
+        # Detailed comparison heatmap
+        ax2 = fig.add_subplot(122)
+        # A mesh rather than imshow, it redraws without resampling
+        self.comparison_image = ax2.pcolormesh(
+            np.ma.masked_all((3, num_vars)),
+            cmap='YlOrRd',
+            animated=True
+        )
+        ax2.invert_yaxis()
+        ax2.set_xticks(np.arange(num_vars) + 0.5)
+        ax2.set_xticklabels(categories)
+        ax2.set_yticks([])
+        ax2.set_title('Detailed Comparison', pad=20)
+        self.comparison_cells = [
+            [
+                ax2.text(j + 0.5, i + 0.5, '', ha='center', va='center', animated=True)
+                for j in range(num_vars)
+            ]
+            for i in range(3)
+        ]
+        self.comparison_names = [
+            ax2.text(-0.1, i + 0.5, '', ha='right', va='center', animated=True)
+            for i in range(3)
+        ]
+        
+        fig.subplots_adjust(left=0.05, right=0.97, wspace=0.45)
+        
+        self.comparison_fig = fig
+        self.comparison_background = None
+        self.comparison_canvas = FigureCanvasTkAgg(fig, master=parent)
+        # Recapture the static background whenever the canvas is fully redrawn
+        self.comparison_canvas.mpl_connect('draw_event', self.on_comparison_draw)
+        self.comparison_canvas.draw()
+        self.comparison_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+    def comparison_artists(self):
+        """Artists that change with the selection"""
+        artists = self.comparison_fills + self.comparison_lines + [self.comparison_image]
+        artists += [text for row in self.comparison_cells for text in row]
+        artists += self.comparison_names + [self.comparison_legend]
+        return artists
+        
+    def on_comparison_draw(self, event):
+        """Save the static part of the figure and draw the selection on top"""
+        self.comparison_background = self.comparison_canvas.copy_from_bbox(self.comparison_fig.bbox)
+        for artist in self.comparison_artists():
+            self.comparison_fig.draw_artist(artist)
         
     def update_comparison(self, idx):
         """Handle candidate selection for comparison"""
@@ -435,87 +576,59 @@ class AnalysisDashboard:
         self.update_comparison_charts()
         
     def update_comparison_charts(self):
-        """Update comparison visualization"""
-        # Clear previous content
-        for widget in self.comparison_frame.winfo_children():
-            widget.destroy()
-        
-        if len(self.selected_candidates) < 2:
-            return
-        
-        # Create comparison visualizations
-        fig = Figure(figsize=(12, 8), dpi=100)
-        fig.set_facecolor(self.colors['background'])
-        
-        # Radar chart for skills comparison
-        ax1 = fig.add_subplot(121, projection='polar')
-        
-        # Prepare data for radar chart
-        categories = ['Match Score', 'Skills', 'Experience', 'Education']
-        num_vars = len(categories)
-        angles = [n / float(num_vars) * 2 * np.pi for n in range(num_vars)]
-        angles += angles[:1]
+        """Update the comparison artists in place and blit them"""
+        # Nothing is compared until at least two candidates are selected
+        shown = self.selected_candidates if len(self.selected_candidates) >= 2 else []
         
-        ax1.set_theta_offset(np.pi / 2)
-        ax1.set_theta_direction(-1)
-        ax1.set_rlabel_position(0)
-        
-        plt.xticks(angles[:-1], categories)
-        
-        for idx, candidate in enumerate(self.selected_candidates):
-            values = [
+        data = np.ma.masked_all((3, 4))
+        for i, candidate in enumerate(shown):
+            data[i] = [
                 candidate['similarity_score'],
                 len([s for skills in candidate['skills'].values() for s in skills]),
                 len(candidate['job_titles']),
                 len(candidate['education'])
             ]
-            
-            # Normalize values
-            max_values = [100, 50, 10, 5]  # Approximate max values for each category
-            values = [v/m*100 for v, m in zip(values, max_values)]
-            values += values[:1]
-            
-            ax1.plot(angles, values, linewidth=1, linestyle='solid', label=candidate['name'])
-            ax1.fill(angles, values, alpha=0.1)
-        
-        ax1.set_title("Candidate Comparison (Normalized)", pad=20)
-        ax1.legend(loc='upper right', bbox_to_anchor=(0.1, 0.1))
-        
-        # Detailed comparison heatmap
-        ax2 = fig.add_subplot(122)
-        
-        data = []
-        labels = []
-        
-        for candidate in self.selected_candidates:
-            skills_count = len([s for skills in candidate['skills'].values() for s in skills])
-            data.append([
-                candidate['similarity_score'],
-                skills_count,
-                len(candidate['job_titles']),
-                len(candidate['education'])
-            ])
-            labels.append(candidate['name'] or 'Unknown')
         
-        df = pd.DataFrame(
-            data,
-            columns=categories,
-            index=labels
-        )
-        
-        sns.heatmap(df, annot=True, cmap='YlOrRd', ax=ax2, fmt='.1f')
-        ax2.set_title('Detailed Comparison', pad=20)
-        
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, master=self.comparison_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # legend_handles is matplotlib >= 3.7, older releases only have legendHandles
+        legend_handles = (getattr(self.comparison_legend, 'legend_handles', None)
+                          or self.comparison_legend.legendHandles)
+        legend_texts = self.comparison_legend.get_texts()
+        for i in range(3):
+            visible = i < len(shown)
+            line, fill = self.comparison_lines[i], self.comparison_fills[i]
+            if visible:
+                # Normalize values
+                max_values = [100, 50, 10, 5]  # Approximate max values for each category
+                values = [min(v / m * 100, 100) for v, m in zip(data[i], max_values)]
+                values += values[:1]
+                line.set_data(self.comparison_angles, values)
+                fill.set_xy(np.column_stack([self.comparison_angles, values]))
+                name = shown[i]['name'] or 'Unknown'
+                legend_texts[i].set_text(name)
+                self.comparison_names[i].set_text(name)
+                for j, text in enumerate(self.comparison_cells[i]):
+                    text.set_text(f"{data[i, j]:.1f}")
+            for artist in [line, fill, legend_handles[i], legend_texts[i], self.comparison_names[i]]:
+                artist.set_visible(visible)
+            for text in self.comparison_cells[i]:
+                text.set_visible(visible)
+        self.comparison_legend.set_visible(bool(shown))
+        
+        self.comparison_image.set_array(data)
+        if shown:
+            self.comparison_image.set_clim(data.min(), max(data.max(), data.min() + 1e-9))
+        
+        # Restore the static background and redraw only the changing artists
+        if self.comparison_background is None:
+            self.comparison_canvas.draw()
+            return
+        self.comparison_canvas.restore_region(self.comparison_background)
+        for artist in self.comparison_artists():
+            self.comparison_fig.draw_artist(artist)
+        self.comparison_canvas.blit(self.comparison_fig.bbox)
         
-    def create_recommendations_tab(self):
+    def create_recommendations_tab(self, recommendations_tab):
         """Create recommendations tab"""
-        recommendations_tab = ttk.Frame(self.notebook, style='Dashboard.TFrame')
-        self.notebook.add(recommendations_tab, text='Recommendations')
-        
         content_frame = self.create_scrollable_container(recommendations_tab)
         
         # Top candidates section
@@ -527,115 +640,179 @@ class AnalysisDashboard:
         )
         top_label.pack(pady=20)
         
-        # Sort candidates by score
-        sorted_candidates = sorted(
-            self.results,
-            key=lambda x: x['similarity_score'],
-            reverse=True
+        # Candidates ranked once, best first, with their scores for filtering
+        self.ranked_candidates = self.summary.top_candidates(len(self.summary))
+        self.ranked_scores = np.array(
+            [c['similarity_score'] for c in self.ranked_candidates], dtype=float
         )
+        self.recommendations_page = 0
+        self.recommendations_count = len(self.ranked_candidates)
+        
+        # Filter and paging controls
+        controls_frame = ttk.Frame(content_frame, style='Dashboard.TFrame')
+        controls_frame.pack(fill=tk.X, padx=20)
+        
+        ttk.Label(
+            controls_frame,
+            text="Minimum Match %:",
+            font=('Helvetica', 10, 'bold')
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.min_score_var = tk.DoubleVar(value=0.0)
+        min_score_spinbox = ttk.Spinbox(
+            controls_frame,
+            from_=0,
+            to=100,
+            increment=5,
+            width=6,
+            textvariable=self.min_score_var,
+            command=self.filter_recommendations
+        )
+        min_score_spinbox.pack(side=tk.LEFT, padx=5)
+        min_score_spinbox.bind('<Return>', lambda event: self.filter_recommendations())
+        
+        ttk.Button(
+            controls_frame,
+            text="Next ▶",
+            command=lambda: self.show_recommendations_page(self.recommendations_page + 1)
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        ttk.Button(
+            controls_frame,
+            text="◀ Previous",
+            command=lambda: self.show_recommendations_page(self.recommendations_page - 1)
+        ).pack(side=tk.RIGHT, padx=5)
+        
+        self.recommendations_status = ttk.Label(controls_frame, text="")
+        self.recommendations_status.pack(side=tk.RIGHT, padx=10)
         
         # Create candidate cards container
         cards_frame = ttk.Frame(content_frame, style='Dashboard.TFrame')
         cards_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        # Create candidate cards
-        for i, candidate in enumerate(sorted_candidates[:10]):  # Show top 10
-            self.create_candidate_card(cards_frame, candidate, i+1)
+        # A fixed pool of cards, refilled for each page instead of rebuilt
+        self.candidate_cards = [
+            self.create_candidate_card(cards_frame) for _ in range(self.RECOMMENDATIONS_PAGE_SIZE)
+        ]
+        self.show_recommendations_page(0)
         
-    def create_candidate_card(self, parent, candidate, rank):
-        """Create a detailed candidate card"""
-        card = ttk.Frame(parent, style='Card.TFrame')
-        card.pack(fill=tk.X, pady=10)
+    def filter_recommendations(self):
+        """Apply the minimum score filter and go back to the first page"""
+        try:
+            min_score = float(self.min_score_var.get())
+        except (tk.TclError, ValueError):
+            return
+        # Scores are sorted best first, so the survivors are a prefix
+        self.recommendations_count = int(np.count_nonzero(self.ranked_scores >= min_score))
+        self.show_recommendations_page(0)
+        
+    def show_recommendations_page(self, page):
+        """Fill the card pool with one page of the filtered ranking"""
+        page_size = self.RECOMMENDATIONS_PAGE_SIZE
+        last_page = max(0, (self.recommendations_count - 1) // page_size)
+        page = max(0, min(page, last_page))
+        self.recommendations_page = page
+        
+        start = page * page_size
+        stop = min(start + page_size, self.recommendations_count)
+        for offset, card in enumerate(self.candidate_cards):
+            rank = start + offset
+            if rank < stop:
+                self.populate_candidate_card(card, self.ranked_candidates[rank], rank + 1)
+                if not card['frame'].winfo_manager():
+                    card['frame'].pack(fill=tk.X, pady=10)
+            else:
+                card['frame'].pack_forget()
+        
+        if self.recommendations_count:
+            self.recommendations_status.config(
+                text=f"Showing {start + 1}-{stop} of {self.recommendations_count}"
+            )
+        else:
+            self.recommendations_status.config(text="No candidates match the filter")
+        
+    def create_candidate_card(self, parent):
+        """Create an empty candidate card, filled by populate_candidate_card"""
+        card = {'candidate': None}
+        card['frame'] = ttk.Frame(parent, style='Card.TFrame')
         
         # Header with rank and score
-        header_frame = ttk.Frame(card)
+        header_frame = ttk.Frame(card['frame'])
         header_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        rank_label = ttk.Label(
+        card['rank'] = ttk.Label(
             header_frame,
-            text=f"#{rank}",
             font=('Helvetica', 12, 'bold'),
             foreground=self.colors['accent']
         )
-        rank_label.pack(side=tk.LEFT)
+        card['rank'].pack(side=tk.LEFT)
         
-        score_label = ttk.Label(
+        card['score'] = ttk.Label(
             header_frame,
-            text=f"Match Score: {candidate['similarity_score']:.1f}%",
             font=('Helvetica', 12),
             foreground=self.colors['primary']
         )
-        score_label.pack(side=tk.RIGHT)
+        card['score'].pack(side=tk.RIGHT)
         
         # Candidate details
-        details_frame = ttk.Frame(card)
+        details_frame = ttk.Frame(card['frame'])
         details_frame.pack(fill=tk.X, padx=10, pady=5)
         
         # Left column - Basic info
         left_col = ttk.Frame(details_frame)
         left_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        ttk.Label(
-            left_col,
-            text=f"Name: {candidate['name'] or 'Not specified'}",
-            font=('Helvetica', 10)
-        ).pack(anchor='w')
-        
-        ttk.Label(
-            left_col,
-            text=f"Email: {candidate['email'] or 'Not specified'}",
-            font=('Helvetica', 10)
-        ).pack(anchor='w')
-        
-        ttk.Label(
-            left_col,
-            text=f"Phone: {candidate['phone'] or 'Not specified'}",
-            font=('Helvetica', 10)
-        ).pack(anchor='w')
+        for field in ('name', 'email', 'phone'):
+            card[field] = ttk.Label(left_col, font=('Helvetica', 10))
+            card[field].pack(anchor='w')
         
         # Right column - Skills and education
         right_col = ttk.Frame(details_frame)
         right_col.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Top skills
-        all_skills = [skill for skills in candidate['skills'].values() for skill in skills]
-        top_skills = ', '.join(all_skills[:5])
-        ttk.Label(
-            right_col,
-            text=f"Top Skills: {top_skills}",
-            font=('Helvetica', 10)
-        ).pack(anchor='w')
-        
-        # Education
-        education = candidate['education'][0] if candidate['education'] else 'Not specified'
-        ttk.Label(
-            right_col,
-            text=f"Education: {education}",
-            font=('Helvetica', 10)
-        ).pack(anchor='w')
+        for field in ('skills', 'education'):
+            card[field] = ttk.Label(right_col, font=('Helvetica', 10))
+            card[field].pack(anchor='w')
         
-        # Action buttons
-        button_frame = ttk.Frame(card)
+        # Action buttons act on whichever candidate the card currently shows
+        button_frame = ttk.Frame(card['frame'])
         button_frame.pack(fill=tk.X, padx=10, pady=5)
         
         view_btn = ttk.Button(
             button_frame,
             text="View Details",
-            command=lambda: self.show_candidate_details(candidate)
+            command=lambda: self.show_candidate_details(card['candidate'])
         )
         view_btn.pack(side=tk.LEFT, padx=5)
         
         email_btn = ttk.Button(
             button_frame,
             text="Send Email",
-            command=lambda: self.prepare_email(candidate)
+            command=lambda: self.prepare_email(card['candidate'])
         )
         email_btn.pack(side=tk.LEFT, padx=5)
         
-    def create_email_tab(self):
+        return card
+        
+    def populate_candidate_card(self, card, candidate, rank):
+        """Show a candidate in a recycled card"""
+        card['candidate'] = candidate
+        card['rank'].config(text=f"#{rank}")
+        card['score'].config(text=f"Match Score: {candidate['similarity_score']:.1f}%")
+        card['name'].config(text=f"Name: {candidate['name'] or 'Not specified'}")
+        card['email'].config(text=f"Email: {candidate['email'] or 'Not specified'}")
+        card['phone'].config(text=f"Phone: {candidate['phone'] or 'Not specified'}")
+        
+        # Top skills
+        all_skills = [skill for skills in candidate['skills'].values() for skill in skills]
+        card['skills'].config(text=f"Top Skills: {', '.join(all_skills[:5])}")
+        
+        # Education
+        education = candidate['education'][0] if candidate['education'] else 'Not specified'
+        card['education'].config(text=f"Education: {education}")
+        
+    def create_email_tab(self, email_tab):
         """Create enhanced email management tab"""
-        email_tab = ttk.Frame(self.notebook, style='Dashboard.TFrame')
-        self.notebook.add(email_tab, text='Email Management')
         
         content_frame = self.create_scrollable_container(email_tab)
         
@@ -769,13 +946,9 @@ class AnalysisDashboard:
         )
         variables_frame.pack(fill=tk.X, pady=5)
         
-        variables_text = """
-        {name} - Candidate's name
-        {score} - Match score
-        {email} - Candidate's email
-        {phone} - Candidate's phone
-        {skills} - Top skills
-        """
+        variables_text = '\n'.join(
+            f"{{{field}}} - {description}" for field, description in MERGE_FIELDS.items()
+        )
         ttk.Label(
             variables_frame,
             text=variables_text,
@@ -798,6 +971,42 @@ class AnalysisDashboard:
             text="Reset",
             command=self.reset_template
         ).pack(side=tk.LEFT, padx=5)
+        
+        # Bulk sending section
+        bulk_frame = ttk.LabelFrame(
+            content_frame,
+            text="Bulk Send",
+            padding="15",
+            style='Card.TFrame'
+        )
+        bulk_frame.pack(fill=tk.X, padx=20, pady=10)
+        
+        ttk.Label(
+            bulk_frame,
+            text="Queues this template for every shortlisted candidate with an email address "
+                 "(candidates above the Recommendations minimum match) and sends in the background.",
+            wraplength=600,
+            justify=tk.LEFT
+        ).pack(anchor='w', pady=5)
+        
+        bulk_buttons = ttk.Frame(bulk_frame)
+        bulk_buttons.pack(fill=tk.X, pady=5)
+        
+        ttk.Button(
+            bulk_buttons,
+            text="Send to Shortlist",
+            command=self.send_bulk_emails
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            bulk_buttons,
+            text="Stop Sending",
+            command=self.stop_bulk_emails
+        ).pack(side=tk.LEFT, padx=5)
+        
+        self.outbox_status = ttk.Label(bulk_frame, text="")
+        self.outbox_status.pack(anchor='w', pady=5)
+        self.poll_outbox_status()
 
     def test_email_connection(self):
         """Test SMTP connection"""
@@ -874,14 +1083,21 @@ Recruitment Team"""
         
     def prepare_email(self, candidate):
         """Prepare email to candidate"""
+        self.ensure_tab_built('email')
         self.notebook.select(4)  # Switch to email tab
         
         # Fill template with candidate info
-        template = self.template_text.get('1.0', tk.END)
-        email_content = template.format(
-            name=candidate['name'] or "Candidate",
-            score=f"{candidate['similarity_score']:.1f}"
-        )
+        try:
+            rank = self.summary.top_candidates(len(self.summary)).index(candidate) + 1
+        except ValueError:
+            rank = 1
+        try:
+            email_subject, email_content = self.current_template().render(
+                candidate, self.required_skills, rank
+            )
+        except TemplateError as e:
+            messagebox.showerror("Template Error", str(e))
+            return
         
         # Create email dialog
         dialog = tk.Toplevel(self.window)
@@ -895,7 +1111,7 @@ Recruitment Team"""
         
         ttk.Label(dialog, text="Subject:").pack(padx=20, pady=5, anchor='w')
         subject_entry = ttk.Entry(dialog, width=50)
-        subject_entry.insert(0, "Your Job Application")
+        subject_entry.insert(0, email_subject or "Your Job Application")
         subject_entry.pack(padx=20, pady=5)
         
         ttk.Label(dialog, text="Message:").pack(padx=20, pady=5, anchor='w')
@@ -914,6 +1130,87 @@ Recruitment Team"""
         )
         send_btn.pack(pady=20)
         
+    def current_template(self):
+        """Compile the subject and body in the editor"""
+        return MailMergeTemplate(
+            self.subject_entry.get(),
+            self.template_text.get('1.0', 'end-1c')
+        )
+        
+    def shortlisted_candidates(self):
+        """Candidates passing the Recommendations filter, best first"""
+        if hasattr(self, 'ranked_candidates'):
+            return self.ranked_candidates[:self.recommendations_count]
+        return self.summary.top_candidates(len(self.summary))
+        
+    def get_email_sender(self):
+        """Background sender for the current SMTP settings, shared across dashboards"""
+        settings = (
+            self.smtp_entry.get(),
+            int(self.port_entry.get()),
+            self.email_entry.get(),
+            self.password_entry.get()
+        )
+        sender = _EMAIL_SENDERS.get(settings)
+        if sender is None:
+            # Only one set of settings sends at a time
+            for other in _EMAIL_SENDERS.values():
+                other.stop(timeout=0)
+            _EMAIL_SENDERS.clear()
+            pool = SMTPConnectionPool(settings[0], settings[1], settings[2], settings[3])
+            sender = _EMAIL_SENDERS[settings] = BulkEmailSender(load_outbox(), pool, settings[2])
+        return sender
+        
+    def send_bulk_emails(self):
+        """Queue the current template for the shortlist and send it in the background"""
+        candidates = self.shortlisted_candidates()
+        recipients = sum(1 for c in candidates if c['email'])
+        if not recipients:
+            messagebox.showwarning("Warning", "No shortlisted candidates have an email address")
+            return
+        if not messagebox.askyesno(
+            "Bulk Send",
+            f"Queue emails to {recipients} shortlisted candidates?"
+        ):
+            return
+        
+        try:
+            # Every message is rendered before any is queued, so a bad template queues nothing
+            template = self.current_template()
+            sender = self.get_email_sender()
+            queued = sender.outbox.enqueue_many(
+                template.render_many(candidates, self.required_skills)
+            )
+            sender.start()
+            messagebox.showinfo("Bulk Send", f"{queued} emails queued for sending")
+        except TemplateError as e:
+            messagebox.showerror("Template Error", str(e))
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to queue emails: {str(e)}")
+        self.poll_outbox_status(reschedule=False)
+        
+    def stop_bulk_emails(self):
+        """Stop background sending, leaving unsent emails in the outbox"""
+        for sender in _EMAIL_SENDERS.values():
+            sender.stop(timeout=0)
+        self.poll_outbox_status(reschedule=False)
+        
+    def poll_outbox_status(self, reschedule=True):
+        """Show outbox counts, refreshing every second while the window is open"""
+        try:
+            counts = load_outbox().counts()
+            sending = any(sender.is_running() for sender in _EMAIL_SENDERS.values())
+            self.outbox_status.config(
+                text=f"Outbox: {counts['pending'] + counts['sending']} queued, "
+                     f"{counts['sent']} sent, {counts['failed']} failed"
+                     f"{' (sending...)' if sending else ''}"
+            )
+        except Exception as e:
+            print(f"Error reading email outbox: {str(e)}")
+        if reschedule and self.window.winfo_exists():
+            self.window.after(1000, self.poll_outbox_status)
+        
     def send_email(self, to_email, subject, message):
         """Send email to candidate"""
         try:
@@ -977,7 +1274,7 @@ Match Score: {candidate['similarity_score']:.1f}%\n
             
         # Experience
         text.insert(tk.END, "\nJob Titles:\n", 'subheading')
-        for title in candidate['job_titles']:
+        for title in candidate.get('canonical_titles') or candidate['job_titles']:
             text.insert(tk.END, f"• {title}\n")
             
         # Skills by category
@@ -0,0 +1,157 @@
+import time
+import numpy as np
+from job_profile import compile_job_profile
+from skill_index import SkillIndex
+
+def format_stage_report(stage_stats):
+    """Format stage-by-stage survivor counts and timings"""
+    lines = []
+    for stats in stage_stats:
+        lines.append(
+            f"{stats['stage']}: {stats['input']} -> {stats['survivors']} "
+            f"({stats['seconds']:.2f}s)"
+        )
+    return '\n'.join(lines)
+
+class CascadeScreener:
+    def __init__(self, resume_parser, top_k=20, min_skill_matches=1, must_have=(),
+                 title_resolver=None, title_graph=None, title_boost=5.0):
+        self.resume_parser = resume_parser
+        self.title_resolver = title_resolver
+        self.title_graph = title_graph
+        self.title_boost = title_boost
+        self.top_k = top_k
+        self.min_skill_matches = min_skill_matches
+        self.must_have = set(must_have)
+
+    def prefilter(self, resume_texts, job_profile):
+        """Stage 1: keep resumes sharing enough skills with the job description"""
+        resume_skills = [self.resume_parser.extract_skills(text) for text in resume_texts]
+        survivors = self.prefilter_skills(resume_skills, job_profile)
+        return survivors, [resume_skills[idx] for idx in survivors]
+
+    def prefilter_skills(self, resume_skills, job_profile):
+        """Stage 1 over already extracted skills, returning the surviving indices"""
+        required_skills = job_profile.required_skills
+
+        # Without recognised skills in the job there is nothing to match on
+        skill_index = SkillIndex.build(resume_skills)
+        keep = skill_index.filter(
+            must_have=self.must_have,
+            nice_to_have=required_skills,
+            min_nice_to_have=self.min_skill_matches if required_skills else 0
+        )
+        return np.flatnonzero(keep).tolist()
+
+    def score(self, resume_texts, job_profile):
+        """Stage 2: cosine scores (in %) for all resumes in one pass"""
+        return job_profile.score_texts(resume_texts)
+
+    def extract_details(self, resume_path, resume_text, similarity_score, skills=None):
+        """Stage 3: full NLTK-based extraction for a single resume"""
+        name = self.resume_parser.extract_names(resume_text)
+        email = self.resume_parser.extract_emails(resume_text)
+        phone = self.resume_parser.extract_phone_number(resume_text)
+        education = self.resume_parser.extract_education(resume_text)
+        job_titles = self.resume_parser.extract_job_titles(resume_text)
+        if skills is None:
+            skills = self.resume_parser.extract_skills(resume_text)
+        canonical_titles = (
+            self.title_resolver.resolve_many(job_titles) if self.title_resolver else []
+        )
+
+        return {
+            'resume_path': resume_path,
+            'name': name,
+            'email': email[0] if email else None,
+            'phone': phone,
+            'education': list(education),
+            'job_titles': job_titles,
+            'canonical_titles': canonical_titles,
+            'skills': skills,
+            'similarity_score': float(similarity_score)
+        }
+
+    def target_titles(self, job_description):
+        """The job's title plus its related titles"""
+        if self.title_resolver is None or self.title_graph is None:
+            return []
+        titles = self.title_resolver.find_titles(job_description)
+        if not titles:
+            return []
+        # Single words such as 'senior' are titles too, prefer the most specific one
+        target = max(titles, key=lambda title: len(title.split()))
+        return self.title_graph.expand([target])
+
+    def boost_related_titles(self, result, targets):
+        """Boost a result holding the job's title or one of its related titles"""
+        matches = [t for t in result.get('canonical_titles', []) if t in targets]
+        result['title_matches'] = matches
+        result['title_boost'] = self.title_boost if matches else 0.0
+        return result
+
+    def run(self, resume_paths, resume_texts, job_description,
+            on_result=None, on_progress=None, should_stop=None, extract_details=None):
+        """Run all stages, returning shortlisted results and stage statistics
+
+        on_result(result) and on_progress(done, total) are called as each
+        shortlisted resume finishes extraction, and the extraction stops early
+        once should_stop() returns True. extract_details replaces
+        self.extract_details for stage 3, e.g. to reuse stored results.
+        """
+        extract_details = extract_details or self.extract_details
+        stage_stats = []
+        job_profile = compile_job_profile(job_description, self.resume_parser)
+
+        # Stage 1: cheap skills/keyword prefilter over every resume
+        start = time.perf_counter()
+        survivors, survivor_skills = self.prefilter(resume_texts, job_profile)
+        stage_stats.append({
+            'stage': 'Skills prefilter',
+            'input': len(resume_texts),
+            'survivors': len(survivors),
+            'seconds': time.perf_counter() - start
+        })
+
+        # Stage 2: vectorized similarity over the survivors, keep the top K
+        start = time.perf_counter()
+        scores = self.score([resume_texts[idx] for idx in survivors], job_profile)
+        shortlist = np.argsort(-scores, kind='stable')[:self.top_k]
+        stage_stats.append({
+            'stage': 'Similarity ranking',
+            'input': len(survivors),
+            'survivors': len(shortlist),
+            'seconds': time.perf_counter() - start
+        })
+
+        # Stage 3: expensive extraction only for the shortlist
+        start = time.perf_counter()
+        targets = set(self.target_titles(job_description))
+        results = []
+        for done, pos in enumerate(shortlist, 1):
+            if should_stop is not None and should_stop():
+                break
+            idx = survivors[pos]
+            try:
+                result = self.boost_related_titles(extract_details(
+                    resume_paths[idx],
+                    resume_texts[idx],
+                    scores[pos],
+                    survivor_skills[pos]
+                ), targets)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+            except Exception as e:
+                print(f"Error processing resume {resume_paths[idx]}: {str(e)}")
+            if on_progress is not None:
+                on_progress(done, len(shortlist))
+        results.sort(key=lambda r: r['similarity_score'] + r['title_boost'], reverse=True)
+        stage_stats.append({
+            'stage': 'Full extraction',
+            'input': len(shortlist),
+            'survivors': len(results),
+            'seconds': time.perf_counter() - start
+        })
+
+        return results, stage_stats
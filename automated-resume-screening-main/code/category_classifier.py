@@ -0,0 +1,154 @@
+import os
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import classification_report
+from resume_dedup import deduplicate_dataframe
+
+# Bump when the features or the model type change
+CATEGORY_MODEL_VERSION = 2
+
+def file_hash(path):
+    """Hash a file's contents to key cached models"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+class ResumeCategoryClassifier:
+    def __init__(self, n_features=2**16):
+        # Hashing keeps the feature space fixed without storing a vocabulary
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            stop_words='english',
+            alternate_sign=False,
+            norm=None
+        )
+        self.transformer = TfidfTransformer(sublinear_tf=True)
+        self.model = LogisticRegression(max_iter=1000, C=10.0)
+        self.dataset_hash = None
+
+    @property
+    def categories(self):
+        return list(self.model.classes_)
+
+    def _features(self, texts):
+        texts = [t if isinstance(t, str) else '' for t in texts]
+        return self.transformer.transform(self.vectorizer.transform(texts))
+
+    def fit(self, texts, labels):
+        """Fit the classifier on resume texts and category labels"""
+        texts = [t if isinstance(t, str) else '' for t in texts]
+        counts = self.vectorizer.transform(texts)
+        self.model.fit(self.transformer.fit_transform(counts), labels)
+        # Halve the size of the persisted model, precision is not needed here
+        self.model.coef_ = self.model.coef_.astype(np.float32)
+        return self
+
+    def predict_many(self, texts):
+        """Predict categories and confidences (in %) for a batch of texts"""
+        if len(texts) == 0:
+            return np.empty(0, dtype=object), np.empty(0)
+        probabilities = self.model.predict_proba(self._features(texts))
+        best = probabilities.argmax(axis=1)
+        labels = self.model.classes_[best]
+        confidences = probabilities[np.arange(len(best)), best] * 100
+        return labels, confidences
+
+    def predict(self, text):
+        """Predict the category of a single resume"""
+        labels, confidences = self.predict_many([text])
+        return labels[0], float(confidences[0])
+
+    def save(self, model_path):
+        """Serialize the trained classifier"""
+        os.makedirs(os.path.dirname(model_path), exist_ok=True)
+        with open(model_path, 'wb') as f:
+            pickle.dump({
+                'version': CATEGORY_MODEL_VERSION,
+                'n_features': self.vectorizer.n_features,
+                'transformer': self.transformer,
+                'model': self.model,
+                'dataset_hash': self.dataset_hash
+            }, f)
+
+    @classmethod
+    def load(cls, model_path):
+        """Load a serialized classifier"""
+        with open(model_path, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') != CATEGORY_MODEL_VERSION:
+            raise ValueError("Category model version mismatch, please retrain it")
+
+        classifier = cls(n_features=data['n_features'])
+        classifier.transformer = data['transformer']
+        classifier.model = data['model']
+        classifier.dataset_hash = data['dataset_hash']
+        return classifier
+
+def load_training_data(dataset_path):
+    """Load labelled resumes, dropping near-duplicate rows"""
+    df = pd.read_csv(dataset_path)
+    df = df.dropna(subset=['Category', 'Resume'])
+    df, removed = deduplicate_dataframe(df, text_column='Resume')
+    if removed:
+        print(f"Removed {removed} near-duplicate rows")
+    return df
+
+def train_category_classifier(dataset_path, test_size=0.0):
+    """Train a classifier on the labelled resume dataset"""
+    df = load_training_data(dataset_path)
+
+    if test_size:
+        train_df, test_df = train_test_split(
+            df, test_size=test_size, random_state=42
+        )
+        classifier = ResumeCategoryClassifier().fit(train_df.Resume.tolist(), train_df.Category)
+        predicted, _ = classifier.predict_many(test_df.Resume.tolist())
+        print(classification_report(test_df.Category, predicted, zero_division=0))
+
+    classifier = ResumeCategoryClassifier().fit(df.Resume.tolist(), df.Category)
+    classifier.dataset_hash = file_hash(dataset_path)
+    return classifier
+
+def get_default_model_path(base_path=None):
+    """Default location of the category model inside the datasets cache folder"""
+    if base_path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'datasets', 'cache', 'category_classifier.pkl')
+
+def load_or_train_category_classifier(dataset_path, model_path=None):
+    """Load the cached classifier, retraining when the dataset has changed"""
+    model_path = model_path or get_default_model_path()
+    try:
+        if os.path.exists(model_path):
+            classifier = ResumeCategoryClassifier.load(model_path)
+            if classifier.dataset_hash == file_hash(dataset_path):
+                return classifier
+    except Exception as e:
+        print(f"Error loading category model: {str(e)}")
+
+    try:
+        classifier = train_category_classifier(dataset_path)
+        classifier.save(model_path)
+        return classifier
+    except Exception as e:
+        print(f"Error training category model: {str(e)}")
+        return None
+
+def main():
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    dataset_path = os.path.join(base_path, 'datasets', 'UpdatedResumeDataSet.csv')
+
+    print("Evaluating category classifier on a holdout split...")
+    classifier = train_category_classifier(dataset_path, test_size=0.2)
+    classifier.save(get_default_model_path(base_path))
+    print(f"Saved classifier for {len(classifier.categories)} categories")
+
+if __name__ == "__main__":
+    main()
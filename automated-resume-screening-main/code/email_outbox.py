@@ -0,0 +1,356 @@
+import os
+import time
+import queue
+import sqlite3
+import smtplib
+import threading
+from contextlib import contextmanager
+from email.mime.text import MIMEText
+
+def get_default_outbox_path(base_path=None):
+    """Default location of the outbox database inside the datasets cache folder"""
+    if base_path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'datasets', 'cache', 'email_outbox.sqlite3')
+
+class EmailOutbox:
+    """Persisted queue of outgoing messages backed by SQLite"""
+
+    def __init__(self, db_path, lease_seconds=600):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        # Messages left 'sending' for longer than this belong to a sender that died
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    to_addr TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    next_attempt REAL NOT NULL DEFAULT 0,
+                    claimed REAL,
+                    created REAL NOT NULL,
+                    sent REAL
+                )
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(messages)")}
+            if 'claimed' not in columns:
+                self._conn.execute("ALTER TABLE messages ADD COLUMN claimed REAL")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS messages_due ON messages (status, next_attempt)"
+            )
+
+    def enqueue(self, to_addr, subject, body):
+        """Queue one message and return its id"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO messages (to_addr, subject, body, created) VALUES (?, ?, ?, ?)",
+                (to_addr, subject, body, time.time())
+            )
+            return cursor.lastrowid
+
+    def enqueue_many(self, messages):
+        """Queue (to_addr, subject, body) tuples from any iterable, all or nothing
+
+        The iterable is consumed before the first insert, so an error while rendering
+        leaves nothing queued and retrying cannot send duplicates.
+        """
+        now = time.time()
+        rows = [(to_addr, subject, body, now) for to_addr, subject, body in messages]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO messages (to_addr, subject, body, created) VALUES (?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def claim(self, limit):
+        """Mark up to `limit` due messages as sending and return them
+
+        Messages another sender claimed more than lease_seconds ago are taken over,
+        their sender is assumed to have crashed.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            # Take the write lock up front so other processes cannot claim the same rows
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT id, to_addr, subject, body, attempts FROM messages "
+                "WHERE (status = 'pending' AND next_attempt <= ?) "
+                "OR (status = 'sending' AND COALESCE(claimed, 0) < ?) ORDER BY id LIMIT ?",
+                (now, now - self.lease_seconds, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE messages SET status = 'sending', claimed = ? WHERE id = ?",
+                [(now, row[0]) for row in rows]
+            )
+        return rows
+
+    def mark_sent(self, message_id):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE messages SET status = 'sent', sent = ?, attempts = attempts + 1 WHERE id = ?",
+                (time.time(), message_id)
+            )
+
+    def mark_failed(self, message_id, error, retry_at=None):
+        """Record a failed attempt, rescheduling it unless retry_at is None"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE messages SET status = ?, attempts = attempts + 1, last_error = ?, "
+                "next_attempt = ? WHERE id = ?",
+                ('pending' if retry_at is not None else 'failed',
+                 str(error), retry_at or 0, message_id)
+            )
+
+    def release(self, message_ids):
+        """Put claimed messages back without counting an attempt"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE messages SET status = 'pending' WHERE id = ? AND status = 'sending'",
+                [(message_id,) for message_id in message_ids]
+            )
+
+    def counts(self):
+        """Number of messages in each status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM messages GROUP BY status"
+            ).fetchall()
+        counts = {'pending': 0, 'sending': 0, 'sent': 0, 'failed': 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# Outboxes opened in this process, keyed by database path
+_OPEN_OUTBOXES = {}
+
+def load_outbox(db_path=None):
+    """Open an outbox once per process, so all senders share one connection"""
+    db_path = os.path.abspath(db_path or get_default_outbox_path())
+    outbox = _OPEN_OUTBOXES.get(db_path)
+    if outbox is None:
+        outbox = _OPEN_OUTBOXES[db_path] = EmailOutbox(db_path)
+    return outbox
+
+class SMTPConnectionPool:
+    """Logged-in SMTP connections reused across messages"""
+
+    def __init__(self, host, port, username=None, password=None, size=2,
+                 use_tls=True, max_uses=5, timeout=30, smtp_factory=smtplib.SMTP):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        # Servers often cap messages per session, so connections are
+        # recycled after this many borrows (one batch of messages each)
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self.smtp_factory = smtp_factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        server = self.smtp_factory(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            # Never leak the socket of a session that failed to set up
+            server.close()
+            raise
+        return [server, 0]
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, opening one when none is idle"""
+        self._slots.acquire()
+        entry = None
+        try:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                entry = self._connect()
+            yield entry[0]
+            entry[1] += 1
+            if entry[1] >= self.max_uses:
+                self._quit(entry[0])
+            else:
+                self._idle.put(entry)
+        except Exception:
+            # A failed session may be unusable, never hand it out again
+            if entry is not None:
+                self._quit(entry[0])
+            raise
+        finally:
+            self._slots.release()
+
+    def _quit(self, server):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                self._quit(self._idle.get_nowait()[0])
+            except queue.Empty:
+                break
+
+class RateLimiter:
+    """Spaces calls evenly to at most `rate` per second across threads"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+class BulkEmailSender:
+    """Background threads that drain an outbox through a connection pool"""
+
+    # Longest pause between reconnects while the server keeps failing
+    MAX_PAUSE = 600.0
+
+    def __init__(self, outbox, pool, from_addr, workers=2, batch_size=20,
+                 rate_limit=5.0, max_attempts=5, backoff=30.0, poll_interval=1.0):
+        self.outbox = outbox
+        self.pool = pool
+        self.from_addr = from_addr
+        self.workers = workers
+        self.batch_size = batch_size
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+        self._pause_lock = threading.Lock()
+        self._connection_failures = 0
+        self._paused_until = 0.0
+
+    def start(self):
+        """Start the sender threads"""
+        if self.is_running() and not self._stop.is_set():
+            return
+        # Let threads from an earlier stop finish their message first
+        for thread in self._threads:
+            thread.join()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True) for _ in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=None):
+        """Stop after the messages being sent now, leaving the rest queued"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self.pool.close()
+
+    def is_running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def _run(self):
+        while not self._stop.is_set():
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                self._stop.wait(pause)
+                continue
+            batch = self.outbox.claim(self.batch_size)
+            if not batch:
+                self._stop.wait(self.poll_interval)
+                continue
+            self.send_batch(batch)
+
+    def send_batch(self, batch):
+        """Send claimed messages over one pooled connection"""
+        remaining = list(batch)
+        in_flight = None
+        try:
+            with self.pool.connection() as server:
+                while remaining:
+                    if self._stop.is_set():
+                        break
+                    in_flight = remaining.pop(0)
+                    message_id, to_addr, subject, body, attempts = in_flight
+                    self.rate_limiter.wait()
+                    try:
+                        server.send_message(self._build_message(to_addr, subject, body))
+                        in_flight = None
+                    except smtplib.SMTPRecipientsRefused as e:
+                        # Retrying will not help a rejected address
+                        in_flight = None
+                        self.outbox.mark_failed(message_id, e)
+                        continue
+                    except smtplib.SMTPResponseException as e:
+                        in_flight = None
+                        if e.smtp_code >= 500:
+                            # Permanent rejection
+                            self.outbox.mark_failed(message_id, e)
+                        else:
+                            self._retry_later(message_id, attempts, e)
+                        continue
+                    self.outbox.mark_sent(message_id)
+            self._connection_ok()
+        except Exception as e:
+            # Connection level failure: only the message on the wire counts an attempt,
+            # and the sender pauses so the rest of the batch does not spin on reconnects
+            print(f"Error sending email batch: {str(e)}")
+            if in_flight is not None:
+                message_id, _, _, _, attempts = in_flight
+                self._retry_later(message_id, attempts, e)
+            self._connection_failed()
+        finally:
+            self.outbox.release([row[0] for row in remaining])
+
+    def _connection_ok(self):
+        with self._pause_lock:
+            self._connection_failures = 0
+
+    def _connection_failed(self):
+        """Pause every sender thread, doubling the pause on each failure in a row"""
+        with self._pause_lock:
+            self._connection_failures += 1
+            pause = min(self.backoff * 2 ** (self._connection_failures - 1), self.MAX_PAUSE)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def _retry_later(self, message_id, attempts, error):
+        """Reschedule with exponential backoff, giving up after max_attempts"""
+        attempts += 1
+        if attempts >= self.max_attempts:
+            self.outbox.mark_failed(message_id, error)
+        else:
+            retry_at = time.time() + self.backoff * 2 ** (attempts - 1)
+            self.outbox.mark_failed(message_id, error, retry_at)
+
+    def _build_message(self, to_addr, subject, body):
+        msg = MIMEText(body, 'plain')
+        msg['From'] = self.from_addr
+        msg['To'] = to_addr
+        msg['Subject'] = subject
+        return msg
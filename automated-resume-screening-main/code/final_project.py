@@ -8,6 +8,8 @@ import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer 
 from sklearn.metrics.pairwise import cosine_similarity
+from resume_dedup import MinHashDeduplicator
+from lsa_index import load_lsa_index
 
 class ResumeScreener:
     def __init__(self):
@@ -103,6 +105,11 @@ class ResumeScreener:
         # Extract text from PDFs
         df['text'] = df['path'].apply(self.extract_text_from_pdf)
         
+        # Keep one representative per group of near-duplicate resumes
+        representatives, duplicates = MinHashDeduplicator().deduplicate(df.text.tolist())
+        df['duplicates'] = [[df.path[d] for d in duplicates.get(i, [])] for i in range(len(df))]
+        df = df.iloc[representatives].reset_index(drop=True)
+        
         # Extract information
         df['name'] = df.text.apply(self.extract_names)
         df['phone'] = df.text.apply(self.extract_phone_number)
@@ -115,7 +122,7 @@ class ResumeScreener:
         
         return df
 
-    def calculate_similarities(self, df, job_description):
+    def calculate_similarities(self, df, job_description, lsa_index=None):
         """Calculate similarity between resumes and job description."""
         # Add job description to dataframe
         new_row = pd.DataFrame({'path':'job_description', 'text': job_description}, index=[0])
@@ -147,7 +154,14 @@ class ResumeScreener:
         df = df.drop(0)
         df.reset_index(drop=True, inplace=True)
         
-        return df[['path', 'name', 'email', 'similarity']]
+        columns = ['path', 'name', 'email', 'similarity']
+        
+        # Add semantic similarity from a prebuilt LSA index
+        if lsa_index is not None:
+            df['semantic_similarity'] = lsa_index.similarity(df.text.tolist(), job_description)
+            columns.append('semantic_similarity')
+        
+        return df[columns]
 
 def main():
     # Initialize screener
@@ -167,7 +181,7 @@ def main():
     
     print("Calculating similarities...")
     # Calculate similarities and get results
-    results = screener.calculate_similarities(df, job_description)
+    results = screener.calculate_similarities(df, job_description, load_lsa_index())
     
     # Display results
     print("\nRanked Results:")
@@ -0,0 +1,326 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+from resume_parser import ResumeParser
+from job_profile import compile_job_profile
+from cascade_screening import CascadeScreener
+from title_resolver import load_title_resolver
+from result_store import SQLiteResultStore, get_default_results_path
+
+_REASONS = {
+    200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+# Per-process state of the pool workers, set up by init_worker
+_WORKER = {}
+
+def init_worker(base_path, job_description):
+    """Load the parser and extraction helpers once per worker process"""
+    sys.stdout = sys.stderr
+    resume_parser = ResumeParser(base_path)
+    _WORKER['cascade'] = CascadeScreener(
+        resume_parser,
+        title_resolver=load_title_resolver(
+            os.path.join(base_path, 'datasets', 'job_titles_set.csv')
+        )
+    )
+    _WORKER['job_profile'] = (
+        compile_job_profile(job_description, resume_parser) if job_description else None
+    )
+
+def ingest_resume(resume_path):
+    """Worker: parse and fully extract one uploaded resume"""
+    cascade = _WORKER['cascade']
+    text = cascade.resume_parser.parse_resume(resume_path)
+    if not text:
+        raise ValueError("No text could be extracted from the resume")
+    job_profile = _WORKER['job_profile']
+    score = job_profile.score_text(text) if job_profile is not None else 0.0
+    return cascade.extract_details(resume_path, text, score)
+
+class LatencyTracker:
+    """Recent latencies and their percentiles"""
+
+    def __init__(self, size=1000):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+    def percentiles(self):
+        if not self.samples:
+            return {'p50': None, 'p90': None, 'p99': None}
+        p50, p90, p99 = np.percentile(np.fromiter(self.samples, dtype=float), [50, 90, 99])
+        return {'p50': round(p50, 3), 'p90': round(p90, 3), 'p99': round(p99, 3)}
+
+class IngestionServer:
+    """Accepts resume uploads over HTTP and screens them in a process pool
+
+    POST /resumes?filename=...   PDF bytes; 202 once queued, 503 when the queue stays full
+    GET  /resumes/<id>           status, and the result once screened
+    GET  /metrics                queue depth, in-flight work, counters and latency percentiles
+    """
+
+    def __init__(self, store, upload_dir, job_description=None, workers=None,
+                 queue_size=100, enqueue_timeout=2.0, max_upload_bytes=10 * 2**20,
+                 base_path=None):
+        if base_path is None:
+            base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.store = store
+        self.upload_dir = upload_dir
+        os.makedirs(upload_dir, exist_ok=True)
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.enqueue_timeout = enqueue_timeout
+        self.max_upload_bytes = max_upload_bytes
+        # Forked workers would inherit open client sockets and keep them from closing
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(base_path, job_description)
+        )
+
+        # Uploads not yet stored: id -> {'status', 'filename', 'error'}
+        self.jobs = {}
+        # Uploads still waiting for room in the queue: id -> future of whether they got in
+        self._enqueuing = {}
+        self.queue = None
+        self.in_flight = 0
+        self.counters = {'accepted': 0, 'rejected': 0, 'completed': 0, 'failed': 0}
+        self.queue_wait = LatencyTracker()
+        self.processing_time = LatencyTracker()
+        self.total_latency = LatencyTracker()
+        self._consumers = []
+
+    async def start(self, host='127.0.0.1', port=8766):
+        """Start the consumers and the HTTP listener"""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        # One consumer per worker process keeps in-flight work bounded by the pool
+        self._consumers = [asyncio.create_task(self.consume()) for _ in range(self.workers)]
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def stop(self):
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def enqueue(self, data, filename=None):
+        """Save an upload and queue it, waiting up to enqueue_timeout for room"""
+        # Ids are content hashes, so uploading the same file twice is a no-op
+        resume_id = hashlib.sha1(data).hexdigest()[:16]
+        if resume_id not in self.jobs and await self.load_result(resume_id) is not None:
+            return resume_id, True
+        job = self.jobs.get(resume_id)
+        if job is not None and job['status'] != 'failed':
+            pending = self._enqueuing.get(resume_id)
+            if pending is not None:
+                # Same answer as the original upload, which may still be turned away
+                return resume_id, await asyncio.shield(pending)
+            return resume_id, True
+
+        extension = os.path.splitext(filename or '')[1] or '.pdf'
+        path = os.path.join(self.upload_dir, f"{resume_id}{extension}")
+        with open(path, 'wb') as f:
+            f.write(data)
+        self.jobs[resume_id] = {'status': 'queued', 'filename': filename, 'error': None}
+        pending = self._enqueuing[resume_id] = asyncio.get_running_loop().create_future()
+        queued = False
+        try:
+            await asyncio.wait_for(
+                self.queue.put((resume_id, path, time.monotonic())),
+                self.enqueue_timeout
+            )
+            queued = True
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            del self._enqueuing[resume_id]
+            pending.set_result(queued)
+            if not queued:
+                del self.jobs[resume_id]
+                os.remove(path)
+        if not queued:
+            self.counters['rejected'] += 1
+            return resume_id, False
+        self.counters['accepted'] += 1
+        return resume_id, True
+
+    async def load_result(self, resume_id):
+        """Stored result of an upload, read off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.store.get, resume_id)
+
+    async def consume(self):
+        """Move queued uploads through the process pool into the result store"""
+        loop = asyncio.get_running_loop()
+        while True:
+            resume_id, path, enqueued = await self.queue.get()
+            started = time.monotonic()
+            self.queue_wait.add(started - enqueued)
+            self.in_flight += 1
+            job = self.jobs[resume_id]
+            job['status'] = 'processing'
+            try:
+                result = await loop.run_in_executor(self.pool, ingest_resume, path)
+                result['resume_id'] = resume_id
+                result['filename'] = job['filename']
+                # SQLite writes run off the event loop
+                await loop.run_in_executor(None, self.store.save, resume_id, result)
+                self.counters['completed'] += 1
+                del self.jobs[resume_id]
+            except Exception as e:
+                print(f"Error screening upload {resume_id}: {str(e)}")
+                job['status'] = 'failed'
+                job['error'] = str(e)
+                self.counters['failed'] += 1
+            finally:
+                finished = time.monotonic()
+                self.processing_time.add(finished - started)
+                self.total_latency.add(finished - enqueued)
+                self.in_flight -= 1
+                self.queue.task_done()
+
+    async def metrics(self):
+        loop = asyncio.get_running_loop()
+        stored_results = await loop.run_in_executor(None, len, self.store)
+        return {
+            'queue_depth': self.queue.qsize(),
+            'queue_capacity': self.queue_size,
+            'in_flight': self.in_flight,
+            'workers': self.workers,
+            'stored_results': stored_results,
+            **self.counters,
+            'queue_wait_seconds': self.queue_wait.percentiles(),
+            'processing_seconds': self.processing_time.percentiles(),
+            'latency_seconds': self.total_latency.percentiles()
+        }
+
+    async def status(self, resume_id):
+        job = self.jobs.get(resume_id)
+        if job is not None:
+            return 200, {'id': resume_id, **job}
+        result = await self.load_result(resume_id)
+        if result is not None:
+            return 200, {'id': resume_id, 'status': 'done', 'result': result}
+        # The upload may have finished while the store was being read
+        job = self.jobs.get(resume_id)
+        if job is not None:
+            return 200, {'id': resume_id, **job}
+        return 404, {'error': f"Unknown resume id {resume_id}"}
+
+    async def handle_connection(self, reader, writer):
+        """Serve one HTTP/1.1 request per connection"""
+        try:
+            status, payload, headers = await self.handle_request(reader)
+        except Exception as e:
+            print(f"Error handling request: {str(e)}")
+            status, payload, headers = 500, {'error': str(e)}, {}
+        body = json.dumps(payload).encode('utf-8')
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+                'Content-Type: application/json',
+                f'Content-Length: {len(body)}',
+                'Connection: close']
+        head += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_request(self, reader):
+        request_line = (await reader.readline()).decode('latin-1').split()
+        if len(request_line) < 2:
+            return 400, {'error': "Malformed request"}, {}
+        method, target = request_line[0], request_line[1]
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlparse(target)
+        if url.path == '/metrics' and method == 'GET':
+            return 200, await self.metrics(), {}
+        if url.path.startswith('/resumes/') and method == 'GET':
+            status, payload = await self.status(url.path[len('/resumes/'):])
+            return status, payload, {}
+        if url.path == '/resumes':
+            if method != 'POST':
+                return 405, {'error': "Use POST to upload a resume"}, {}
+            try:
+                length = int(headers.get('content-length') or 0)
+            except ValueError:
+                return 400, {'error': "Malformed Content-Length header"}, {}
+            if length <= 0:
+                return 400, {'error': "Empty upload"}, {}
+            if length > self.max_upload_bytes:
+                return 413, {'error': f"Uploads are limited to {self.max_upload_bytes} bytes"}, {}
+            try:
+                data = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                return 400, {'error': "Upload is shorter than its Content-Length"}, {}
+            filename = parse_qs(url.query).get('filename', [None])[0]
+            resume_id, queued = await self.enqueue(data, filename)
+            if not queued:
+                # Backpressure: tell the client to come back instead of buffering more
+                return 503, {'error': "Ingestion queue is full", 'id': resume_id}, {'Retry-After': '5'}
+            return 202, {'id': resume_id, 'queue_depth': self.queue.qsize()}, {}
+        return 404, {'error': f"Unknown endpoint {url.path}"}, {}
+
+async def serve(args):
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    job_description = None
+    if args.job_description:
+        with open(args.job_description, 'r', encoding='utf-8') as f:
+            job_description = f.read()
+
+    server = IngestionServer(
+        SQLiteResultStore(args.db or get_default_results_path(base_path)),
+        args.upload_dir or os.path.join(base_path, 'datasets', 'cache', 'uploads'),
+        job_description=job_description,
+        workers=args.workers,
+        queue_size=args.queue_size
+    )
+    listener = await server.start(args.host, args.port)
+    print(f"Ingestion server listening on http://{args.host}:{args.port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Asynchronous resume ingestion server")
+    parser.add_argument('--host', default='127.0.0.1', help="address to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8766, help="port to listen on (default: 8766)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--queue-size', type=int, default=100,
+                        help="uploads waiting for a worker before new ones are refused (default: 100)")
+    parser.add_argument('--job-description', help="job description file to score uploads against")
+    parser.add_argument('--db', help="results database (default: datasets/cache/results.sqlite3)")
+    parser.add_argument('--upload-dir', help="where uploads are kept (default: datasets/cache/uploads)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
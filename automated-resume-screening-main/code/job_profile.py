@@ -0,0 +1,126 @@
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+# Stateless vectorizer shared by every profile, so resumes and job
+# descriptions land in the same space without refitting. Terms are weighted
+# by plain term frequency (no IDF), so similarity scores are TF cosine
+# similarities: words common to every resume count as much as rare ones,
+# and scores differ from the TF-IDF scores that were fitted per run before.
+_VECTORIZER = HashingVectorizer(
+    n_features=2**20,
+    stop_words='english',
+    alternate_sign=False,
+    norm='l2'
+)
+
+# Shared by the GUI worker, HTTP handler and micro-batcher threads
+_PROFILE_CACHE = OrderedDict()
+_PROFILE_CACHE_SIZE = 32
+_PROFILE_CACHE_LOCK = threading.Lock()
+
+EDUCATION_LEVELS = {
+    'phd': 4,
+    'master': 3,
+    'bachelor': 2,
+    'diploma': 1
+}
+
+# One combined pattern so each text is scanned once. Terms must end on a word
+# boundary (a lookahead, as "m.s." ends in a dot) so "mastercard" is not a master
+_EDUCATION_PATTERN = re.compile(
+    r"\b(?:(?P<phd>ph\.?\s?d|doctorate|doctoral)"
+    # A bare "master" is a role as often as a degree ("scrum master"), so it needs context
+    r"|(?P<master>(?<!scrum )(?:master'?s|master(?=\s+(?:degree|of|in)\b))|m\.?sc|m\.?tech|m\.s\.|m\.a\.|mba)"
+    r"|(?P<bachelor>bachelor'?s?|b\.?sc|b\.?tech|b\.s\.|b\.a\.|b\.e\.|university degree|undergraduate)"
+    r"|(?P<diploma>diploma|associate degree|college))(?!\w)"
+)
+
+_EXPERIENCE_PATTERN = re.compile(
+    r'(?i)(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b(?:\s+of)?(?:\s+\w+){0,3}\s+experience'
+)
+
+def detect_education_levels(text):
+    """Return the education levels mentioned in a text"""
+    found = {match.lastgroup for match in _EDUCATION_PATTERN.finditer((text or '').lower())}
+    return [level for level in EDUCATION_LEVELS if level in found]
+
+def highest_education_level(text):
+    """Return the rank of the highest education level in a text (0 if none)"""
+    levels = detect_education_levels(text)
+    return max((EDUCATION_LEVELS[level] for level in levels), default=0)
+
+def estimate_experience_years(text):
+    """Estimate years of experience stated in a text"""
+    years = [int(match) for match in _EXPERIENCE_PATTERN.findall(text or '')]
+    return max(years, default=0)
+
+def vectorize_texts(texts):
+    """Vectorize texts into the shared hashed term space"""
+    return _VECTORIZER.transform([t if isinstance(t, str) else '' for t in texts])
+
+class JobProfile:
+    def __init__(self, description, vector, skills_by_category,
+                 required_experience, required_education):
+        self.description = description
+        self.vector = vector
+        self.skills_by_category = skills_by_category
+        self.required_skills = {
+            skill for skills in skills_by_category.values() for skill in skills
+        }
+        self.required_experience = required_experience
+        self.required_education = required_education
+
+    @property
+    def required_education_level(self):
+        """Rank of the lowest education level the job accepts"""
+        return min((EDUCATION_LEVELS[level] for level in self.required_education), default=0)
+
+    def score_vectors(self, resume_vectors):
+        """TF cosine similarity (in %) between vectorized resumes and the job"""
+        similarities = (resume_vectors @ self.vector.T).toarray().ravel()
+        return np.round(similarities * 100, 2)
+
+    def score_texts(self, resume_texts):
+        """Cosine similarity (in %) between resume texts and the job"""
+        if len(resume_texts) == 0:
+            return np.empty(0)
+        return self.score_vectors(vectorize_texts(resume_texts))
+
+    def score_text(self, resume_text):
+        """Cosine similarity (in %) between a single resume and the job"""
+        return float(self.score_texts([resume_text])[0])
+
+def compile_job_profile(job_description, resume_parser=None):
+    """Compile a job description once, caching it by the hash of its text"""
+    job_description = job_description or ''
+    key = hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+    if resume_parser is not None:
+        matcher = getattr(resume_parser, 'skill_matcher', None)
+        key += f":{matcher.version if matcher is not None else id(resume_parser.skills_db)}"
+
+    with _PROFILE_CACHE_LOCK:
+        profile = _PROFILE_CACHE.get(key)
+        if profile is not None:
+            _PROFILE_CACHE.move_to_end(key)
+            return profile
+
+    skills = resume_parser.extract_skills(job_description) if resume_parser else {}
+    profile = JobProfile(
+        description=job_description,
+        vector=vectorize_texts([job_description]),
+        skills_by_category=skills,
+        required_experience=estimate_experience_years(job_description),
+        required_education=detect_education_levels(job_description)
+    )
+
+    with _PROFILE_CACHE_LOCK:
+        # Another thread may have compiled the same job meanwhile, keep its profile
+        profile = _PROFILE_CACHE.setdefault(key, profile)
+        _PROFILE_CACHE.move_to_end(key)
+        if len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+            _PROFILE_CACHE.popitem(last=False)
+    return profile
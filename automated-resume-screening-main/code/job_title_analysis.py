@@ -1,15 +1,108 @@
 import re
 import nltk
 from nltk.corpus import stopwords
+import numpy as np
 import pandas as pd
 import os
+from scipy.sparse import csr_matrix
+from category_classifier import file_hash
+
+# Bump when the features or the labelling rules change
+JOB_TITLE_MODEL_VERSION = 1
+
+# Regex tokenization so titles can be split with vectorized string operations
+_TITLE_TOKEN_PATTERN = r"\w+(?:'\w+)?|[^\w\s]"
+
+# Analyzed titles kept in memory, the same titles recur across resumes
+_TITLE_CACHE_SIZE = 10000
+
+def first_title(title):
+    """Extract the first title from a compound title"""
+    title = re.sub(r"\b[Cc]o[\-\ ]","", title)
+    split_titles = re.split(r"\,|\-|\||\&|\:|\/|\band\b", title)
+    return split_titles[0].strip()
+
+class NaiveBayesTitleModel:
+    """Array form of a trained NLTK NaiveBayesClassifier that loads in milliseconds"""
+
+    def __init__(self, labels, log_prior, feature_names, log_likelihood):
+        self.labels = list(labels)
+        self.log_prior = np.asarray(log_prior, dtype=np.float64)
+        self.feature_names = list(feature_names)
+        self.feature_index = {name: i for i, name in enumerate(self.feature_names)}
+        # (n_features, n_labels) log P(feature present | label)
+        self.log_likelihood = np.asarray(log_likelihood, dtype=np.float64)
+
+    @classmethod
+    def from_nltk(cls, classifier):
+        """Extract priors and feature likelihoods from an NLTK classifier"""
+        labels = classifier.labels()
+        feature_names = sorted({fname for _, fname in classifier._feature_probdist})
+        log_likelihood = np.array([
+            [classifier._feature_probdist[label, fname].logprob(True) for label in labels]
+            for fname in feature_names
+        ]) * np.log(2)
+        log_prior = np.array([classifier._label_probdist.logprob(label) for label in labels]) * np.log(2)
+        return cls(labels, log_prior, feature_names, log_likelihood)
+
+    def prob_classify(self, features):
+        """Return the most likely label and its probability"""
+        rows = [self.feature_index[f] for f in features if f in self.feature_index]
+        scores = self.log_prior + self.log_likelihood[rows].sum(axis=0)
+        probabilities = np.exp(scores - scores.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    def feature_matrix(self, feature_dicts):
+        """Binary sparse (n_titles, n_features) matrix of known features"""
+        indptr = [0]
+        indices = []
+        for features in feature_dicts:
+            indices.extend(self.feature_index[f] for f in features if f in self.feature_index)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float64)
+        return csr_matrix(
+            (data, indices, indptr),
+            shape=(len(feature_dicts), len(self.feature_names))
+        )
+
+    def prob_classify_many(self, feature_dicts):
+        """Most likely labels and their probabilities for many titles in one product"""
+        if len(feature_dicts) == 0:
+            return np.empty(0, dtype=object), np.empty(0)
+        scores = self.feature_matrix(feature_dicts) @ self.log_likelihood + self.log_prior
+        probabilities = np.exp(scores - scores.max(axis=1, keepdims=True))
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        labels = np.array(self.labels, dtype=object)[best]
+        return labels, probabilities[np.arange(len(best)), best]
+
+    def to_arrays(self, prefix):
+        return {
+            f'{prefix}_labels': np.array(self.labels),
+            f'{prefix}_log_prior': self.log_prior,
+            f'{prefix}_features': np.array(self.feature_names),
+            f'{prefix}_log_likelihood': self.log_likelihood
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix):
+        return cls(
+            arrays[f'{prefix}_labels'].tolist(),
+            arrays[f'{prefix}_log_prior'],
+            arrays[f'{prefix}_features'].tolist(),
+            arrays[f'{prefix}_log_likelihood']
+        )
 
 class JobTitleAnalyzer:
-    def __init__(self, dataset_path='datasets/job_titles_set.csv'):
+    def __init__(self, dataset_path='datasets/job_titles_set.csv', cache_dir=None):
         self.stop_words = set(stopwords.words("english"))
         self.dataset_path = dataset_path
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(dataset_path), 'cache')
         self.responsibilities_classifier = None
         self.departments_classifier = None
+        self._title_cache = {}
         
         # Download required NLTK data
         try:
@@ -19,61 +112,96 @@ class JobTitleAnalyzer:
             nltk.download('punkt')
             nltk.download('stopwords')
 
+    def _model_path(self):
+        """Cache path for models trained on the current dataset"""
+        return os.path.join(
+            self.cache_dir,
+            f"job_title_models_v{JOB_TITLE_MODEL_VERSION}_{file_hash(self.dataset_path)}.npz"
+        )
+
     def load_and_train_classifiers(self):
-        """Load job titles from CSV and train the classifiers"""
+        """Load cached classifiers, or train them from the CSV and cache them"""
         try:
+            model_path = self._model_path()
+            if os.path.exists(model_path):
+                try:
+                    with np.load(model_path) as arrays:
+                        self.responsibilities_classifier = NaiveBayesTitleModel.from_arrays(
+                            arrays, 'responsibilities'
+                        )
+                        self.departments_classifier = NaiveBayesTitleModel.from_arrays(
+                            arrays, 'departments'
+                        )
+                    return True
+                except Exception as e:
+                    print(f"Error loading cached job title models: {str(e)}")
+
             df = pd.read_csv(self.dataset_path)
-            raw_job_titles = []
-
-            for _, row in df.iterrows():
-                title = row['title']
-                related_titles = str(row['top related titles']).split(',')
-                
-                # Determine responsibility and department
-                responsibility, department = self._categorize_job(related_titles)
-                raw_job_titles.append({
-                    "title": title,
-                    "responsibility": responsibility,
-                    "department": department
-                })
+            responsibilities, departments = self._categorize_jobs(df['top related titles'])
 
             # Train classifiers
-            self._train_classifiers(raw_job_titles)
+            self._train_classifiers(df['title'], responsibilities, departments)
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez(
+                model_path,
+                **self.responsibilities_classifier.to_arrays('responsibilities'),
+                **self.departments_classifier.to_arrays('departments')
+            )
             return True
         except Exception as e:
             print(f"Error loading job titles: {str(e)}")
             return False
 
-    def _categorize_job(self, related_titles):
-        """Categorize job based on related titles"""
-        related_text = ' '.join(related_titles).lower()
-        
-        if any(word in related_text for word in ['technical', 'engineer', 'developer']):
-            return "Technical", "Engineering"
-        elif any(word in related_text for word in ['manage', 'director', 'lead']):
-            return "Management", "Management"
-        elif any(word in related_text for word in ['sales', 'account']):
-            return "Sales", "Sales"
-        return "Other", "Other"
-
-    def _train_classifiers(self, raw_job_titles):
-        """Train the classifiers with the job titles data"""
-        responsibility_features = [
-            (self.get_title_features(title['title']), title['responsibility']) 
-            for title in raw_job_titles
-        ]
-        department_features = [
-            (self.get_title_features(title['title']), title['department']) 
-            for title in raw_job_titles
+    def _categorize_jobs(self, related_titles):
+        """Categorize jobs based on their related titles"""
+        related_text = related_titles.fillna('nan').astype(str).str.replace(',', ' ').str.lower()
+
+        conditions = [
+            related_text.str.contains('technical|engineer|developer'),
+            related_text.str.contains('manage|director|lead'),
+            related_text.str.contains('sales|account')
         ]
-        
-        self.responsibilities_classifier = nltk.NaiveBayesClassifier.train(responsibility_features)
-        self.departments_classifier = nltk.NaiveBayesClassifier.train(department_features)
+        responsibilities = np.select(conditions, ["Technical", "Management", "Sales"], "Other").tolist()
+        departments = np.select(conditions, ["Engineering", "Management", "Sales"], "Other").tolist()
+        return responsibilities, departments
+
+    def _train_classifiers(self, titles, responsibilities, departments):
+        """Train the classifiers with the job titles data"""
+        features = self.get_titles_features(titles)
+
+        self.responsibilities_classifier = NaiveBayesTitleModel.from_nltk(
+            nltk.NaiveBayesClassifier.train(list(zip(features, responsibilities)))
+        )
+        self.departments_classifier = NaiveBayesTitleModel.from_nltk(
+            nltk.NaiveBayesClassifier.train(list(zip(features, departments)))
+        )
+
+    def get_titles_features(self, titles):
+        """Extract features for a Series of job titles with vectorized string operations"""
+        titles = pd.Series(titles, dtype=object).fillna('').astype(str).reset_index(drop=True)
+
+        tokens = titles.str.findall(_TITLE_TOKEN_PATTERN).explode().dropna()
+        tokens = tokens[~tokens.isin(self.stop_words)].str.lower()
+
+        grouped = tokens.groupby(level=0)
+        contains = ('contains(' + tokens + ')').groupby(level=0).agg(list)
+        first = ('first(' + grouped.first() + ')')
+        last = ('last(' + grouped.last() + ')')
+
+        features = [{} for _ in range(len(titles))]
+        for idx, names in contains.items():
+            feature_dict = features[idx]
+            for name in names:
+                feature_dict[name] = True
+            feature_dict[first[idx]] = True
+            feature_dict[last[idx]] = True
+        return features
 
     def get_title_features(self, title):
         """Extract features from a job title"""
         features = {}
-        word_tokens = nltk.word_tokenize(title)
+        word_tokens = re.findall(_TITLE_TOKEN_PATTERN, title)
         filtered_words = [w for w in word_tokens if w not in self.stop_words]
         
         for word in filtered_words:
@@ -93,24 +221,57 @@ class JobTitleAnalyzer:
 
         features = self.get_title_features(title)
         
-        # Get classifications
-        responsibility = self.responsibilities_classifier.classify(features)
-        department = self.departments_classifier.classify(features)
-        
-        # Get confidence scores
-        resp_prob = self.responsibilities_classifier.prob_classify(features)
-        dept_prob = self.departments_classifier.prob_classify(features)
+        # Get classifications with confidence scores
+        responsibility, resp_prob = self.responsibilities_classifier.prob_classify(features)
+        department, dept_prob = self.departments_classifier.prob_classify(features)
         
         return {
             'title': title,
             'responsibility': responsibility,
             'department': department,
-            'responsibility_confidence': round(100 * resp_prob.prob(resp_prob.max())),
-            'department_confidence': round(100 * dept_prob.prob(dept_prob.max()))
+            'responsibility_confidence': round(100 * resp_prob),
+            'department_confidence': round(100 * dept_prob)
+        }
+
+    def analyze_titles(self, titles):
+        """Analyze many job titles at once, returning labels and confidences as arrays"""
+        if not self.responsibilities_classifier or not self.departments_classifier:
+            if not self.load_and_train_classifiers():
+                return None
+
+        titles = [t if isinstance(t, str) else '' for t in titles]
+        analyzed = {}
+        unseen = []
+        for title in dict.fromkeys(titles):
+            if title in self._title_cache:
+                analyzed[title] = self._title_cache[title]
+            else:
+                unseen.append(title)
+
+        # Score only titles not seen before, all in one matrix product per model
+        if unseen:
+            features = self.get_titles_features(unseen)
+            responsibilities, resp_probs = self.responsibilities_classifier.prob_classify_many(features)
+            departments, dept_probs = self.departments_classifier.prob_classify_many(features)
+            for row in zip(unseen, responsibilities, departments, resp_probs, dept_probs):
+                title, responsibility, department, resp_prob, dept_prob = row
+                analyzed[title] = (
+                    responsibility, department, round(100 * resp_prob), round(100 * dept_prob)
+                )
+
+            if len(self._title_cache) + len(unseen) > _TITLE_CACHE_SIZE:
+                self._title_cache.clear()
+            self._title_cache.update((title, analyzed[title]) for title in unseen)
+
+        rows = [analyzed[title] for title in titles]
+        return {
+            'title': np.array(titles, dtype=object),
+            'responsibility': np.array([row[0] for row in rows], dtype=object),
+            'department': np.array([row[1] for row in rows], dtype=object),
+            'responsibility_confidence': np.array([row[2] for row in rows], dtype=np.int64),
+            'department_confidence': np.array([row[3] for row in rows], dtype=np.int64)
         }
 
     def get_first_title(self, title):
         """Extract the first title from a compound title"""
-        title = re.sub(r"[Cc]o[\-\ ]","", title)
-        split_titles = re.split(r"\,|\-|\||\&|\:|\/|and", title)
-        return split_titles[0].strip()
\ No newline at end of file
+        return first_title(title)
\ No newline at end of file
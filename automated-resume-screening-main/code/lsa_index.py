@@ -0,0 +1,159 @@
+import os
+import json
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import TruncatedSVD
+from resume_dedup import deduplicate_dataframe
+
+# Bump when the on-disk layout or the fitted pipeline changes
+LSA_INDEX_VERSION = 1
+
+class LSAIndex:
+    def __init__(self, n_components=100, random_state=42):
+        self.n_components = n_components
+        self.random_state = random_state
+        self.vectorizer = None
+        self.svd = None
+        self.embeddings = None
+        self.ids = []
+        self.model_id = None
+
+    def fit(self, texts, ids=None):
+        """Fit TF-IDF and TruncatedSVD on a corpus and embed it"""
+        texts = [t if isinstance(t, str) else '' for t in texts]
+        self.ids = list(ids) if ids is not None else list(range(len(texts)))
+
+        self.vectorizer = TfidfVectorizer(
+            stop_words='english',
+            sublinear_tf=True,
+            min_df=2,
+            dtype=np.float32
+        )
+        tfidf_matrix = self.vectorizer.fit_transform(texts)
+
+        # Components cannot exceed the rank of the TF-IDF matrix
+        n_components = min(self.n_components, min(tfidf_matrix.shape) - 1)
+        self.svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        self.embeddings = self._normalize(self.svd.fit_transform(tfidf_matrix))
+
+        digest = hashlib.sha1()
+        for text in texts:
+            digest.update(text.encode('utf-8', 'ignore'))
+        digest.update(f"{n_components}:{self.random_state}".encode())
+        self.model_id = digest.hexdigest()[:16]
+        return self
+
+    def _normalize(self, vectors):
+        """L2-normalize rows so a dot product is a cosine similarity"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def embed(self, texts):
+        """Project texts into the LSA space"""
+        texts = [t if isinstance(t, str) else '' for t in texts]
+        return self._normalize(self.svd.transform(self.vectorizer.transform(texts)))
+
+    def similarity(self, texts, job_description):
+        """Cosine similarity (in %) between each text and the job description"""
+        if not texts:
+            return np.empty(0, dtype=np.float32)
+        query = self.embed([job_description])[0]
+        return np.clip(self.embed(texts) @ query, 0, 1) * 100
+
+    def rank(self, job_description, top_k=10):
+        """Rank indexed documents against a job description"""
+        query = self.embed([job_description])[0]
+        scores = self.embeddings @ query  # single matrix-vector product
+
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i]) * 100) for i in top]
+
+    def save(self, index_dir):
+        """Save the model, embeddings and metadata to a directory"""
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(os.path.join(index_dir, 'embeddings.npy'), self.embeddings)
+
+        with open(os.path.join(index_dir, 'model.pkl'), 'wb') as f:
+            pickle.dump({'vectorizer': self.vectorizer, 'svd': self.svd}, f)
+
+        meta = {
+            'version': LSA_INDEX_VERSION,
+            'model_id': self.model_id,
+            'n_components': int(self.embeddings.shape[1]),
+            'random_state': self.random_state,
+            'ids': [str(i) for i in self.ids]
+        }
+        with open(os.path.join(index_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, index_dir):
+        """Load a saved index, memory-mapping the embeddings"""
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        if meta.get('version') != LSA_INDEX_VERSION:
+            raise ValueError(
+                f"LSA index version {meta.get('version')} does not match "
+                f"expected version {LSA_INDEX_VERSION}, please rebuild it"
+            )
+
+        index = cls(n_components=meta['n_components'], random_state=meta['random_state'])
+        with open(os.path.join(index_dir, 'model.pkl'), 'rb') as f:
+            model = pickle.load(f)
+        index.vectorizer = model['vectorizer']
+        index.svd = model['svd']
+        index.embeddings = np.load(os.path.join(index_dir, 'embeddings.npy'), mmap_mode='r')
+        index.ids = meta['ids']
+        index.model_id = meta['model_id']
+        return index
+
+def get_default_index_dir(base_path=None):
+    """Default location of the LSA index inside the datasets cache folder"""
+    if base_path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'datasets', 'cache', 'lsa_index')
+
+def load_lsa_index(index_dir=None):
+    """Load the LSA index if one has been built, otherwise return None"""
+    index_dir = index_dir or get_default_index_dir()
+    if not os.path.exists(os.path.join(index_dir, 'meta.json')):
+        return None
+    try:
+        return LSAIndex.load(index_dir)
+    except Exception as e:
+        print(f"Error loading LSA index: {str(e)}")
+        return None
+
+def build_lsa_index(dataset_path, index_dir=None, n_components=100):
+    """Fit the LSA index on the labelled resume dataset and save it"""
+    index_dir = index_dir or get_default_index_dir()
+
+    df = pd.read_csv(dataset_path)
+    df, removed = deduplicate_dataframe(df, text_column='Resume')
+    if removed:
+        print(f"Removed {removed} near-duplicate rows")
+
+    index = LSAIndex(n_components=n_components)
+    index.fit(df['Resume'].tolist(), ids=df.index.tolist())
+    index.save(index_dir)
+    return index
+
+def main():
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    dataset_path = os.path.join(base_path, 'datasets', 'UpdatedResumeDataSet.csv')
+
+    print("Building LSA index...")
+    index = build_lsa_index(dataset_path)
+    print(f"Saved {len(index.ids)} embeddings ({index.embeddings.shape[1]} dimensions) "
+          f"to {get_default_index_dir(base_path)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import string
+
+# Placeholders a template may use and what they stand for
+MERGE_FIELDS = {
+    'name': "Candidate's name",
+    'score': 'Match score',
+    'email': "Candidate's email",
+    'phone': "Candidate's phone",
+    'skills': 'Top skills',
+    'matched_skills': 'Skills shared with the job description',
+    'missing_skills': 'Job description skills the candidate lacks',
+    'education': 'Highest listed education',
+    'job_title': 'Most recent job title',
+    'category': 'Predicted resume category',
+    'semantic_score': 'Semantic match score',
+    'rank': 'Position in the shortlist'
+}
+
+_FORMATTER = string.Formatter()
+
+class TemplateError(ValueError):
+    """Raised when a template uses a placeholder it cannot fill"""
+
+class Score(float):
+    """Percentage that prints with one decimal unless a format spec is given"""
+
+    def __format__(self, format_spec):
+        return super().__format__(format_spec or '.1f')
+
+    def __str__(self):
+        return format(self)
+
+class NotAvailable:
+    """Value of a field the candidate has no data for"""
+
+    def __format__(self, format_spec):
+        return 'n/a'
+
+    def __str__(self):
+        return 'n/a'
+
+    def __repr__(self):
+        # {field!r} and {field!a} should read the same as {field}
+        return 'n/a'
+
+# Stand-in values used to check format specs when a template is compiled
+_SAMPLE_VALUES = {field: '' for field in MERGE_FIELDS}
+_SAMPLE_VALUES.update({'score': Score(0), 'semantic_score': Score(0), 'rank': 1})
+
+def _join(skills, limit=None):
+    return ', '.join(list(skills)[:limit]) if skills else 'n/a'
+
+def candidate_skills(candidate):
+    """All skills of a candidate in extraction order"""
+    return [skill for skills in candidate['skills'].values() for skill in skills]
+
+def field_values(candidate, required_skills=frozenset(), rank=1, fields=MERGE_FIELDS):
+    """Placeholder values for one candidate, computing only the requested fields"""
+    values = {}
+    needs_skills = not {'skills', 'matched_skills', 'missing_skills'}.isdisjoint(fields)
+    skills = candidate_skills(candidate) if needs_skills else []
+    for field in fields:
+        if field == 'name':
+            values[field] = candidate['name'] or 'Candidate'
+        elif field == 'score':
+            values[field] = Score(candidate['similarity_score'])
+        elif field == 'email':
+            values[field] = candidate['email'] or ''
+        elif field == 'phone':
+            values[field] = candidate['phone'] or ''
+        elif field == 'skills':
+            values[field] = _join(skills, 5)
+        elif field == 'matched_skills':
+            values[field] = _join([skill for skill in skills if skill in required_skills])
+        elif field == 'missing_skills':
+            held = set(skills)
+            values[field] = _join(sorted(skill for skill in required_skills if skill not in held))
+        elif field == 'education':
+            values[field] = candidate['education'][0] if candidate['education'] else NotAvailable()
+        elif field == 'job_title':
+            titles = candidate.get('job_titles') or []
+            values[field] = titles[0] if titles else NotAvailable()
+        elif field == 'category':
+            values[field] = candidate.get('category') or NotAvailable()
+        elif field == 'semantic_score':
+            semantic_score = candidate.get('semantic_score')
+            values[field] = Score(semantic_score) if semantic_score is not None else NotAvailable()
+        elif field == 'rank':
+            values[field] = rank
+    return values
+
+def compile_template(text):
+    """Split a template into literal text and (field, conversion, format_spec) parts"""
+    parts = []
+    try:
+        parsed = list(_FORMATTER.parse(text))
+    except ValueError as e:
+        raise TemplateError(f"Invalid template: {str(e)}")
+
+    for literal, field, format_spec, conversion in parsed:
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if field not in MERGE_FIELDS:
+            raise TemplateError(f"Unknown placeholder {{{field}}}")
+        if '{' in format_spec:
+            raise TemplateError(f"Nested placeholders are not supported in {{{field}}}")
+        try:
+            format(_FORMATTER.convert_field(_SAMPLE_VALUES[field], conversion), format_spec)
+        except ValueError as e:
+            raise TemplateError(f"Invalid format for {{{field}}}: {str(e)}")
+        parts.append((field, conversion, format_spec))
+    return parts
+
+def _render(parts, values):
+    return ''.join(
+        part if isinstance(part, str)
+        else format(_FORMATTER.convert_field(values[part[0]], part[1]), part[2])
+        for part in parts
+    )
+
+class MailMergeTemplate:
+    """Subject and body compiled once and rendered for many candidates"""
+
+    def __init__(self, subject, body):
+        self.subject = subject
+        self.body = body
+        self._subject_parts = compile_template(subject)
+        self._body_parts = compile_template(body)
+        self.fields = {
+            part[0] for part in self._subject_parts + self._body_parts
+            if not isinstance(part, str)
+        }
+
+    def render(self, candidate, required_skills=frozenset(), rank=1):
+        """Subject and body for one candidate"""
+        values = field_values(candidate, required_skills, rank, self.fields)
+        return _render(self._subject_parts, values), _render(self._body_parts, values)
+
+    def render_many(self, candidates, required_skills=()):
+        """Yield (to_addr, subject, body) for each candidate with an email, in rank order"""
+        required_skills = set(required_skills)
+        for rank, candidate in enumerate(candidates, 1):
+            if not candidate['email']:
+                continue
+            subject, body = self.render(candidate, required_skills, rank)
+            yield candidate['email'], subject, body
@@ -3,12 +3,23 @@ from tkinter import ttk, scrolledtext, filedialog, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import seaborn as sns
-import pandas as pd
 import os
 import json
+import time
+import queue
+import threading
 from resume_parser import ResumeParser
 from job_title_analysis import JobTitleAnalyzer
-from similarity_calculation import calculate_similarity
+from job_profile import compile_job_profile
+from resume_dedup import MinHashDeduplicator
+from lsa_index import load_lsa_index
+from category_classifier import load_or_train_category_classifier
+from cascade_screening import CascadeScreener, format_stage_report
+from title_resolver import load_title_resolver
+from related_titles import load_related_title_graph
+from result_store import ResultStore, RESULT_COLUMNS
+from results_summary import ResultsSummary
+from work_queue import WorkQueue, get_default_queue_path, make_run_id, default_worker_id
 import numpy as np
 
 class ResumeScreeningApp:
@@ -34,7 +45,8 @@ class ResumeScreeningApp:
         self.style.configure('Treeview', 
                            background=self.colors['background'],
                            fieldbackground=self.colors['background'],
-                           foreground=self.colors['text'])
+                           foreground=self.colors['text'],
+                           rowheight=22)
         
         self.style.configure('TFrame', background=self.colors['background'])
         self.style.configure('TLabel', background=self.colors['background'],
@@ -57,8 +69,44 @@ class ResumeScreeningApp:
         self.job_title_analyzer = JobTitleAnalyzer(
             os.path.join(self.datasets_path, 'job_titles_set.csv')
         )
+        self.deduplicator = MinHashDeduplicator()
+        self.title_resolver = load_title_resolver(
+            os.path.join(self.datasets_path, 'job_titles_set.csv')
+        )
+        self.title_graph = load_related_title_graph(
+            os.path.join(self.datasets_path, 'job_titles_set.csv')
+        )
+        self.cascade = CascadeScreener(
+            self.resume_parser,
+            title_resolver=self.title_resolver,
+            title_graph=self.title_graph
+        )
+        
+        # Optional semantic engine, built with `python lsa_index.py`
+        self.lsa_index = load_lsa_index()
+        
+        # Resume category classifier trained on the labelled dataset
+        self.category_classifier = load_or_train_category_classifier(
+            os.path.join(self.datasets_path, 'UpdatedResumeDataSet.csv')
+        )
         
         self.results = []
+        self.job_description = ''
+        
+        # Aggregates shared by the overview charts and the dashboard
+        self.results_summary = ResultsSummary()
+        
+        # Columnar store behind the virtualized results table
+        self.result_store = ResultStore()
+        self.results_offset = 0
+        
+        # Parsed resumes survive crashes here, so a rerun only parses what is left
+        self.work_queue = WorkQueue(get_default_queue_path(self.base_path))
+        
+        # Background processing state
+        self.worker = None
+        self.cancel_event = threading.Event()
+        self.progress_queue = queue.Queue()
         
     def create_gui(self):
         """Create the GUI layout"""
@@ -98,6 +146,22 @@ class ResumeScreeningApp:
         )
         self.process_btn.pack(pady=5, fill=tk.X)
         
+        # Cancel button, enabled while processing
+        self.cancel_btn = ttk.Button(
+            left_frame,
+            text="Cancel",
+            command=self.cancel_processing,
+            state=tk.DISABLED
+        )
+        self.cancel_btn.pack(pady=5, fill=tk.X)
+        
+        # Progress of the background worker
+        self.progress_bar = ttk.Progressbar(left_frame, mode='determinate')
+        self.progress_bar.pack(pady=5, fill=tk.X)
+        
+        self.progress_label = ttk.Label(left_frame, text="", font=('Helvetica', 9))
+        self.progress_label.pack(pady=(0, 5))
+        
         # Job description
         ttk.Label(
             left_frame, 
@@ -117,6 +181,49 @@ class ResumeScreeningApp:
         # Load job description
         self.load_job_description()
         
+        # Number of top-ranked resumes that get full extraction
+        ttk.Label(
+            left_frame,
+            text="Shortlist Size:",
+            font=('Helvetica', 10, 'bold')
+        ).pack(pady=5)
+        
+        self.top_k_var = tk.IntVar(value=self.cascade.top_k)
+        ttk.Spinbox(
+            left_frame,
+            from_=1,
+            to=10000,
+            textvariable=self.top_k_var
+        ).pack(pady=5, fill=tk.X)
+        
+        # Skills every shortlisted candidate must have
+        ttk.Label(
+            left_frame,
+            text="Must-Have Skills (comma separated):",
+            font=('Helvetica', 10, 'bold')
+        ).pack(pady=5)
+        
+        self.must_have_entry = ttk.Entry(left_frame)
+        self.must_have_entry.pack(pady=5, fill=tk.X)
+        
+        # Category filter applied before the expensive extraction
+        ttk.Label(
+            left_frame,
+            text="Category Filter:",
+            font=('Helvetica', 10, 'bold')
+        ).pack(pady=5)
+        
+        categories = ['All']
+        if self.category_classifier is not None:
+            categories += sorted(self.category_classifier.categories)
+        self.category_var = tk.StringVar(value=categories[0])
+        ttk.Combobox(
+            left_frame,
+            values=categories,
+            textvariable=self.category_var,
+            state='readonly'
+        ).pack(pady=5, fill=tk.X)
+        
         # Dashboard button
         self.dashboard_btn = ttk.Button(
             left_frame,
@@ -152,8 +259,8 @@ class ResumeScreeningApp:
             foreground=self.colors['primary']
         ).pack(pady=(0, 10))
         
-        # Create table
-        columns = ('Name', 'Email', 'Phone', 'Match %', 'Top Skills', 'Education')
+        # Create table, only the visible window of rows is materialized
+        columns = RESULT_COLUMNS
         self.tree = ttk.Treeview(
             results_frame, 
             columns=columns, 
@@ -172,14 +279,14 @@ class ResumeScreeningApp:
         }
         
         for col in columns:
-            self.tree.heading(col, text=col)
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_results(c))
             self.tree.column(col, width=column_widths[col])
         
-        # Add scrollbars
-        y_scrollbar = ttk.Scrollbar(
+        # Add scrollbars, the vertical one scrolls the result store window
+        self.results_scrollbar = ttk.Scrollbar(
             results_frame, 
             orient=tk.VERTICAL, 
-            command=self.tree.yview
+            command=self.on_results_scroll
         )
         x_scrollbar = ttk.Scrollbar(
             results_frame, 
@@ -187,18 +294,98 @@ class ResumeScreeningApp:
             command=self.tree.xview
         )
         
-        self.tree.configure(
-            yscrollcommand=y_scrollbar.set,
-            xscrollcommand=x_scrollbar.set
-        )
+        self.tree.configure(xscrollcommand=x_scrollbar.set)
         
         # Pack components
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
         
-        # Bind selection event
+        # Bind selection, resize and mouse wheel events
         self.tree.bind('<<TreeviewSelect>>', self.show_resume_details)
+        self.tree.bind('<Configure>', lambda event: self.refresh_results_view())
+        self.tree.bind('<MouseWheel>', self.on_results_wheel)
+        self.tree.bind('<Button-4>', self.on_results_wheel)
+        self.tree.bind('<Button-5>', self.on_results_wheel)
+
+    def visible_row_count(self):
+        """Number of rows that fit in the table"""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget('height'))
+        # Leave room for the heading row
+        return max(1, height // 22 - 1)
+
+    def refresh_results_view(self):
+        """Materialize only the rows in the visible window of the result store"""
+        page_size = self.visible_row_count()
+        total = len(self.result_store)
+        self.results_offset = max(0, min(self.results_offset, total - page_size))
+        rows = self.result_store.rows(self.results_offset, self.results_offset + page_size)
+        
+        # Reuse the existing items, adding or removing only the difference
+        items = self.tree.get_children()
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.tree.insert('', tk.END, values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        
+        if total:
+            self.results_scrollbar.set(
+                self.results_offset / total,
+                min(1.0, (self.results_offset + page_size) / total)
+            )
+        else:
+            self.results_scrollbar.set(0.0, 1.0)
+
+    def scroll_results_to(self, offset):
+        """Move the visible window, dropping a selection that would point elsewhere"""
+        if offset == self.results_offset:
+            return
+        self.results_offset = offset
+        if self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        self.refresh_results_view()
+
+    def on_results_scroll(self, *args):
+        """Scrollbar callback for the virtualized table"""
+        page_size = self.visible_row_count()
+        total = len(self.result_store)
+        if args[0] == 'moveto':
+            offset = int(float(args[1]) * total)
+        elif args[2] == 'pages':
+            offset = self.results_offset + int(args[1]) * page_size
+        else:
+            offset = self.results_offset + int(args[1])
+        self.scroll_results_to(max(0, min(offset, total - page_size)))
+
+    def on_results_wheel(self, event):
+        """Scroll the virtualized table with the mouse wheel"""
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            step = -3
+        else:
+            step = 3
+        self.on_results_scroll('scroll', step, 'units')
+        return 'break'
+
+    def sort_results(self, column):
+        """Sort the table by a column, toggling the direction on repeated clicks"""
+        if self.result_store.sort_column == column:
+            descending = not self.result_store.descending
+        else:
+            # Best matches first, text columns alphabetically
+            descending = column == 'Match %'
+        self.result_store.sort(column, descending)
+        
+        for col in RESULT_COLUMNS:
+            arrow = (' ▼' if descending else ' ▲') if col == column else ''
+            self.tree.heading(col, text=col + arrow)
+        self.results_offset = 0
+        if self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        self.refresh_results_view()
 
     def create_visualizations(self):
         """Create visualization area"""
@@ -219,10 +406,11 @@ class ResumeScreeningApp:
         metrics_frame.pack(fill=tk.X, pady=(0, 20))
         
         if self.results:
+            summary = self.results_summary
             metrics = [
-                ("Total Resumes", len(self.results)),
-                ("Average Match", f"{sum(r['similarity_score'] for r in self.results) / len(self.results):.1f}%"),
-                ("Top Match", f"{max(r['similarity_score'] for r in self.results):.1f}%")
+                ("Total Resumes", len(summary)),
+                ("Average Match", f"{summary.mean_score:.1f}%"),
+                ("Top Match", f"{summary.max_score:.1f}%")
             ]
             
             for label, value in metrics:
@@ -280,9 +468,9 @@ class ResumeScreeningApp:
             print(f"Error loading job description: {str(e)}")
             
     def process_resumes(self):
-        """Process all resumes and update GUI"""
-        self.results = []
-        self.tree.delete(*self.tree.get_children())
+        """Start processing all resumes in a background worker"""
+        if self.worker is not None and self.worker.is_alive():
+            return
         
         # Get job description
         job_description = self.job_desc_text.get("1.0", tk.END).strip()
@@ -294,78 +482,262 @@ class ResumeScreeningApp:
             )
             return
         
+        # Read the screening options here, Tk variables are not thread safe
+        options = {
+            'top_k': max(1, self.top_k_var.get()),
+            'must_have': {
+                skill.strip().lower()
+                for skill in self.must_have_entry.get().split(',')
+                if skill.strip()
+            },
+            'category_filter': self.category_var.get()
+        }
+        
+        self.results = []
+        self.job_description = job_description
+        self.results_summary = ResultsSummary()
+        self.reset_results_view([])
+        self.cancel_event.clear()
+        self.progress_queue = queue.Queue()
+        self.progress_stage = None
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text="Starting...")
+        
+        self.process_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.dashboard_btn.config(state=tk.DISABLED)
+        
+        self.worker = threading.Thread(
+            target=self.screen_resumes,
+            args=(job_description, options),
+            daemon=True
+        )
+        self.worker.start()
+        self.root.after(100, self.drain_progress_queue)
+        
+    def cancel_processing(self):
+        """Ask the background worker to stop after the current resume"""
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.progress_label.config(text="Cancelling...")
+        
+    def screen_resumes(self, job_description, options):
+        """Worker thread: screen all resumes and post progress to the queue"""
+        post = self.progress_queue.put
         try:
-            # Process each resume
-            for filename in os.listdir(self.resumes_path):
-                if filename.lower().endswith(('.pdf', '.docx', '.doc')):
-                    resume_path = os.path.join(self.resumes_path, filename)
-                    result = self.process_single_resume(resume_path, job_description)
-                    if result:
-                        self.results.append(result)
+            # Extract text from each resume
+            filenames = [
+                filename for filename in sorted(os.listdir(self.resumes_path))
+                if filename.lower().endswith(('.pdf', '.docx', '.doc'))
+            ]
+            paths = [os.path.join(self.resumes_path, filename) for filename in filenames]
             
-            # Sort results by similarity score
-            self.results.sort(key=lambda x: x['similarity_score'], reverse=True)
+            # Parsing goes through the durable work queue: the same files resume the
+            # same run, so only resumes not parsed before a crash or cancel are parsed
+            run_id = make_run_id('parse', *(f"{path}:{os.path.getmtime(path)}" for path in paths))
+            parse_description = f"Parse {os.path.abspath(self.resumes_path)}"
+            # Runs for an older state of this folder, and their extractions, are never resumed
+            superseded = [r for r in self.work_queue.runs(parse_description) if r != run_id]
+            self.work_queue.delete_runs(superseded + [
+                extract_run
+                for parse_run in superseded
+                for extract_run in self.work_queue.runs(f"Extract {parse_run}")
+            ])
+            self.work_queue.prune(keep=(run_id,))
+            self.work_queue.create_run(run_id, paths, description=parse_description)
+            self.work_queue.reclaim_dead_workers(run_id)
+            worker_id = default_worker_id('gui')
+            done = self.work_queue.progress(run_id)['done']
+            post(('progress', 'Parsing resumes', done, len(paths)))
+            while not self.cancel_event.is_set():
+                batch = self.work_queue.claim(run_id, worker_id, limit=20, lease_seconds=120)
+                if not batch:
+                    break
+                for resume_path, _ in batch:
+                    if self.cancel_event.is_set():
+                        break
+                    resume_text = self.resume_parser.parse_resume(resume_path)
+                    self.work_queue.complete(run_id, worker_id, resume_path, {'text': resume_text or ''})
+                    done += 1
+                    post(('progress', 'Parsing resumes', done, len(paths)))
             
-            # Update table
-            for result in self.results:
-                skills = ', '.join([skill for category in result['skills'].values() 
-                                  for skill in category])
-                self.tree.insert('', tk.END, values=(
-                    result['name'],
-                    result['email'],
-                    result['phone'],
-                    f"{result['similarity_score']:.1f}%",
-                    skills[:50] + '...' if len(skills) > 50 else skills,
-                    result['education'][0] if result['education'] else 'Not specified'
-                ))
+            if self.cancel_event.is_set():
+                self.work_queue.release(run_id, worker_id)
+                post(('done', [], True))
+                return
             
-            # Enable the dashboard button after processing
-            self.dashboard_btn.config(state=tk.NORMAL)
+            resume_paths = []
+            resume_texts = []
+            for resume_path, parsed in self.work_queue.results(run_id):
+                if parsed['text']:
+                    resume_paths.append(resume_path)
+                    resume_texts.append(parsed['text'])
             
-            # Show success message
-            messagebox.showinfo(
-                "Processing Complete",
-                f"Successfully processed {len(self.results)} resumes."
-            )
+            # Only score one representative per group of near-duplicates
+            representatives, duplicates = self.deduplicator.deduplicate(resume_texts)
             
-        except Exception as e:
-            messagebox.showerror(
-                "Error",
-                f"An error occurred while processing resumes: {str(e)}"
+            # Predict categories for the whole batch at once
+            categories = [None] * len(representatives)
+            confidences = [None] * len(representatives)
+            if self.category_classifier is not None and representatives:
+                categories, confidences = self.category_classifier.predict_many(
+                    [resume_texts[idx] for idx in representatives]
+                )
+            
+            category_filter = options['category_filter']
+            candidates = {}
+            for idx, category, confidence in zip(representatives, categories, confidences):
+                if category_filter != 'All' and category != category_filter:
+                    continue
+                candidates[resume_paths[idx]] = (idx, category, confidence)
+            
+            def annotate(result):
+                idx, category, confidence = candidates[result['resume_path']]
+                result['duplicates'] = [resume_paths[d] for d in duplicates[idx]]
+                result['category'] = category
+                result['category_confidence'] = (
+                    float(confidence) if confidence is not None else None
+                )
+                
+                result['semantic_score'] = None
+                if self.lsa_index is not None:
+                    result['semantic_score'] = float(
+                        self.lsa_index.similarity([resume_texts[idx]], job_description)[0]
+                    )
+                
+                # Job title analysis is memoized, so repeated titles are free
+                result['title_departments'] = []
+                if result['job_titles']:
+                    title_analysis = self.job_title_analyzer.analyze_titles(result['job_titles'])
+                    if title_analysis is not None:
+                        result['title_departments'] = title_analysis['department'].tolist()
+                post(('result', result))
+            
+            # Extracted details are kept per resume and job, so a rerun after a crash
+            # only extracts the shortlisted resumes it had not reached
+            extract_run = self.work_queue.create_run(
+                make_run_id('extract', run_id, job_description), [],
+                description=f"Extract {run_id}"
             )
+            stored_details = {}
+            for resume_path, details in self.work_queue.results(extract_run):
+                details['skills'] = {
+                    category: set(skills) for category, skills in details['skills'].items()
+                }
+                stored_details[resume_path] = details
             
-    def process_single_resume(self, resume_path, job_description):
-        """Process a single resume"""
-        try:
-            resume_text = self.resume_parser.parse_resume(resume_path)
-            if not resume_text:
-                return None
-
-            # Extract information
-            name = self.resume_parser.extract_names(resume_text)
-            email = self.resume_parser.extract_emails(resume_text)
-            phone = self.resume_parser.extract_phone_number(resume_text)
-            education = self.resume_parser.extract_education(resume_text)
-            job_titles = self.resume_parser.extract_job_titles(resume_text)
-            skills = self.resume_parser.extract_skills(resume_text)
-
-            # Calculate similarity
-            similarity_score = calculate_similarity(resume_text, job_description)
-
-            return {
-                'resume_path': resume_path,
-                'name': name,
-                'email': email[0] if email else None,
-                'phone': phone,
-                'education': list(education),
-                'job_titles': job_titles,
-                'skills': skills,
-                'similarity_score': similarity_score
-            }
+            def extract_details(resume_path, resume_text, similarity_score, skills=None):
+                details = stored_details.get(resume_path)
+                if details is None:
+                    details = self.cascade.extract_details(
+                        resume_path, resume_text, similarity_score, skills
+                    )
+                    self.work_queue.create_run(extract_run, [resume_path])
+                    self.work_queue.complete(extract_run, worker_id, resume_path, details)
+                return dict(details)
+            
+            # Cheap filters first, full extraction only for the shortlist
+            self.cascade.top_k = options['top_k']
+            self.cascade.must_have = options['must_have']
+            candidate_indices = [idx for idx, _, _ in candidates.values()]
+            _, stage_stats = self.cascade.run(
+                [resume_paths[idx] for idx in candidate_indices],
+                [resume_texts[idx] for idx in candidate_indices],
+                job_description,
+                on_result=annotate,
+                on_progress=lambda done, total: post(('progress', 'Extracting details', done, total)),
+                should_stop=self.cancel_event.is_set,
+                extract_details=extract_details
+            )
+            print(format_stage_report(stage_stats))
+            post(('done', stage_stats, self.cancel_event.is_set()))
             
         except Exception as e:
-            print(f"Error processing resume {resume_path}: {str(e)}")
-            return None
+            post(('error', str(e)))
+            
+    def drain_progress_queue(self):
+        """Apply worker messages on the Tk thread, then reschedule"""
+        received = []
+        try:
+            # Bounded per tick so the window stays responsive under bursts
+            for _ in range(500):
+                message = self.progress_queue.get_nowait()
+                kind = message[0]
+                if kind == 'progress':
+                    self.update_progress(*message[1:])
+                elif kind == 'result':
+                    self.results.append(message[1])
+                    received.append(message[1])
+                elif kind == 'done':
+                    self.finish_processing(*message[1:])
+                    return
+                elif kind == 'error':
+                    self.finish_processing([], False)
+                    messagebox.showerror(
+                        "Error",
+                        f"An error occurred while processing resumes: {message[1]}"
+                    )
+                    return
+        except queue.Empty:
+            pass
+        finally:
+            if received:
+                self.results_summary.add_many(received)
+                self.result_store.extend(received)
+                self.refresh_results_view()
+        self.root.after(100, self.drain_progress_queue)
+        
+    def update_progress(self, stage, done, total):
+        """Show progress, throughput and ETA for the current stage"""
+        now = time.perf_counter()
+        if stage != self.progress_stage:
+            self.progress_stage = stage
+            self.progress_start = now
+        
+        elapsed = max(now - self.progress_start, 1e-6)
+        rate = done / elapsed
+        eta = (total - done) / rate if rate else 0
+        self.progress_bar.config(maximum=max(total, 1), value=done)
+        self.progress_label.config(
+            text=f"{stage}: {done}/{total} ({rate:.1f}/s, ETA {eta:.0f}s)"
+        )
+        
+    def reset_results_view(self, results):
+        """Show a new set of results in their given order"""
+        self.result_store = ResultStore(results)
+        self.results_offset = 0
+        for col in RESULT_COLUMNS:
+            self.tree.heading(col, text=col)
+        self.refresh_results_view()
+        
+    def finish_processing(self, stage_stats, cancelled):
+        """Re-sort the final results and restore the controls"""
+        self.worker = None
+        self.process_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        
+        # Sort results by similarity score, boosted for matching job titles
+        self.results.sort(
+            key=lambda x: x['similarity_score'] + x.get('title_boost', 0.0),
+            reverse=True
+        )
+        
+        # Show the table in ranked order
+        self.reset_results_view(self.results)
+        
+        # Enable the dashboard button after processing
+        if self.results:
+            self.dashboard_btn.config(state=tk.NORMAL)
+        
+        status = "Processing Cancelled" if cancelled else "Processing Complete"
+        self.progress_label.config(text=f"{status}: {len(self.results)} resumes")
+        if stage_stats or cancelled:
+            summary = "Cancelled after" if cancelled else "Successfully processed"
+            messagebox.showinfo(
+                status,
+                f"{summary} {len(self.results)} resumes.\n\n"
+                f"{format_stage_report(stage_stats)}"
+            )
             
     def update_visualizations(self):
         """Update visualization graphs"""
@@ -373,32 +745,33 @@ class ResumeScreeningApp:
         self.ax1.clear()
         self.ax2.clear()
         
-        # Similarity score distribution
-        scores = [r['similarity_score'] for r in self.results]
+        summary = self.results_summary
         
-        # Plot histogram with custom style
-        n, bins, patches = self.ax1.hist(scores, bins=10, color=self.colors['accent'], alpha=0.7)
+        # Similarity score distribution, from the precomputed histogram
+        n, bins, patches = self.ax1.hist(
+            summary.bin_edges[:-1],
+            bins=summary.bin_edges,
+            weights=summary.histogram,
+            color=self.colors['accent'],
+            alpha=0.7
+        )
         self.ax1.set_title('Match Score Distribution', pad=20, fontsize=12, fontweight='bold')
         self.ax1.set_xlabel('Match Score (%)', fontsize=10)
         self.ax1.set_ylabel('Number of Resumes', fontsize=10)
         self.ax1.grid(True, alpha=0.3)
         
         # Add mean line
-        if scores:
-            mean_score = sum(scores) / len(scores)
+        if len(summary):
+            mean_score = summary.mean_score
             self.ax1.axvline(mean_score, color='red', linestyle='dashed', alpha=0.8)
             self.ax1.text(mean_score + 2, self.ax1.get_ylim()[1]*0.9, 
                          f'Mean: {mean_score:.1f}%', 
                          color='red')
         
         # Skills distribution
-        all_skills = []
-        for result in self.results:
-            for category, skills in result['skills'].items():
-                all_skills.extend(skills)
+        skill_counts = summary.top_skills(10)
         
-        if all_skills:
-            skill_counts = pd.Series(all_skills).value_counts()[:10]
+        if len(skill_counts):
             
             # Plot bar chart
             bars = self.ax2.bar(range(len(skill_counts)), 
@@ -431,9 +804,9 @@ class ResumeScreeningApp:
         if not selection:
             return
             
-        # Get selected result
-        idx = self.tree.index(selection[0])
-        result = self.results[idx]
+        # Get selected result from the visible window of the store
+        idx = self.results_offset + self.tree.index(selection[0])
+        result = self.result_store.result(idx)
         
         # Create popup window
         popup = tk.Toplevel(self.root)
@@ -472,6 +845,20 @@ Match Score: {result['similarity_score']:.1f}%\n
 """
         text.insert(tk.END, details)
         
+        if result.get('semantic_score') is not None:
+            text.insert(tk.END, f"Semantic Match: {result['semantic_score']:.1f}%\n")
+        if result.get('category'):
+            text.insert(
+                tk.END,
+                f"Category: {result['category']} ({result['category_confidence']:.0f}% confidence)\n"
+            )
+        
+        # Near-duplicate submissions
+        if result.get('duplicates'):
+            text.insert(tk.END, "\nDuplicate Submissions:\n", 'subheading')
+            for path in result['duplicates']:
+                text.insert(tk.END, f"• {os.path.basename(path)}\n")
+        
         # Education section
         text.insert(tk.END, "\nEducation:\n", 'subheading')
         if result['education']:
@@ -483,10 +870,18 @@ Match Score: {result['similarity_score']:.1f}%\n
         # Job Titles section
         text.insert(tk.END, "\nJob Titles:\n", 'subheading')
         if result['job_titles']:
-            for title in result['job_titles']:
-                text.insert(tk.END, f"• {title}\n")
+            departments = result.get('title_departments') or [None] * len(result['job_titles'])
+            for title, department in zip(result['job_titles'], departments):
+                if department and department != 'Other':
+                    text.insert(tk.END, f"• {title} ({department})\n")
+                else:
+                    text.insert(tk.END, f"• {title}\n")
         else:
             text.insert(tk.END, "No job titles found\n")
+        if result.get('canonical_titles'):
+            text.insert(tk.END, f"Standard titles: {', '.join(result['canonical_titles'])}\n")
+        if result.get('title_matches'):
+            text.insert(tk.END, f"Matches job title: {', '.join(result['title_matches'])}\n")
         
         # Skills section
         text.insert(tk.END, "\nSkills:\n", 'subheading')
@@ -523,10 +918,17 @@ Match Score: {result['similarity_score']:.1f}%\n
                 result.setdefault('phone', None)
                 result.setdefault('education', [])
                 result.setdefault('job_titles', [])
+                result.setdefault('canonical_titles', [])
                 result.setdefault('similarity_score', 0.0)
             
+            # Job skills for mail merge, the screening run already compiled this profile
+            job_profile = compile_job_profile(self.job_description, self.resume_parser)
+            
             from analysis_dashboard import AnalysisDashboard
-            self.dashboard = AnalysisDashboard(self.root, self.results, self.colors)
+            self.dashboard = AnalysisDashboard(
+                self.root, self.results, self.colors, summary=self.results_summary,
+                required_skills=job_profile.required_skills
+            )
             
             # Configure window behavior
             self.dashboard.window.transient(self.root)  # Set as child window
@@ -0,0 +1,133 @@
+import os
+import numpy as np
+import pandas as pd
+from category_classifier import file_hash
+from title_resolver import normalize_title
+
+# Bump when the graph layout or title normalization changes
+RELATED_TITLES_VERSION = 2
+
+# Positions of the related title fields in job_titles_set.csv rows
+# (title, pdl count, nine top skills, then up to ten related titles)
+_RELATED_COLUMNS = slice(11, 21)
+
+class RelatedTitleGraph:
+    def __init__(self, titles, popularity, indptr, indices):
+        self.titles = list(titles)
+        self.title_ids = {title: i for i, title in enumerate(self.titles)}
+        self.popularity = np.asarray(popularity, dtype=np.int64)
+        # CSR adjacency: neighbours of title i are indices[indptr[i]:indptr[i + 1]]
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+
+    @classmethod
+    def from_csv(cls, dataset_path):
+        """Build the graph from the related titles listed in job_titles_set.csv"""
+        df = pd.read_csv(dataset_path, header=None, skiprows=1, dtype=str)
+
+        titles = []
+        title_ids = {}
+        popularity = []
+        for title, count in zip(df[0], df[1]):
+            title = normalize_title(title) if isinstance(title, str) else ''
+            if title and title not in title_ids:
+                title_ids[title] = len(titles)
+                titles.append(title)
+                popularity.append(int(count) if str(count).isdigit() else 0)
+
+        # Related titles missing from the title column become extra nodes
+        neighbours = [[] for _ in titles]
+        related_df = df.iloc[:, _RELATED_COLUMNS]
+        for title, related in zip(df[0], related_df.itertuples(index=False)):
+            title_id = title_ids.get(normalize_title(title)) if isinstance(title, str) else None
+            if title_id is None or neighbours[title_id]:
+                continue
+            for name in related:
+                name = normalize_title(name) if isinstance(name, str) else ''
+                if not name:
+                    continue
+                related_id = title_ids.get(name)
+                if related_id is None:
+                    related_id = title_ids[name] = len(titles)
+                    titles.append(name)
+                    popularity.append(0)
+                    neighbours.append([])
+                if related_id != title_id and related_id not in neighbours[title_id]:
+                    neighbours[title_id].append(related_id)
+
+        indptr = np.zeros(len(titles) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(n) for n in neighbours])
+        indices = np.fromiter(
+            (related_id for n in neighbours for related_id in n),
+            dtype=np.int32,
+            count=int(indptr[-1])
+        )
+        return cls(titles, popularity, indptr, indices)
+
+    def save(self, path):
+        """Persist the graph as numpy arrays"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(
+            path,
+            titles=np.array(self.titles),
+            popularity=self.popularity,
+            indptr=self.indptr,
+            indices=self.indices
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a persisted graph"""
+        with np.load(path) as arrays:
+            return cls(
+                arrays['titles'].tolist(),
+                arrays['popularity'],
+                arrays['indptr'],
+                arrays['indices']
+            )
+
+    def neighbour_ids(self, title_id):
+        """Ids of the titles related to a title id"""
+        return self.indices[self.indptr[title_id]:self.indptr[title_id + 1]]
+
+    def related(self, title):
+        """Titles related to a title, in the dataset's order"""
+        title_id = self.title_ids.get(normalize_title(title))
+        if title_id is None:
+            return []
+        return [self.titles[i] for i in self.neighbour_ids(title_id)]
+
+    def expand(self, titles):
+        """Canonical titles plus all of their related titles"""
+        expanded = []
+        for title in titles:
+            for name in [normalize_title(title)] + self.related(title):
+                if name in self.title_ids and name not in expanded:
+                    expanded.append(name)
+        return expanded
+
+def get_graph_path(dataset_path, cache_dir=None):
+    """Cache path of the graph built from a titles dataset"""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(dataset_path), 'cache')
+    return os.path.join(
+        cache_dir,
+        f'related_titles_v{RELATED_TITLES_VERSION}_{file_hash(dataset_path)}.npz'
+    )
+
+def load_related_title_graph(dataset_path, cache_dir=None):
+    """Load the persisted graph, building it on first use"""
+    graph_path = get_graph_path(dataset_path, cache_dir)
+    if os.path.exists(graph_path):
+        try:
+            return RelatedTitleGraph.load(graph_path)
+        except Exception as e:
+            print(f"Error loading related titles graph: {str(e)}")
+
+    try:
+        graph = RelatedTitleGraph.from_csv(dataset_path)
+        graph.save(graph_path)
+        return graph
+    except Exception as e:
+        print(f"Error building related titles graph: {str(e)}")
+        return None
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import numpy as np
+
+# Display columns of the results table and the result field each sorts on
+RESULT_COLUMNS = ('Name', 'Email', 'Phone', 'Match %', 'Top Skills', 'Education')
+
+def _skills_text(result):
+    return ', '.join([skill for category in result['skills'].values() for skill in category])
+
+def display_row(result):
+    """Table values for a single result"""
+    skills = _skills_text(result)
+    return (
+        result['name'],
+        result['email'],
+        result['phone'],
+        f"{result['similarity_score']:.1f}%",
+        skills[:50] + '...' if len(skills) > 50 else skills,
+        result['education'][0] if result['education'] else 'Not specified'
+    )
+
+def sort_keys(result):
+    """Per-column sort keys for a single result"""
+    return (
+        (result['name'] or '').lower(),
+        (result['email'] or '').lower(),
+        result['phone'] or '',
+        float(result['similarity_score']),
+        _skills_text(result).lower(),
+        (result['education'][0] if result['education'] else '').lower()
+    )
+
+class ResultStore:
+    """Columnar store of screening results viewed through a sortable row order"""
+
+    def __init__(self, results=None):
+        self.results = []
+        self.columns = {column: [] for column in RESULT_COLUMNS}
+        self.order = []
+        self.sort_column = None
+        self.descending = False
+        self.extend(results or [])
+
+    def __len__(self):
+        return len(self.results)
+
+    def append(self, result):
+        """Add one result at the end of the current order"""
+        for column, key in zip(RESULT_COLUMNS, sort_keys(result)):
+            self.columns[column].append(key)
+        self.order.append(len(self.results))
+        self.results.append(result)
+        self.sort_column = None
+
+    def extend(self, results):
+        """Add many results at the end of the current order"""
+        start = len(self.results)
+        for result in results:
+            for column, key in zip(RESULT_COLUMNS, sort_keys(result)):
+                self.columns[column].append(key)
+            self.results.append(result)
+        self.order.extend(range(start, len(self.results)))
+        self.sort_column = None
+
+    def sort(self, column, descending=False):
+        """Reorder rows by one column, leaving the stored results untouched"""
+        if column == 'Match %':
+            keys = np.array(self.columns[column], dtype=float)
+            order = np.argsort(-keys if descending else keys, kind='stable')
+        else:
+            keys = np.array(self.columns[column], dtype=object)
+            order = np.argsort(keys, kind='stable')
+            if descending:
+                order = order[::-1]
+        self.order = order.tolist()
+        self.sort_column = column
+        self.descending = descending
+
+    def result(self, position):
+        """Result shown at a row position"""
+        return self.results[self.order[position]]
+
+    def rows(self, start, stop):
+        """Display values of the rows in [start, stop)"""
+        return [display_row(self.results[idx]) for idx in self.order[start:stop]]
+
+def get_default_results_path(base_path=None):
+    """Default location of the persisted results database inside the datasets cache folder"""
+    if base_path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'datasets', 'cache', 'results.sqlite3')
+
+def _json_default(value):
+    """JSON fallback for the sets and NumPy values in screening results"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def dumps_result(result):
+    """Serialize a screening result to JSON"""
+    return json.dumps(result, default=_json_default)
+
+class SQLiteResultStore:
+    """Screening results persisted in SQLite, one row per resume id"""
+
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    resume_id TEXT PRIMARY KEY,
+                    resume_path TEXT,
+                    similarity_score REAL,
+                    data TEXT NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def save(self, resume_id, result):
+        """Insert or replace the result of one resume, so repeated writes are harmless"""
+        self.save_many([(resume_id, result)])
+
+    def save_many(self, items):
+        """Insert or replace (resume_id, result) pairs in one transaction"""
+        rows = [
+            (resume_id, result.get('resume_path'), result.get('similarity_score'),
+             dumps_result(result), time.time())
+            for resume_id, result in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results "
+                "(resume_id, resume_path, similarity_score, data, updated) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def get(self, resume_id):
+        """Stored result of a resume, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM results WHERE resume_id = ?", (resume_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def results(self):
+        """All stored results, best score first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM results ORDER BY similarity_score DESC"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
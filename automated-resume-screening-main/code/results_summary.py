@@ -0,0 +1,113 @@
+import itertools
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+# Process-wide counter so every change of every summary gets a unique version
+_VERSIONS = itertools.count(1)
+
+class ResultsSummary:
+    """Aggregates over screening results, updated incrementally as rows come and go"""
+
+    def __init__(self, results=(), bins=10):
+        self.bin_edges = np.linspace(0, 100, bins + 1)
+        self.histogram = np.zeros(bins, dtype=np.int64)
+        self.skill_counts = Counter()
+        self.category_skill_counts = {}
+        self._results = {}
+        self._scores = {}
+        self._score_array = None
+        self._top_order = None
+        self.version = next(_VERSIONS)
+        self.add_many(results)
+
+    def __len__(self):
+        return len(self._results)
+
+    def _bin(self, score):
+        width = self.bin_edges[1] - self.bin_edges[0]
+        return min(max(int(score // width), 0), len(self.histogram) - 1)
+
+    def _changed(self):
+        self._score_array = None
+        self._top_order = None
+        self.version = next(_VERSIONS)
+
+    def add(self, result):
+        """Add one result's score and skills"""
+        self.add_many([result])
+
+    def add_many(self, results):
+        """Add several results at once"""
+        added = False
+        for result in results:
+            key = id(result)
+            if key in self._results:
+                continue
+            score = float(result['similarity_score'])
+            self._results[key] = result
+            self._scores[key] = score
+            self.histogram[self._bin(score)] += 1
+            for category, skills in result['skills'].items():
+                self.skill_counts.update(skills)
+                self.category_skill_counts.setdefault(category, Counter()).update(skills)
+            added = True
+        if added:
+            self._changed()
+
+    def remove(self, result):
+        """Remove a previously added result"""
+        key = id(result)
+        if key not in self._results:
+            return
+        score = self._scores.pop(key)
+        del self._results[key]
+        self.histogram[self._bin(score)] -= 1
+        for category, skills in result['skills'].items():
+            self.skill_counts.subtract(skills)
+            self.category_skill_counts[category].subtract(skills)
+        # Drop skills no longer held by anyone
+        self.skill_counts += Counter()
+        for category in list(self.category_skill_counts):
+            self.category_skill_counts[category] += Counter()
+            if not self.category_skill_counts[category]:
+                del self.category_skill_counts[category]
+        self._changed()
+
+    @property
+    def scores(self):
+        """Scores of all results as a NumPy array"""
+        if self._score_array is None:
+            self._score_array = np.fromiter(self._scores.values(), dtype=float, count=len(self._scores))
+        return self._score_array
+
+    @property
+    def mean_score(self):
+        return float(self.scores.mean()) if len(self) else 0.0
+
+    @property
+    def max_score(self):
+        return float(self.scores.max()) if len(self) else 0.0
+
+    @property
+    def total_skill_mentions(self):
+        return sum(self.skill_counts.values())
+
+    @property
+    def unique_skills(self):
+        return len(self.skill_counts)
+
+    def skills_by_category(self):
+        """Unique skills held in each category"""
+        return {category: set(counts) for category, counts in self.category_skill_counts.items()}
+
+    def top_skills(self, n=10):
+        """Most common skills and how many results hold them"""
+        return pd.Series(dict(self.skill_counts.most_common(n)), dtype=np.int64)
+
+    def top_candidates(self, n=5):
+        """Highest scoring results, best first"""
+        if self._top_order is None:
+            self._top_order = np.argsort(-self.scores, kind='stable')
+        results = list(self._results.values())
+        return [results[idx] for idx in self._top_order[:n]]
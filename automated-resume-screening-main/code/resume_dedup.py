@@ -0,0 +1,132 @@
+import re
+import zlib
+from itertools import combinations
+import numpy as np
+
+# Largest prime below 2**32, used for the universal hash family
+_MERSENNE_PRIME = np.uint64(4294967291)
+_MAX_HASH = np.uint64(4294967295)
+
+def get_shingles(text, shingle_size=5):
+    """Split text into a set of hashed word shingles"""
+    words = re.findall(r'[a-z0-9]+', str(text).lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    if len(words) < shingle_size:
+        shingles = {' '.join(words)}
+    else:
+        shingles = {
+            ' '.join(words[i:i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        }
+    # Reduced mod p, the universal hash family is defined over [0, p)
+    return np.fromiter(
+        (zlib.crc32(s.encode('utf-8')) for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    ) % _MERSENNE_PRIME
+
+class MinHashDeduplicator:
+    def __init__(self, num_perm=128, bands=32, threshold=0.8, shingle_size=5, seed=42):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        # Random permutations (a * x + b) mod p. With a, b, x < p < 2**32 the
+        # product and sum stay below 2**64, so the uint64 arithmetic never wraps
+        rng = np.random.RandomState(seed)
+        self.perm_a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.perm_b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        """Compute the MinHash signature of a single text (all _MAX_HASH when it has no words)"""
+        shingles = get_shingles(text, self.shingle_size)
+        if shingles.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = (np.outer(self.perm_a, shingles) + self.perm_b[:, None]) % _MERSENNE_PRIME
+        return hashes.min(axis=1)
+
+    def signatures(self, texts):
+        """Compute MinHash signatures for a list of texts"""
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for i, text in enumerate(texts):
+            signatures[i] = self.signature(text)
+        return signatures
+
+    def candidate_pairs(self, signatures):
+        """Find candidate duplicate pairs by bucketing LSH bands"""
+        pairs = set()
+        # Texts without words share one signature but are not duplicates of each other
+        has_text = np.flatnonzero(~(signatures == _MAX_HASH).all(axis=1))
+        for band in range(self.bands):
+            buckets = {}
+            start = band * self.rows
+            band_slice = signatures[:, start:start + self.rows]
+            for i in has_text.tolist():
+                key = band_slice[i].tobytes()
+                buckets.setdefault(key, []).append(i)
+
+            # Every pair in a bucket is a candidate, the first member may fail verification
+            for members in buckets.values():
+                if len(members) > 1:
+                    pairs.update(combinations(members, 2))
+        return pairs
+
+    def group(self, texts):
+        """Group near-duplicate texts, returning lists of indices"""
+        if not texts:
+            return []
+        return self.group_signatures(self.signatures(texts))
+
+    def group_signatures(self, signatures):
+        """Group near-duplicates from precomputed signatures, returning lists of indices"""
+        if len(signatures) == 0:
+            return []
+
+        # Union-find over verified candidate pairs
+        parent = list(range(len(signatures)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in self.candidate_pairs(signatures):
+            similarity = np.mean(signatures[i] == signatures[j])
+            if similarity >= self.threshold:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        groups = {}
+        for i in range(len(signatures)):
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+
+    def deduplicate(self, texts):
+        """Return representative indices and a map of representative -> duplicates"""
+        return self.representatives(self.group(texts))
+
+    def representatives(self, groups):
+        """Representative indices and a map of representative -> duplicates for groups"""
+        representatives = []
+        duplicates = {}
+        for members in sorted(groups, key=lambda g: g[0]):
+            representatives.append(members[0])
+            duplicates[members[0]] = members[1:]
+        return representatives, duplicates
+
+def deduplicate_dataframe(df, text_column='text', **kwargs):
+    """Drop near-duplicate rows, keeping the first row of each group
+
+    Returns the deduplicated frame and the number of rows removed.
+    """
+    texts = df[text_column].fillna('').astype(str).tolist()
+    representatives, duplicates = MinHashDeduplicator(**kwargs).deduplicate(texts)
+    removed = sum(len(d) for d in duplicates.values())
+    return df.iloc[representatives].reset_index(drop=True), removed
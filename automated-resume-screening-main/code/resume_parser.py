@@ -11,6 +11,7 @@ from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
 from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
 from pdfminer.pdfpage import PDFPage
+from skills_taxonomy import load_skill_matcher
 
 def extract_text_from_pdf(pdf_path):
     return extract_text(pdf_path)
@@ -76,7 +77,8 @@ class ResumeParser:
         # Download required NLTK data
         self._download_nltk_data()
         
-        # Load skills database
+        # Load skills database from the compiled taxonomy
+        self.skill_matcher = None
         self.skills_db = self._load_skills_db()
 
     def _download_nltk_data(self):
@@ -116,7 +118,16 @@ class ResumeParser:
             return set()
 
     def _load_skills_db(self):
-        """Load technical skills database"""
+        """Load skills database from the taxonomy file"""
+        try:
+            self.skill_matcher = load_skill_matcher(
+                os.path.join(self.datasets_path, 'skills_taxonomy.csv')
+            )
+            return self.skill_matcher.skills_db
+        except Exception as e:
+            print(f"Error loading skills taxonomy: {str(e)}")
+        
+        # Fall back to a small built-in set of technical skills
         skills = {
             'programming': {'python', 'java', 'c++', 'javascript', 'ruby', 'php', 'sql'},
             'frameworks': {'django', 'flask', 'react', 'angular', 'vue', 'spring'},
@@ -345,16 +356,20 @@ class ResumeParser:
     def extract_skills(self, text):
         """Extract technical skills from resume"""
         try:
-            found_skills = {category: set() for category in self.skills_db}
-            
-            # Convert text to lowercase for matching
-            text_lower = text.lower()
-            
-            # Look for skills in each category
-            for category, skills in self.skills_db.items():
-                for skill in skills:
-                    if skill in text_lower:
-                        found_skills[category].add(skill)
+            if self.skill_matcher is not None:
+                # Token lookup against the compiled taxonomy, aliases included
+                found_skills = self.skill_matcher.match(text)
+            else:
+                found_skills = {category: set() for category in self.skills_db}
+                
+                # Convert text to lowercase for matching
+                text_lower = text.lower()
+                
+                # Look for skills in each category
+                for category, skills in self.skills_db.items():
+                    for skill in skills:
+                        if skill in text_lower:
+                            found_skills[category].add(skill)
             
             # Debug print
             if any(skills for skills in found_skills.values()):
@@ -1,10 +1,44 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import pandas as pd
+from job_profile import (
+    compile_job_profile,
+    estimate_experience_years,
+    highest_education_level,
+    EDUCATION_LEVELS
+)
+
+from skill_index import SkillIndex, _skill_set
+
+SCORE_COMPONENTS = ['skills_match', 'experience_match', 'education_match', 'text_similarity']
+
+def _normalize_resume(resume):
+    """Return text, skills, experience and education with missing cells (NaN/None) emptied"""
+    text = resume.get('text')
+    text = text if isinstance(text, str) else ''
+    
+    skills = resume.get('skills')
+    if not isinstance(skills, (dict, list, tuple, set, frozenset)):
+        skills = []
+    
+    experience = resume.get('experience')
+    if isinstance(experience, bool) or not isinstance(experience, (int, float, np.number)) \
+            or pd.isna(experience):
+        experience = None
+    
+    education = resume.get('education')
+    if isinstance(education, str):
+        education = [education]
+    elif isinstance(education, (list, tuple, set)):
+        education = [level for level in education if isinstance(level, str)]
+    else:
+        education = []
+    
+    return text, skills, experience, education
 
 class ResumeScorer:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(stop_words='english')
+    def __init__(self, resume_parser=None):
+        self.resume_parser = resume_parser
+        self.job_profile = None
         self.required_skills = set()
         self.weights = {
             'skills_match': 0.4,
@@ -15,17 +49,25 @@ class ResumeScorer:
         
     def set_job_requirements(self, requirements):
         """Set job requirements for scoring"""
-        self.required_skills = set(requirements.get('skills', []))
-        self.required_experience = requirements.get('experience', 0)
-        self.required_education = requirements.get('education', [])
         self.job_description = requirements.get('description', '')
         
+        # Compile the job description once and reuse it for every resume
+        self.job_profile = compile_job_profile(self.job_description, self.resume_parser)
+        
+        self.required_skills = set(requirements.get('skills', self.job_profile.required_skills))
+        self.required_experience = requirements.get(
+            'experience', self.job_profile.required_experience
+        )
+        self.required_education = requirements.get(
+            'education', self.job_profile.required_education
+        )
+        
     def calculate_skills_score(self, candidate_skills):
         """Calculate skills match score"""
         if not self.required_skills:
             return 0
             
-        matched_skills = self.required_skills.intersection(candidate_skills)
+        matched_skills = self.required_skills.intersection(_skill_set(candidate_skills))
         return len(matched_skills) / len(self.required_skills) * 100
         
     def calculate_text_similarity(self, resume_text):
@@ -33,31 +75,73 @@ class ResumeScorer:
         if not self.job_description:
             return 0
             
-        # Vectorize texts
-        texts = [self.job_description, resume_text]
-        tfidf_matrix = self.vectorizer.fit_transform(texts)
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        return similarity * 100
+        return self.job_profile.score_text(resume_text)
         
     def get_detailed_score(self, resume_data):
         """Get detailed scoring breakdown"""
-        # Calculate individual scores
-        skills_score = self.calculate_skills_score(resume_data['skills'])
-        text_score = self.calculate_text_similarity(resume_data['text'])
-        
-        # Calculate weighted total
-        total_score = (
-            skills_score * self.weights['skills_match'] +
-            text_score * self.weights['text_similarity']
-        )
+        scores = self.score_many([resume_data]).iloc[0]
         
         return {
-            'total_score': total_score,
-            'breakdown': {
-                'skills_match': skills_score,
-                'text_similarity': text_score
-            },
-            'matched_skills': self.required_skills.intersection(resume_data['skills'])
-        } 
\ No newline at end of file
+            'total_score': scores['total_score'],
+            'breakdown': {component: scores[component] for component in SCORE_COMPONENTS},
+            'matched_skills': scores['matched_skills']
+        }
+        
+    def score_many(self, resumes):
+        """Score a DataFrame or list of parsed resumes in one vectorized pass"""
+        if isinstance(resumes, pd.DataFrame):
+            resumes = resumes.to_dict('records')
+        n_resumes = len(resumes)
+        fields = [_normalize_resume(r) for r in resumes]
+        texts = [text for text, _, _, _ in fields]
+        
+        # Skills match with bitwise operations over the whole pool
+        skill_index = SkillIndex.build(skills for _, skills, _, _ in fields)
+        skills_scores = skill_index.match_percentage(self.required_skills)
+        matched_skills = skill_index.matched_skills(self.required_skills)
+        
+        # Experience match, capped once the requirement is met
+        years = np.array([
+            experience if experience is not None else estimate_experience_years(text)
+            for text, _, experience, _ in fields
+        ], dtype=float)
+        if self.required_experience:
+            experience_scores = np.minimum(years / self.required_experience, 1.0) * 100
+        else:
+            experience_scores = np.full(n_resumes, 100.0)
+        
+        # Education match against the lowest accepted level
+        required_level = min(
+            (EDUCATION_LEVELS.get(level, 0) for level in self.required_education),
+            default=0
+        )
+        levels = np.array([
+            highest_education_level(' '.join(education) + ' ' + text)
+            for text, _, _, education in fields
+        ], dtype=float)
+        if required_level:
+            education_scores = np.minimum(levels / required_level, 1.0) * 100
+        else:
+            education_scores = np.full(n_resumes, 100.0)
+        
+        # Text similarity for every resume with one sparse product
+        if self.job_description:
+            text_scores = self.job_profile.score_texts(texts)
+        else:
+            text_scores = np.zeros(n_resumes)
+        
+        # Weighted total from one matrix-weight product
+        components = np.column_stack([
+            skills_scores,
+            experience_scores,
+            education_scores,
+            text_scores
+        ])
+        weights = np.array([self.weights[component] for component in SCORE_COMPONENTS])
+        
+        scores = pd.DataFrame(components, columns=SCORE_COMPONENTS)
+        scores.insert(0, 'total_score', components @ weights)
+        scores['matched_skills'] = matched_skills
+        if n_resumes and 'resume_path' in resumes[0]:
+            scores.insert(0, 'resume_path', [r.get('resume_path') for r in resumes])
+        return scores
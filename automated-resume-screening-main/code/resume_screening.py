@@ -30,7 +30,7 @@ def calculate_similarities(df):
     
     return df
 
-def screen_resumes(resumes_df, job_description):
+def screen_resumes(resumes_df, job_description, lsa_index=None):
     """Screen resumes against a job description using TF-IDF similarity."""
     # Add job description as first row
     new_row = pd.DataFrame({
@@ -50,4 +50,11 @@ def screen_resumes(resumes_df, job_description):
     df = df.drop(0)
     df.reset_index(drop=True, inplace=True)
     
-    return df[['path', 'name', 'email', 'similarity']] 
\ No newline at end of file
+    columns = ['path', 'name', 'email', 'similarity']
+    
+    # Optional semantic similarity from a prebuilt LSA index
+    if lsa_index is not None:
+        df['semantic_similarity'] = lsa_index.similarity(df.text.tolist(), job_description)
+        columns.append('semantic_similarity')
+    
+    return df[columns] 
\ No newline at end of file
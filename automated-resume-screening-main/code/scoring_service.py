@@ -0,0 +1,405 @@
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import hashlib
+import argparse
+import tempfile
+import threading
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+import scipy.sparse as sp
+from resume_parser import ResumeParser
+from job_profile import compile_job_profile, vectorize_texts
+from cascade_screening import CascadeScreener
+from title_resolver import load_title_resolver
+from related_titles import load_related_title_graph
+from lsa_index import load_lsa_index
+from result_store import dumps_result
+
+class MicroBatcher:
+    """Collects concurrent requests and hands them to one batch function"""
+
+    def __init__(self, process_batch, max_batch_size=64, max_wait=0.005):
+        # process_batch(items) must return one result per item, in order
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, item, timeout=None):
+        """Queue one item and block until its batch has been processed"""
+        future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Wait briefly for other requests to join this batch
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self.batches += 1
+            self.items += len(batch)
+            try:
+                results = self.process_batch([item for item, _ in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # One bad request must not fail the others, so retry them one at a time
+                for item, future in batch:
+                    try:
+                        future.set_result(self.process_batch([item])[0])
+                    except Exception as error:
+                        future.set_exception(error)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    @property
+    def mean_batch_size(self):
+        return self.items / self.batches if self.batches else 0.0
+
+class ScoringService:
+    """Parser, models and uploaded resumes kept warm between requests"""
+
+    def __init__(self, base_path=None):
+        if base_path is None:
+            base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        titles_path = os.path.join(base_path, 'datasets', 'job_titles_set.csv')
+
+        # Load everything once, requests only pay for their own work
+        self.resume_parser = ResumeParser(base_path)
+        self.cascade = CascadeScreener(
+            self.resume_parser,
+            title_resolver=load_title_resolver(titles_path),
+            title_graph=load_related_title_graph(titles_path)
+        )
+        self.lsa_index = load_lsa_index(
+            os.path.join(base_path, 'datasets', 'cache', 'lsa_index')
+        )
+
+        # Uploaded resumes, one row of the term matrix per id
+        self._lock = threading.Lock()
+        self.ids = []
+        self.positions = {}
+        self.texts = {}
+        self.names = {}
+        self.skills = []
+        self._vectors = []
+        self._matrix = None
+        self._details = {}
+
+        self.batcher = MicroBatcher(self.score_batch)
+        self.started = time.time()
+
+    def add_resume(self, text, filename=None):
+        """Store a resume's text, skills and term vector, returning its id"""
+        resume_id = hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+        with self._lock:
+            if resume_id in self.positions:
+                return resume_id, False
+        skills = self.resume_parser.extract_skills(text)
+        vector = vectorize_texts([text])
+        with self._lock:
+            if resume_id not in self.positions:
+                self.positions[resume_id] = len(self.ids)
+                self.ids.append(resume_id)
+                self.texts[resume_id] = text
+                self.names[resume_id] = filename or resume_id
+                self.skills.append(skills)
+                self._vectors.append(vector)
+        return resume_id, True
+
+    def add_resume_file(self, data, filename=None):
+        """Parse an uploaded PDF and store it"""
+        # pdfminer wants a path, so the upload is parsed from a temporary file
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            text = self.resume_parser.parse_resume(path)
+        finally:
+            os.remove(path)
+        if not text:
+            raise ValueError("No text could be extracted from the uploaded file")
+        return self.add_resume(text, filename)
+
+    def matrix(self):
+        """Term matrix of all stored resumes, stacked again only after uploads"""
+        with self._lock:
+            return self._stacked_matrix(), list(self.ids), list(self.skills)
+
+    def _stacked_matrix(self):
+        # Callers hold self._lock
+        if self._matrix is None or self._matrix.shape[0] != len(self._vectors):
+            self._matrix = sp.vstack(self._vectors, format='csr') if self._vectors else None
+        return self._matrix
+
+    def score_batch(self, requests):
+        """Score many (job_description, matrix, positions) requests with one matrix product
+
+        positions are rows of the stored term matrix, or None when matrix holds
+        the vectors of ad hoc texts to score instead.
+        """
+        profiles = [compile_job_profile(job, self.resume_parser) for job, _, _ in requests]
+        job_columns = {}
+        for profile in profiles:
+            job_columns.setdefault(id(profile), (len(job_columns), profile))
+        jobs = sp.vstack([profile.vector for _, profile in job_columns.values()], format='csr')
+
+        # Stored resumes are only ever appended, so the largest snapshot covers every request
+        stored = max(
+            (matrix for _, matrix, positions in requests if positions is not None),
+            key=lambda matrix: matrix.shape[0],
+            default=None
+        )
+        stored_similarities = (stored @ jobs.T).toarray() if stored is not None else None
+        texts = [matrix for _, matrix, positions in requests if positions is None]
+        text_similarities = (
+            (sp.vstack(texts, format='csr') @ jobs.T).toarray() if texts else None
+        )
+
+        results = []
+        start = 0
+        for profile, (_, matrix, positions) in zip(profiles, requests):
+            column = job_columns[id(profile)][0]
+            if positions is not None:
+                rows = stored_similarities[positions, column]
+            else:
+                rows = text_similarities[start:start + matrix.shape[0], column]
+                start += matrix.shape[0]
+            results.append(np.round(rows * 100, 2).tolist())
+        return results
+
+    def score(self, job_description, resume_ids=None, text=None):
+        """Scores of stored resumes (or one ad hoc text) against a job"""
+        if text is not None:
+            return [{'id': None, 'similarity_score': self.batcher.submit(
+                (job_description, vectorize_texts([text]), None)
+            )[0]}]
+
+        # Positions are resolved against the same snapshot they index into,
+        # an upload in between would otherwise point past its last row
+        with self._lock:
+            matrix = self._stacked_matrix()
+            if matrix is None:
+                return []
+            ids = list(self.ids)
+            if resume_ids is None:
+                positions = list(range(len(ids)))
+            else:
+                unknown = [resume_id for resume_id in resume_ids if resume_id not in self.positions]
+                if unknown:
+                    raise ValueError(f"Unknown resume ids: {', '.join(unknown)}")
+                positions = [self.positions[resume_id] for resume_id in resume_ids]
+        scores = self.batcher.submit((job_description, matrix, positions))
+        return [
+            {'id': ids[pos], 'name': self.names[ids[pos]], 'similarity_score': score}
+            for pos, score in zip(positions, scores)
+        ]
+
+    def details(self, resume_id, similarity_score):
+        """Full extraction for a stored resume, cached by id"""
+        details = self._details.get(resume_id)
+        if details is None:
+            pos = self.positions[resume_id]
+            details = self.cascade.extract_details(
+                self.names[resume_id], self.texts[resume_id], 0.0, self.skills[pos]
+            )
+            self._details[resume_id] = details
+        return dict(details, id=resume_id, similarity_score=float(similarity_score))
+
+    def top_k(self, job_description, k=10, must_have=()):
+        """Best stored resumes for a job, ranked the same way as the GUI cascade"""
+        matrix, ids, skills = self.matrix()
+        if matrix is None:
+            return []
+        profile = compile_job_profile(job_description, self.resume_parser)
+        # Per request copy, handler threads must not share must-have skills
+        cascade = copy.copy(self.cascade)
+        cascade.must_have = set(must_have)
+        survivors = cascade.prefilter_skills(skills, profile)
+        if not survivors:
+            return []
+
+        scores = profile.score_vectors(matrix[survivors])
+        shortlist = np.argsort(-scores, kind='stable')[:k]
+        targets = set(self.cascade.target_titles(job_description))
+        results = [
+            self.cascade.boost_related_titles(
+                self.details(ids[survivors[pos]], scores[pos]), targets
+            )
+            for pos in shortlist
+        ]
+        if self.lsa_index is not None:
+            semantic_scores = self.lsa_index.similarity(
+                [self.texts[r['id']] for r in results], job_description
+            )
+            for result, semantic_score in zip(results, semantic_scores):
+                result['semantic_score'] = float(semantic_score)
+        results.sort(key=lambda r: r['similarity_score'] + r['title_boost'], reverse=True)
+        return results
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'resumes': len(self.ids),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'score_batches': self.batcher.batches,
+            'mean_batch_size': round(self.batcher.mean_batch_size, 2)
+        }
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over the shared ScoringService
+
+    GET  /health
+    POST /resumes     PDF bytes (Content-Type: application/pdf) or {"text": ...}
+    POST /score       {"job_description": ..., "resume_ids": [...]} or {"job_description": ..., "text": ...}
+    POST /top-k       {"job_description": ..., "k": 10, "must_have": [...]}
+    """
+
+    service = None
+
+    def send_json(self, status, payload):
+        body = dumps_result(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def read_json(self):
+        try:
+            payload = json.loads(self.read_body() or b'{}')
+        except ValueError:
+            raise ValueError("Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+        return payload
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self.send_json(200, self.service.health())
+        else:
+            self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        try:
+            if path == '/resumes':
+                self.post_resume()
+            elif path == '/score':
+                self.post_score()
+            elif path == '/top-k':
+                self.post_top_k()
+            else:
+                self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+        except Exception as e:
+            print(f"Error handling {path}: {str(e)}")
+            self.send_json(500, {'error': str(e)})
+
+    def post_resume(self):
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('application/pdf'):
+            filename = parse_qs(urlparse(self.path).query).get('filename', [None])[0]
+            resume_id, created = self.service.add_resume_file(self.read_body(), filename)
+        else:
+            payload = self.read_json()
+            if not payload.get('text'):
+                raise ValueError("Missing resume text")
+            resume_id, created = self.service.add_resume(payload['text'], payload.get('filename'))
+        self.send_json(201 if created else 200, {'id': resume_id, 'created': created})
+
+    def post_score(self):
+        payload = self.read_json()
+        scores = self.service.score(
+            _job_description(payload),
+            resume_ids=_string_list(payload, 'resume_ids'),
+            text=_optional_string(payload, 'text')
+        )
+        self.send_json(200, {'scores': scores})
+
+    def post_top_k(self):
+        payload = self.read_json()
+        k = payload.get('k', 10)
+        if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+            raise ValueError("k must be a positive integer")
+        results = self.service.top_k(
+            _job_description(payload),
+            k=k,
+            must_have=[skill.lower() for skill in _string_list(payload, 'must_have') or []]
+        )
+        self.send_json(200, {'results': results})
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"{self.address_string()} - {format % args}\n")
+
+def _job_description(payload):
+    job_description = payload.get('job_description')
+    if not job_description or not isinstance(job_description, str):
+        raise ValueError("Missing job_description")
+    return job_description
+
+def _optional_string(payload, key):
+    value = payload.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+    return value
+
+def _string_list(payload, key):
+    value = payload.get(key)
+    if value is not None and (
+        not isinstance(value, list) or not all(isinstance(item, str) for item in value)
+    ):
+        raise ValueError(f"{key} must be a list of strings")
+    return value
+
+def create_server(host='127.0.0.1', port=8765, service=None):
+    """HTTP server bound to a warm ScoringService"""
+    handler = type('BoundScoringRequestHandler', (ScoringRequestHandler,), {
+        'service': service or ScoringService()
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-running resume scoring service")
+    parser.add_argument('--host', default='127.0.0.1', help="address to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on (default: 8765)")
+    args = parser.parse_args()
+
+    print("Loading models...")
+    server = create_server(args.host, args.port)
+    print(f"Scoring service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
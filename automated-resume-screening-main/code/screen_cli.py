@@ -0,0 +1,367 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.sparse as sp
+from resume_parser import ResumeParser
+from resume_dedup import MinHashDeduplicator
+from job_profile import compile_job_profile, vectorize_texts
+from cascade_screening import CascadeScreener, format_stage_report
+from title_resolver import load_title_resolver
+from related_titles import load_related_title_graph
+from lsa_index import load_lsa_index
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+OUTPUT_COLUMNS = (
+    'rank', 'resume_path', 'name', 'email', 'phone', 'similarity_score', 'title_boost',
+    'semantic_score', 'skills', 'education', 'job_titles', 'canonical_titles',
+    'title_matches', 'duplicates'
+)
+
+# Per-process state of the pool workers, set up by init_worker
+_WORKER = {}
+
+def init_worker(base_path, job_description):
+    """Load the parser once per worker process"""
+    # Parser diagnostics go to stderr so they never mix with streamed output
+    sys.stdout = sys.stderr
+    _WORKER['base_path'] = base_path
+    _WORKER['job_description'] = job_description
+    _WORKER['parser'] = ResumeParser(base_path)
+    _WORKER['deduplicator'] = MinHashDeduplicator()
+
+def _worker_cascade():
+    """Stage 3 helpers, only loaded by workers that extract details"""
+    if 'cascade' not in _WORKER:
+        titles_path = os.path.join(_WORKER['parser'].datasets_path, 'job_titles_set.csv')
+        _WORKER['cascade'] = CascadeScreener(
+            _WORKER['parser'],
+            title_resolver=load_title_resolver(titles_path)
+        )
+        _WORKER['lsa_index'] = load_lsa_index(
+            os.path.join(_WORKER['base_path'], 'datasets', 'cache', 'lsa_index')
+        )
+    return _WORKER['cascade'], _WORKER['lsa_index']
+
+def scan_resume(resume_path):
+    """Worker: reduce one resume to its skills, term vector and MinHash signature"""
+    parser = _WORKER['parser']
+    text = parser.parse_resume(resume_path)
+    if not text:
+        return None
+    return (
+        resume_path,
+        parser.extract_skills(text),
+        vectorize_texts([text]),
+        _WORKER['deduplicator'].signature(text)
+    )
+
+def extract_resume(task):
+    """Worker: full extraction for one shortlisted resume"""
+    resume_path, similarity_score, skills = task
+    cascade, lsa_index = _worker_cascade()
+    # Texts are not shipped back from the scan, re-reading a shortlisted file is cheaper
+    text = cascade.resume_parser.parse_resume(resume_path) or ''
+    result = cascade.extract_details(resume_path, text, similarity_score, skills)
+    result['semantic_score'] = None
+    if lsa_index is not None:
+        result['semantic_score'] = float(
+            lsa_index.similarity([text], _WORKER['job_description'])[0]
+        )
+    return result
+
+def find_resumes(resume_dir):
+    """Resume files in a directory, sorted by name"""
+    return [
+        os.path.join(resume_dir, filename) for filename in sorted(os.listdir(resume_dir))
+        if filename.lower().endswith(RESUME_EXTENSIONS)
+    ]
+
+def output_row(rank, result):
+    """Flatten a screening result into one output record"""
+    return {
+        'rank': rank,
+        'resume_path': result['resume_path'],
+        'name': result['name'],
+        'email': result['email'],
+        'phone': result['phone'],
+        'similarity_score': round(result['similarity_score'], 2),
+        'title_boost': result.get('title_boost', 0.0),
+        'semantic_score': (
+            round(result['semantic_score'], 2)
+            if result.get('semantic_score') is not None else None
+        ),
+        'skills': [skill for skills in result['skills'].values() for skill in skills],
+        'education': result['education'],
+        'job_titles': result['job_titles'],
+        'canonical_titles': result['canonical_titles'],
+        'title_matches': result.get('title_matches', []),
+        'duplicates': result.get('duplicates', [])
+    }
+
+class CSVWriter:
+    """Writes records as CSV rows, joining list fields with '; '"""
+
+    def __init__(self, stream):
+        self.writer = csv.DictWriter(stream, fieldnames=OUTPUT_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow({
+            key: '; '.join(value) if isinstance(value, list) else value
+            for key, value in row.items()
+        })
+
+    def close(self):
+        pass
+
+class JSONLWriter:
+    """Writes one JSON object per line"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, row):
+        self.stream.write(json.dumps(row) + '\n')
+
+    def close(self):
+        self.stream.flush()
+
+class ParquetWriter:
+    """Writes records to a Parquet file in row groups of batch_size"""
+
+    def __init__(self, path, batch_size=1000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        string_list = pa.list_(pa.string())
+        self.schema = pa.schema([
+            ('rank', pa.int64()),
+            ('resume_path', pa.string()),
+            ('name', pa.string()),
+            ('email', pa.string()),
+            ('phone', pa.string()),
+            ('similarity_score', pa.float64()),
+            ('title_boost', pa.float64()),
+            ('semantic_score', pa.float64()),
+            ('skills', string_list),
+            ('education', string_list),
+            ('job_titles', string_list),
+            ('canonical_titles', string_list),
+            ('title_matches', string_list),
+            ('duplicates', string_list)
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+def open_writer(output_format, stream=None, path=None):
+    """Record writer for a format; Parquet needs a file path, the others a text stream"""
+    if output_format == 'csv':
+        return CSVWriter(stream)
+    if output_format == 'jsonl':
+        return JSONLWriter(stream)
+    return ParquetWriter(path)
+
+def screen(resume_paths, job_description, workers=None, top_k=20, must_have=(),
+           min_skill_matches=1, dedup=True, base_path=None):
+    """Screen resumes in worker processes, returning ranked results and stage statistics
+
+    Resume texts stay in the workers: the parent only holds each resume's skills,
+    term vector and MinHash signature, plus the top_k extracted results.
+    """
+    if base_path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    titles_path = os.path.join(base_path, 'datasets', 'job_titles_set.csv')
+
+    resume_parser = ResumeParser(base_path)
+    cascade = CascadeScreener(
+        resume_parser,
+        top_k=top_k,
+        min_skill_matches=min_skill_matches,
+        must_have=must_have,
+        title_resolver=load_title_resolver(titles_path),
+        title_graph=load_related_title_graph(titles_path)
+    )
+    job_profile = compile_job_profile(job_description, resume_parser)
+    deduplicator = MinHashDeduplicator()
+    stage_stats = []
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(base_path, job_description)
+    ) as executor:
+        # Parse every resume in parallel, keeping only compact per-resume data
+        start = time.perf_counter()
+        paths, skills, vectors, signatures = [], [], [], []
+        chunksize = max(1, len(resume_paths) // (4 * (workers or os.cpu_count() or 1)))
+        for scanned in executor.map(scan_resume, resume_paths, chunksize=chunksize):
+            if scanned is None:
+                continue
+            paths.append(scanned[0])
+            skills.append(scanned[1])
+            vectors.append(scanned[2])
+            signatures.append(scanned[3])
+
+        # Only rank one representative per group of near-duplicates
+        if dedup and signatures:
+            representatives, duplicates = deduplicator.representatives(
+                deduplicator.group_signatures(np.vstack(signatures))
+            )
+        else:
+            representatives, duplicates = list(range(len(paths))), {}
+        stage_stats.append({
+            'stage': 'Parsing and deduplication',
+            'input': len(resume_paths),
+            'survivors': len(representatives),
+            'seconds': time.perf_counter() - start
+        })
+
+        # Cheap skills prefilter over the representatives
+        start = time.perf_counter()
+        survivors = [
+            representatives[pos] for pos in
+            cascade.prefilter_skills([skills[idx] for idx in representatives], job_profile)
+        ]
+        stage_stats.append({
+            'stage': 'Skills prefilter',
+            'input': len(representatives),
+            'survivors': len(survivors),
+            'seconds': time.perf_counter() - start
+        })
+
+        # One sparse matrix product scores all survivors
+        start = time.perf_counter()
+        if survivors:
+            scores = job_profile.score_vectors(sp.vstack([vectors[idx] for idx in survivors]))
+        else:
+            scores = np.empty(0)
+        shortlist = np.argsort(-scores, kind='stable')[:top_k]
+        stage_stats.append({
+            'stage': 'Similarity ranking',
+            'input': len(survivors),
+            'survivors': len(shortlist),
+            'seconds': time.perf_counter() - start
+        })
+
+        # Full extraction of the shortlist, in parallel
+        start = time.perf_counter()
+        tasks = [
+            (paths[survivors[pos]], scores[pos], skills[survivors[pos]]) for pos in shortlist
+        ]
+        targets = set(cascade.target_titles(job_description))
+        results = []
+        for pos, result in zip(shortlist, executor.map(extract_resume, tasks)):
+            result['duplicates'] = [paths[d] for d in duplicates.get(survivors[pos], [])]
+            results.append(cascade.boost_related_titles(result, targets))
+        # Same order as CascadeScreener.run
+        results.sort(key=lambda r: r['similarity_score'] + r['title_boost'], reverse=True)
+        stage_stats.append({
+            'stage': 'Full extraction',
+            'input': len(shortlist),
+            'survivors': len(results),
+            'seconds': time.perf_counter() - start
+        })
+
+    return results, stage_stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rank a directory of resumes against a job description without the GUI"
+    )
+    parser.add_argument('resume_dir', help="directory containing PDF/DOCX resumes")
+    parser.add_argument('job_description', help="job description text file, or - for stdin")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes for parsing and extraction (default: CPU count)")
+    parser.add_argument('--top-k', type=int, default=20,
+                        help="number of resumes to fully extract and output (default: 20)")
+    parser.add_argument('--must-have', default='',
+                        help="comma separated skills every resume must list")
+    parser.add_argument('--min-skill-matches', type=int, default=1,
+                        help="job description skills a resume must share (default: 1)")
+    parser.add_argument('--no-dedup', action='store_true',
+                        help="rank near-duplicate resumes separately")
+    parser.add_argument('--format', choices=('csv', 'jsonl', 'parquet'), default='csv',
+                        help="output format (default: csv)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="output file, - for stdout (default); parquet needs a file")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.resume_dir):
+        parser.error(f"resume directory not found: {args.resume_dir}")
+    if args.workers < 1 or args.top_k < 1:
+        parser.error("--workers and --top-k must be at least 1")
+    if args.format == 'parquet':
+        if args.output == '-':
+            parser.error("--format parquet needs an --output file")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet needs the pyarrow package")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.job_description == '-':
+        job_description = sys.stdin.read()
+    else:
+        with open(args.job_description, 'r', encoding='utf-8') as f:
+            job_description = f.read()
+
+    # Keep stdout for records only, progress and diagnostics go to stderr
+    output = sys.stdout
+    sys.stdout = sys.stderr
+
+    resume_paths = find_resumes(args.resume_dir)
+    print(f"Screening {len(resume_paths)} resumes with {args.workers} workers...")
+    results, stage_stats = screen(
+        resume_paths,
+        job_description,
+        workers=args.workers,
+        top_k=args.top_k,
+        must_have={skill.strip().lower() for skill in args.must_have.split(',') if skill.strip()},
+        min_skill_matches=args.min_skill_matches,
+        dedup=not args.no_dedup
+    )
+    print(format_stage_report(stage_stats))
+
+    if args.format == 'parquet':
+        writer = open_writer('parquet', path=args.output)
+        stream = None
+    else:
+        stream = output if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+        writer = open_writer(args.format, stream=stream)
+    try:
+        for rank, result in enumerate(results, 1):
+            writer.write(output_row(rank, result))
+    finally:
+        writer.close()
+        if stream is not None and stream is not output:
+            stream.close()
+
+    print(f"Wrote {len(results)} ranked resumes"
+          f"{'' if args.output == '-' else ' to ' + args.output}")
+
+if __name__ == "__main__":
+    main()
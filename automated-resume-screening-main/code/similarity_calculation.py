@@ -3,6 +3,7 @@ import numpy as np
 from nltk.corpus import stopwords
 import nltk
 import re
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer 
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.metrics.pairwise import euclidean_distances
@@ -55,6 +56,99 @@ def calculate_similarities(documents_df):
     
     return pairwise_similarities, pairwise_differences
 
+def build_similarity_graph(tfidf_vectors, top_k=10, threshold=None, memory_budget_mb=256):
+    """Build a sparse kNN cosine graph by scoring blocks of rows at a time.
+    
+    memory_budget_mb bounds the working memory of each block; the returned
+    graph itself comes on top of it.
+    """
+    tfidf_vectors = sparse.csr_matrix(tfidf_vectors, dtype=np.float32)
+    n_docs = tfidf_vectors.shape[0]
+    vectors_t = tfidf_vectors.T.tocsc()
+    
+    top_k_mode = top_k is not None and top_k < n_docs - 1
+    
+    # Size each block to fit within the memory budget. Per score a block holds at worst,
+    # whichever phase is largest: the sparse product (float32 value + int32 index) next to
+    # its dense copy (float32); then with top_k the dense scores and the int64 indices from
+    # argpartition; or without top_k the dense scores, the boolean threshold mask and an
+    # int64 row, int64 column and float32 value for every kept score
+    if top_k_mode:
+        bytes_per_score = max(4 + 4 + 4, 4 + 8)
+    else:
+        bytes_per_score = max(4 + 4 + 4, 4 + 1 + 8 + 8 + 4)
+    bytes_per_row = max(n_docs, 1) * bytes_per_score
+    chunk_size = max(1, int(memory_budget_mb * 1024 * 1024 // bytes_per_row))
+    
+    rows, cols, values = [], [], []
+    for start in range(0, n_docs, chunk_size):
+        end = min(start + chunk_size, n_docs)
+        product = tfidf_vectors[start:end] @ vectors_t
+        block = product.toarray()
+        del product
+        
+        # Never link a document to itself
+        block[np.arange(end - start), np.arange(start, end)] = -np.inf
+        
+        if top_k_mode:
+            # Partition ascending so the top_k largest end up last, without a negated copy
+            kth = n_docs - top_k
+            neighbors = np.argpartition(block, kth, axis=1)[:, kth:]
+            block_rows = np.repeat(np.arange(start, end), top_k)
+            block_cols = neighbors.ravel()
+            del neighbors
+            block_values = block[block_rows - start, block_cols]
+            keep = block_values > (threshold if threshold is not None else 0)
+            rows.append(block_rows[keep])
+            cols.append(block_cols[keep])
+            values.append(block_values[keep])
+        else:
+            # Only the kept scores get indices, no full tile of every column
+            keep = block > (threshold if threshold is not None else 0)
+            block_rows, block_cols = np.nonzero(keep)
+            block_rows += start
+            rows.append(block_rows)
+            cols.append(block_cols)
+            values.append(block[keep])
+        del block, keep
+    
+    if not rows:
+        return sparse.csr_matrix((n_docs, n_docs), dtype=np.float32)
+    
+    return sparse.csr_matrix(
+        (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_docs, n_docs),
+        dtype=np.float32
+    )
+
+def calculate_similarity_graph(documents_df, top_k=10, threshold=None, memory_budget_mb=256):
+    """Calculate TF-IDF vectors and a sparse kNN similarity graph."""
+    tfidfvectoriser = TfidfVectorizer(dtype=np.float32)
+    tfidf_vectors = tfidfvectoriser.fit_transform(documents_df.documents_cleaned)
+    
+    return build_similarity_graph(
+        tfidf_vectors,
+        top_k=top_k,
+        threshold=threshold,
+        memory_budget_mb=memory_budget_mb
+    )
+
+def most_similar_from_graph(doc_id, similarity_graph, documents_df):
+    """Find and print the neighbors stored for a document in a kNN graph."""
+    print(f'Document: {documents_df.iloc[doc_id]["documents"]}')
+    print('\n')
+    print('Similar Documents:')
+    
+    # Neighbors of a row are a slice of the CSR arrays
+    start, end = similarity_graph.indptr[doc_id], similarity_graph.indptr[doc_id + 1]
+    neighbors = similarity_graph.indices[start:end]
+    scores = similarity_graph.data[start:end]
+    
+    for ix in np.argsort(-scores):
+        print('\n')
+        print(f'Document: {documents_df.iloc[neighbors[ix]]["documents"]}')
+        print(f'Cosine Similarity : {scores[ix]}')
+
 def most_similar(doc_id, similarity_matrix, matrix, documents_df):
     """Find and print most similar documents to the given document."""
     print(f'Document: {documents_df.iloc[doc_id]["documents"]}')
@@ -104,6 +198,10 @@ def main():
     print("Using Cosine Similarity:")
     most_similar(3, pairwise_similarities, 'Cosine Similarity', documents_df)
     
+    # Sparse kNN graph scales to large collections
+    # similarity_graph = calculate_similarity_graph(documents_df, top_k=3)
+    # most_similar_from_graph(3, similarity_graph, documents_df)
+    
     # Uncomment to print similar documents using euclidean distance
     # print("\nUsing Euclidean Distance:")
     # most_similar(3, pairwise_differences, 'Euclidean Distance', documents_df)
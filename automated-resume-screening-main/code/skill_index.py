@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+# Number of set bits for every possible byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _skill_set(skills):
+    """Normalize a skills set or {category: skills} dict into a set"""
+    if isinstance(skills, dict):
+        return {skill for category_skills in skills.values() for skill in category_skills}
+    return set(skills or [])
+
+class SkillVocabulary:
+    def __init__(self, skills=None):
+        self.skill_to_id = {}
+        self.skills = []
+        for skill in skills or []:
+            self.add(skill)
+
+    @classmethod
+    def from_skills_db(cls, skills_db):
+        """Build a vocabulary from a {category: skills} database"""
+        return cls(sorted(_skill_set(skills_db)))
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return skill in self.skill_to_id
+
+    def add(self, skill):
+        """Add a skill if missing and return its id"""
+        skill_id = self.skill_to_id.get(skill)
+        if skill_id is None:
+            skill_id = len(self.skills)
+            self.skill_to_id[skill] = skill_id
+            self.skills.append(skill)
+        return skill_id
+
+    def ids(self, skills):
+        """Ids of the known skills in an iterable"""
+        return [self.skill_to_id[s] for s in skills if s in self.skill_to_id]
+
+class SkillIndex:
+    def __init__(self, vocabulary=None):
+        self.vocabulary = vocabulary or SkillVocabulary()
+        self._rows = []
+        self._bits = None
+
+    @classmethod
+    def build(cls, skill_sets, vocabulary=None):
+        """Index a list of skill sets (or {category: skills} dicts)"""
+        index = cls(vocabulary)
+        for skills in skill_sets:
+            index.add(skills)
+        return index
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, skills):
+        """Append one resume's skills and return its row number"""
+        self._rows.append([self.vocabulary.add(s) for s in _skill_set(skills)])
+        self._bits = None
+        return len(self._rows) - 1
+
+    @property
+    def n_bytes(self):
+        return max(1, (len(self.vocabulary) + 7) // 8)
+
+    @property
+    def bits(self):
+        """Packed (n_resumes, n_bytes) bitset matrix, rebuilt after additions"""
+        if self._bits is None or self._bits.shape[1] != self.n_bytes:
+            dense = np.zeros((len(self._rows), self.n_bytes * 8), dtype=bool)
+            row_ids = np.repeat(np.arange(len(self._rows)), [len(r) for r in self._rows])
+            col_ids = np.fromiter(
+                (skill_id for row in self._rows for skill_id in row),
+                dtype=np.int64,
+                count=len(row_ids)
+            )
+            dense[row_ids, col_ids] = True
+            self._bits = np.packbits(dense, axis=1)
+        return self._bits
+
+    def mask(self, skills):
+        """Packed bitmask for a set of skills (unknown skills are ignored)"""
+        dense = np.zeros(self.n_bytes * 8, dtype=bool)
+        dense[self.vocabulary.ids(_skill_set(skills))] = True
+        return np.packbits(dense)
+
+    def match_counts(self, skills):
+        """Number of the given skills each resume has"""
+        bits = self.bits
+        if not len(bits):
+            return np.zeros(0, dtype=np.int64)
+        return _POPCOUNT[bits & self.mask(skills)].sum(axis=1, dtype=np.int64)
+
+    def match_percentage(self, skills):
+        """Percentage of the given skills each resume has"""
+        skills = _skill_set(skills)
+        if not skills:
+            return np.zeros(len(self))
+        return self.match_counts(skills) / len(skills) * 100
+
+    def filter(self, must_have=(), nice_to_have=(), min_nice_to_have=0):
+        """Boolean mask of resumes having all must-have skills and enough nice-to-haves"""
+        bits = self.bits
+        keep = np.ones(len(bits), dtype=bool)
+
+        must_have = _skill_set(must_have)
+        if must_have:
+            if any(skill not in self.vocabulary for skill in must_have):
+                return np.zeros(len(bits), dtype=bool)
+            must_mask = self.mask(must_have)
+            keep &= np.all((bits & must_mask) == must_mask, axis=1)
+
+        if min_nice_to_have:
+            keep &= self.match_counts(nice_to_have) >= min_nice_to_have
+        return keep
+
+    def matched_skills(self, skills):
+        """Per-resume sets of the given skills that each resume has"""
+        matched = np.unpackbits(self.bits & self.mask(skills), axis=1)
+        rows, cols = np.nonzero(matched)
+        result = [set() for _ in range(len(self))]
+        for row, col in zip(rows, cols):
+            result[row].add(self.vocabulary.skills[col])
+        return result
+
+    def facet_counts(self):
+        """Number of resumes having each skill, most common first"""
+        counts = np.unpackbits(self.bits, axis=1, count=len(self.vocabulary)).sum(axis=0)
+        return pd.Series(counts, index=self.vocabulary.skills).sort_values(ascending=False)
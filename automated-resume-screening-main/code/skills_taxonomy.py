@@ -0,0 +1,124 @@
+import os
+import re
+import pickle
+import hashlib
+import pandas as pd
+
+# Bump when the compiled matcher layout changes
+SKILL_MATCHER_VERSION = 1
+
+# Tokens keep symbols used in skill names such as c++, c# and node.js
+_TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+
+# Compiled matchers already loaded in this process, keyed by taxonomy hash
+_LOADED_MATCHERS = {}
+
+def tokenize(text):
+    """Lowercase and split text into skill tokens"""
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+class SkillMatcher:
+    def __init__(self, phrases, lengths_by_first, skills_db, version):
+        # 'token sequence' -> (canonical skill, category)
+        self.phrases = phrases
+        # first token -> phrase lengths starting with it, longest first
+        self.lengths_by_first = lengths_by_first
+        self.skills_db = skills_db
+        self.version = version
+
+    @classmethod
+    def compile(cls, taxonomy_df, version):
+        """Compile a taxonomy DataFrame (skill, category, aliases) into a matcher"""
+        phrases = {}
+        skills_db = {}
+        for row in taxonomy_df.itertuples(index=False):
+            skill = str(row.skill).strip().lower()
+            category = str(row.category).strip().lower()
+            skills_db.setdefault(category, set()).add(skill)
+
+            aliases = str(row.aliases).split('|') if isinstance(row.aliases, str) else []
+            for name in [skill] + aliases:
+                key = ' '.join(tokenize(name))
+                if key:
+                    phrases.setdefault(key, (skill, category))
+
+        lengths_by_first = {}
+        for key in phrases:
+            tokens = key.split(' ')
+            lengths_by_first.setdefault(tokens[0], set()).add(len(tokens))
+        lengths_by_first = {
+            first: sorted(lengths, reverse=True)
+            for first, lengths in lengths_by_first.items()
+        }
+        return cls(phrases, lengths_by_first, skills_db, version)
+
+    def match(self, text):
+        """Return {category: set(canonical skills)} found in the text"""
+        found = {category: set() for category in self.skills_db}
+        tokens = tokenize(text)
+
+        # Longest match wins and its tokens are consumed, so "objective c" is not also "c"
+        i = 0
+        while i < len(tokens):
+            step = 1
+            for length in self.lengths_by_first.get(tokens[i], ()):
+                key = ' '.join(tokens[i:i + length])
+                entry = self.phrases.get(key)
+                if entry is not None:
+                    skill, category = entry
+                    found[category].add(skill)
+                    step = length
+                    break
+            i += step
+        return found
+
+    def save(self, path):
+        """Persist the compiled matcher"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'format': SKILL_MATCHER_VERSION,
+                'version': self.version,
+                'phrases': self.phrases,
+                'lengths_by_first': self.lengths_by_first,
+                'skills_db': self.skills_db
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Load a persisted matcher"""
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('format') != SKILL_MATCHER_VERSION:
+            raise ValueError("Compiled skill matcher format is out of date")
+        return cls(data['phrases'], data['lengths_by_first'], data['skills_db'], data['version'])
+
+def taxonomy_version(taxonomy_path):
+    """Hash of the taxonomy file, used as its version"""
+    with open(taxonomy_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+def load_skill_matcher(taxonomy_path, cache_dir=None):
+    """Load the compiled matcher for a taxonomy, compiling it on first use"""
+    version = taxonomy_version(taxonomy_path)
+    if version in _LOADED_MATCHERS:
+        return _LOADED_MATCHERS[version]
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(taxonomy_path), 'cache')
+    cache_path = os.path.join(cache_dir, f'skills_{version}.pkl')
+
+    matcher = None
+    if os.path.exists(cache_path):
+        try:
+            matcher = SkillMatcher.load(cache_path)
+        except Exception as e:
+            print(f"Error loading compiled skills: {str(e)}")
+
+    if matcher is None:
+        taxonomy_df = pd.read_csv(taxonomy_path)
+        matcher = SkillMatcher.compile(taxonomy_df, version)
+        matcher.save(cache_path)
+
+    _LOADED_MATCHERS[version] = matcher
+    return matcher
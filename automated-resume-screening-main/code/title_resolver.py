@@ -0,0 +1,113 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+from job_title_analysis import first_title
+
+# Resolvers already built in this process, keyed by dataset path
+_LOADED_RESOLVERS = {}
+
+def normalize_title(title):
+    """Lowercase the first title of a compound title and collapse punctuation"""
+    # Hyphens inside a word ("full-stack") join it, only spaced ones separate titles
+    title = re.sub(r'(?<=\w)-(?=\w)', ' ', str(title))
+    title = first_title(title).lower()
+    return ' '.join(re.findall(r'[a-z0-9+#]+', title))
+
+def title_trigrams(title):
+    """Set of padded character trigrams of a normalized title"""
+    padded = f'  {title} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TitleResolver:
+    def __init__(self, titles, min_similarity=0.7):
+        # Titles are expected most popular first, ties resolve to the earlier one
+        self.titles = []
+        self.title_ids = {}
+        for title in titles:
+            title = normalize_title(title)
+            if title and title not in self.title_ids:
+                self.title_ids[title] = len(self.titles)
+                self.titles.append(title)
+        self.min_similarity = min_similarity
+        self._cache = {}
+
+        # Inverted index: trigram -> ids of the titles containing it
+        postings = {}
+        sizes = np.zeros(len(self.titles), dtype=np.int64)
+        for title_id, title in enumerate(self.titles):
+            trigrams = title_trigrams(title)
+            sizes[title_id] = len(trigrams)
+            for trigram in trigrams:
+                postings.setdefault(trigram, []).append(title_id)
+        self.postings = {
+            trigram: np.array(ids, dtype=np.int32) for trigram, ids in postings.items()
+        }
+        self.sizes = sizes
+
+    @classmethod
+    def from_csv(cls, dataset_path, min_similarity=0.7):
+        """Build a resolver from the canonical titles in job_titles_set.csv"""
+        titles = pd.read_csv(dataset_path, usecols=['title'])['title'].dropna()
+        return cls(titles.astype(str).tolist(), min_similarity)
+
+    def resolve(self, title):
+        """Best canonical title and its Dice similarity, or (None, 0.0) below the threshold"""
+        query = normalize_title(title)
+        if not query:
+            return None, 0.0
+        cached = self._cache.get(query)
+        if cached is not None:
+            return cached
+
+        title_id = self.title_ids.get(query)
+        if title_id is not None:
+            match = (self.titles[title_id], 1.0)
+        else:
+            trigrams = title_trigrams(query)
+            hits = [self.postings[t] for t in trigrams if t in self.postings]
+            match = (None, 0.0)
+            if hits:
+                shared = np.bincount(np.concatenate(hits), minlength=len(self.titles))
+                similarities = 2 * shared / (self.sizes + len(trigrams))
+                best = int(similarities.argmax())
+                if similarities[best] >= self.min_similarity:
+                    match = (self.titles[best], round(float(similarities[best]), 3))
+
+        self._cache[query] = match
+        return match
+
+    def resolve_many(self, titles):
+        """Canonical titles for a list of extracted titles, dropping unresolved ones"""
+        resolved = []
+        for title in titles:
+            canonical, _ = self.resolve(title)
+            if canonical and canonical not in resolved:
+                resolved.append(canonical)
+        return resolved
+
+    def find_titles(self, text, max_words=4):
+        """Canonical titles mentioned verbatim in a text, in order of appearance"""
+        tokens = re.findall(r'[a-z0-9+#]+', str(text).lower())
+        found = []
+        i = 0
+        while i < len(tokens):
+            # Prefer the longest title starting at each position
+            for length in range(min(max_words, len(tokens) - i), 0, -1):
+                candidate = ' '.join(tokens[i:i + length])
+                if candidate in self.title_ids:
+                    if candidate not in found:
+                        found.append(candidate)
+                    i += length - 1
+                    break
+            i += 1
+        return found
+
+def load_title_resolver(dataset_path):
+    """Load the resolver for a titles dataset, building it once per process"""
+    dataset_path = os.path.abspath(dataset_path)
+    resolver = _LOADED_RESOLVERS.get(dataset_path)
+    if resolver is None:
+        resolver = TitleResolver.from_csv(dataset_path)
+        _LOADED_RESOLVERS[dataset_path] = resolver
+    return resolver
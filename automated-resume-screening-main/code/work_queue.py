@@ -0,0 +1,398 @@
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+from result_store import dumps_result
+
+def get_default_queue_path(base_path=None):
+    """Default location of the work queue database inside the datasets cache folder"""
+    if base_path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'datasets', 'cache', 'work_queue.sqlite3')
+
+def make_run_id(*parts):
+    """Stable id of a run, so restarting the same work resumes the same run"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+def default_worker_id(name='worker'):
+    """Worker id unique across hosts and processes, as name-pid@host"""
+    return f"{name}-{os.getpid()}@{socket.gethostname()}"
+
+def _is_dead_local_worker(worker_id, hostname):
+    """Whether a worker id belongs to a process on this host that is no longer running"""
+    name, _, host = worker_id.rpartition('@')
+    pid = name.rpartition('-')[2]
+    if host != hostname or not pid.isdigit():
+        return False
+    if os.name == 'nt':
+        # os.kill(pid, 0) would stop the process on Windows, leave it to the lease expiry
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass
+    return False
+
+class WorkQueue:
+    """Durable task queue in SQLite with leased claims
+
+    Tasks move pending -> leased -> done (or failed). A lease that is not
+    completed or extended before it expires goes back to the pool, so work
+    held by a crashed worker is picked up by the others, until the task has
+    used max_attempts claims and is marked failed. Results are written
+    in the same transaction that marks a task done, keyed by task, so a task
+    finished twice stores one result.
+
+    Several processes on one host can share the file. For hosts sharing it over
+    a network filesystem pass wal=False, since WAL needs shared memory.
+    """
+
+    def __init__(self, db_path, wal=True, timeout=30.0):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    description TEXT,
+                    params TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    task_key TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    last_error TEXT,
+                    updated REAL NOT NULL,
+                    UNIQUE (run_id, task_key)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (run_id, status, lease_expires)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    run_id TEXT NOT NULL,
+                    task_key TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    written REAL NOT NULL,
+                    PRIMARY KEY (run_id, task_key)
+                )
+            """)
+
+    def create_run(self, run_id, task_keys, description=None, params=None):
+        """Register a run and its tasks; tasks already known to the run are kept as they are"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, description, params, created) VALUES (?, ?, ?, ?)",
+                (run_id, description, json.dumps(params or {}), now)
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (run_id, task_key, updated) VALUES (?, ?, ?)",
+                [(run_id, key, now) for key in task_keys]
+            )
+        return run_id
+
+    def run_params(self, run_id):
+        """Parameters a run was created with, or None for an unknown run"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT params FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def claim(self, run_id, worker_id, limit=20, lease_seconds=300.0, max_attempts=3):
+        """Lease up to `limit` pending or expired tasks"""
+        now = time.time()
+        with self._lock, self._conn:
+            # Take the write lock before reading so two workers never claim the same task
+            self._conn.execute("BEGIN IMMEDIATE")
+            # A task whose every attempt ended without complete() or fail() most likely
+            # crashes its worker, give up on it instead of handing it out forever
+            self._conn.execute(
+                "UPDATE tasks SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+                "last_error = ?, updated = ? WHERE run_id = ? AND attempts >= ? AND ("
+                "status = 'pending' OR (status = 'leased' AND lease_expires < ?))",
+                (f"Abandoned after {max_attempts} attempts", now, run_id, max_attempts, now)
+            )
+            rows = self._conn.execute(
+                "SELECT seq, task_key, attempts FROM tasks WHERE run_id = ? AND ("
+                "status = 'pending' OR (status = 'leased' AND lease_expires < ?)"
+                ") ORDER BY seq LIMIT ?",
+                (run_id, now, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE seq = ?",
+                [(worker_id, now + lease_seconds, now, seq) for seq, _, _ in rows]
+            )
+        return [(task_key, attempts + 1) for _, task_key, attempts in rows]
+
+    def extend(self, run_id, worker_id, task_keys, lease_seconds=300.0):
+        """Push back the expiry of leases this worker still holds"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE tasks SET lease_expires = ?, updated = ? WHERE run_id = ? AND task_key = ? "
+                "AND status = 'leased' AND lease_owner = ?",
+                [(now + lease_seconds, now, run_id, key, worker_id) for key in task_keys]
+            )
+
+    def complete(self, run_id, worker_id, task_key, result):
+        """Store a task's result and mark it done, atomically and idempotently"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (run_id, task_key, data, written) VALUES (?, ?, ?, ?)",
+                (run_id, task_key, dumps_result(result), now)
+            )
+            # A worker whose lease expired may still finish; the result is the same either way
+            self._conn.execute(
+                "UPDATE tasks SET status = 'done', lease_owner = ?, lease_expires = NULL, "
+                "last_error = NULL, updated = ? WHERE run_id = ? AND task_key = ?",
+                (worker_id, now, run_id, task_key)
+            )
+
+    def fail(self, run_id, worker_id, task_key, error, max_attempts=3):
+        """Record a failed attempt, retrying the task until max_attempts"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated = ? "
+                "WHERE run_id = ? AND task_key = ? AND status = 'leased' AND lease_owner = ?",
+                (max_attempts, str(error), now, run_id, task_key, worker_id)
+            )
+
+    def release(self, run_id, worker_id):
+        """Hand back every lease a worker holds, without counting the attempt"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE tasks SET status = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated = ? "
+                "WHERE run_id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), run_id, worker_id)
+            )
+
+    def reclaim_dead_workers(self, run_id):
+        """Put back the leases of workers on this host that are no longer running
+
+        The attempt still counts, the task may be what stopped the worker.
+        """
+        hostname = socket.gethostname()
+        with self._lock, self._conn:
+            owners = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT lease_owner FROM tasks WHERE run_id = ? AND status = 'leased'",
+                (run_id,)
+            )]
+            dead = [owner for owner in owners if _is_dead_local_worker(owner, hostname)]
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                "updated = ? WHERE run_id = ? AND status = 'leased' AND lease_owner = ?",
+                [(time.time(), run_id, owner) for owner in dead]
+            )
+        return len(dead)
+
+    def runs(self, description=None):
+        """Ids of all runs, or of the runs with a given description"""
+        with self._lock:
+            if description is None:
+                rows = self._conn.execute("SELECT run_id FROM runs ORDER BY created")
+            else:
+                rows = self._conn.execute(
+                    "SELECT run_id FROM runs WHERE description = ? ORDER BY created", (description,)
+                )
+            return [row[0] for row in rows]
+
+    def delete_runs(self, run_ids):
+        """Delete runs with their tasks and results"""
+        params = [(run_id,) for run_id in run_ids]
+        with self._lock, self._conn:
+            for table in ('results', 'tasks', 'runs'):
+                self._conn.executemany(f"DELETE FROM {table} WHERE run_id = ?", params)
+
+    def prune(self, max_age=7 * 24 * 3600, keep=()):
+        """Delete finished runs without activity for max_age seconds, returning their ids"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id FROM runs r WHERE NOT EXISTS ("
+                "SELECT 1 FROM tasks t WHERE t.run_id = r.run_id AND t.status IN ('pending', 'leased')"
+                ") AND MAX(created, COALESCE("
+                "(SELECT MAX(updated) FROM tasks t WHERE t.run_id = r.run_id), 0)) < ?",
+                (time.time() - max_age,)
+            ).fetchall()
+        stale = [row[0] for row in rows if row[0] not in keep]
+        self.delete_runs(stale)
+        return stale
+
+    def progress(self, run_id):
+        """Number of tasks in each status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY status", (run_id,)
+            ).fetchall()
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update(dict(rows))
+        return counts
+
+    def is_finished(self, run_id):
+        counts = self.progress(run_id)
+        return counts['pending'] == 0 and counts['leased'] == 0
+
+    def results(self, run_id):
+        """Yield (task_key, result) for every finished task, in task order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.task_key, r.data FROM tasks t JOIN results r "
+                "ON r.run_id = t.run_id AND r.task_key = t.task_key "
+                "WHERE t.run_id = ? AND t.status = 'done' ORDER BY t.seq",
+                (run_id,)
+            ).fetchall()
+        for task_key, data in rows:
+            yield task_key, json.loads(data)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def work(db_path, run_id, worker_id=None, batch_size=20, lease_seconds=300.0,
+         max_attempts=3, wal=True):
+    """Worker process: screen claimed resumes until the run has nothing left to claim"""
+    from ingestion_server import init_worker, ingest_resume
+
+    queue = WorkQueue(db_path, wal=wal)
+    params = queue.run_params(run_id)
+    if params is None:
+        raise ValueError(f"Unknown run {run_id}")
+    worker_id = worker_id or default_worker_id()
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    init_worker(base_path, params.get('job_description'))
+
+    try:
+        while True:
+            batch = queue.claim(run_id, worker_id, batch_size, lease_seconds, max_attempts)
+            if not batch:
+                if queue.is_finished(run_id):
+                    break
+                # Other workers hold the remaining leases, wait in case one expires
+                time.sleep(min(lease_seconds / 10, 5.0))
+                continue
+            remaining = [task_key for task_key, _ in batch]
+            for task_key, _ in batch:
+                remaining.remove(task_key)
+                try:
+                    queue.complete(run_id, worker_id, task_key, ingest_resume(task_key))
+                except Exception as e:
+                    print(f"Error screening resume {task_key}: {str(e)}")
+                    queue.fail(run_id, worker_id, task_key, e, max_attempts)
+                # Keep the rest of the batch from expiring while this worker is busy
+                queue.extend(run_id, worker_id, remaining, lease_seconds)
+    finally:
+        queue.release(run_id, worker_id)
+        queue.close()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Screen resumes through a durable SQLite work queue; rerun to resume"
+    )
+    parser.add_argument('resume_dir', nargs='?', help="directory containing PDF/DOCX resumes")
+    parser.add_argument('job_description', nargs='?', help="job description text file")
+    parser.add_argument('--join', metavar='RUN_ID', help="work on an existing run instead")
+    parser.add_argument('--db', help="queue database (default: datasets/cache/work_queue.sqlite3)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes on this host (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=20, help="tasks claimed at once (default: 20)")
+    parser.add_argument('--lease', type=float, default=300.0,
+                        help="seconds before an unfinished claim is handed to another worker (default: 300)")
+    parser.add_argument('--no-wal', action='store_true',
+                        help="use a rollback journal, needed when hosts share the file over a network")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv',
+                        help="format of the ranked output (default: csv)")
+    parser.add_argument('-o', '--output', default='-', help="ranked output file, - for stdout")
+    args = parser.parse_args()
+
+    db_path = args.db or get_default_queue_path()
+    queue = WorkQueue(db_path, wal=not args.no_wal)
+
+    # Keep stdout for records only, progress and diagnostics go to stderr
+    output = sys.stdout
+    sys.stdout = sys.stderr
+
+    if args.join:
+        run_id = args.join
+    else:
+        if not args.resume_dir or not args.job_description:
+            parser.error("resume_dir and job_description are required unless --join is given")
+        from screen_cli import find_resumes
+        with open(args.job_description, 'r', encoding='utf-8') as f:
+            job_description = f.read()
+        resume_paths = [os.path.abspath(path) for path in find_resumes(args.resume_dir)]
+        # Same job and same files give the same run, which picks up where it stopped
+        run_id = make_run_id(job_description, *resume_paths)
+        queue.create_run(
+            run_id, resume_paths,
+            description=f"Screen {args.resume_dir}",
+            params={'job_description': job_description}
+        )
+    # Runs nobody touched for a week are not coming back
+    queue.prune(keep=(run_id,))
+    # Leases of this host's workers from a crashed earlier invocation need not wait to expire
+    queue.reclaim_dead_workers(run_id)
+    print(f"Run {run_id}: {queue.progress(run_id)}")
+
+    processes = [
+        multiprocessing.Process(
+            target=work,
+            # Each worker names itself after its own process id
+            args=(db_path, run_id, None, args.batch_size, args.lease, 3, not args.no_wal)
+        )
+        for i in range(max(1, args.workers))
+    ]
+    for process in processes:
+        process.start()
+    while any(process.is_alive() for process in processes):
+        time.sleep(2)
+        print(f"Run {run_id}: {queue.progress(run_id)}")
+    for process in processes:
+        process.join()
+
+    from screen_cli import open_writer, output_row
+    ranked = sorted(
+        (result for _, result in queue.results(run_id)),
+        key=lambda r: r['similarity_score'], reverse=True
+    )
+    stream = output if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    writer = open_writer(args.format, stream=stream)
+    try:
+        for rank, result in enumerate(ranked, 1):
+            writer.write(output_row(rank, result))
+    finally:
+        writer.close()
+        if stream is not output:
+            stream.close()
+    print(f"Run {run_id} finished: {queue.progress(run_id)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import smtplib
+import time
+import pytest
+from email_outbox import EmailOutbox, SMTPConnectionPool, BulkEmailSender
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP, failing the way it is told to"""
+
+    def __init__(self, host, port, timeout=None, fail_login=False, fail_on=None):
+        self.fail_login = fail_login
+        # to_addr -> exception raised when sending to it
+        self.fail_on = fail_on or {}
+        self.sent = []
+        self.closed = False
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        if self.fail_login:
+            raise smtplib.SMTPAuthenticationError(535, b'bad credentials')
+
+    def send_message(self, msg):
+        error = self.fail_on.get(msg['To'])
+        if error is not None:
+            raise error
+        self.sent.append(msg['To'])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = EmailOutbox(str(tmp_path / 'outbox.sqlite3'))
+    yield outbox
+    outbox.close()
+
+def _sender(outbox, **smtp_options):
+    servers = []
+
+    def smtp_factory(host, port, timeout=None):
+        servers.append(FakeSMTP(host, port, timeout, **smtp_options))
+        return servers[-1]
+
+    pool = SMTPConnectionPool('localhost', 25, 'user', 'secret', smtp_factory=smtp_factory)
+    sender = BulkEmailSender(outbox, pool, 'hr@example.com', rate_limit=0, backoff=30.0)
+    return sender, servers
+
+def _statuses(outbox):
+    return dict(outbox._conn.execute("SELECT to_addr, status || '/' || attempts FROM messages"))
+
+def test_send_batch_sends_and_classifies_rejections(outbox):
+    sender, servers = _sender(outbox, fail_on={
+        'refused@example.com': smtplib.SMTPRecipientsRefused({}),
+        'busy@example.com': smtplib.SMTPResponseException(451, b'try later'),
+    })
+    for to_addr in ['a@example.com', 'refused@example.com', 'busy@example.com', 'b@example.com']:
+        outbox.enqueue(to_addr, 'Subject', 'Body')
+
+    sender.send_batch(outbox.claim(10))
+
+    assert servers[0].sent == ['a@example.com', 'b@example.com']
+    assert _statuses(outbox) == {
+        'a@example.com': 'sent/1',
+        'refused@example.com': 'failed/1',
+        'busy@example.com': 'pending/1',
+        'b@example.com': 'sent/1',
+    }
+
+def test_login_failure_pauses_sender_and_closes_socket(outbox):
+    sender, servers = _sender(outbox, fail_login=True)
+    for i in range(3):
+        outbox.enqueue(f'{i}@example.com', 'Subject', 'Body')
+
+    sender.send_batch(outbox.claim(10))
+
+    assert servers[0].closed
+    # Nothing was sent, so no attempt is charged, but the sender waits before reconnecting
+    assert set(_statuses(outbox).values()) == {'pending/0'}
+    assert sender._paused_until > time.monotonic() + 20
+
+    sender.send_batch(outbox.claim(10))
+    assert sender._paused_until > time.monotonic() + 50
+
+def test_disconnect_retries_only_the_message_on_the_wire(outbox):
+    sender, servers = _sender(outbox, fail_on={
+        'b@example.com': smtplib.SMTPServerDisconnected('gone'),
+    })
+    for to_addr in ['a@example.com', 'b@example.com', 'c@example.com']:
+        outbox.enqueue(to_addr, 'Subject', 'Body')
+
+    sender.send_batch(outbox.claim(10))
+
+    assert _statuses(outbox) == {
+        'a@example.com': 'sent/1',
+        'b@example.com': 'pending/1',
+        'c@example.com': 'pending/0',
+    }
+    assert sender._paused_until > time.monotonic()
+    # b is backed off, c is released right away
+    assert [row[1] for row in outbox.claim(10)] == ['c@example.com']
+
+def test_enqueue_many_queues_nothing_when_rendering_fails(outbox):
+    def render():
+        yield 'a@example.com', 'Subject', 'Body'
+        yield 'b@example.com', 'Subject', 'Body'
+        raise KeyError('missing placeholder')
+
+    with pytest.raises(KeyError):
+        outbox.enqueue_many(render())
+    assert outbox.counts()['pending'] == 0
+
+    assert outbox.enqueue_many([('a@example.com', 'Subject', 'Body')] * 3) == 3
+    assert outbox.counts()['pending'] == 3
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from ingestion_server import IngestionServer
+from result_store import SQLiteResultStore
+
+@pytest.fixture
+def server(tmp_path):
+    store = SQLiteResultStore(str(tmp_path / 'results.sqlite3'))
+    server = IngestionServer(store, str(tmp_path / 'uploads'), workers=1, enqueue_timeout=0.2)
+    yield server
+    server.pool.shutdown()
+    store.close()
+
+def _full_queue(server):
+    server.queue = asyncio.Queue(maxsize=1)
+    server.queue.put_nowait(('other', 'other.pdf', 0.0))
+
+def test_duplicate_of_a_rejected_upload_is_rejected_too(server):
+    async def run():
+        _full_queue(server)
+        first, duplicate = await asyncio.gather(
+            server.enqueue(b'resume bytes', 'a.pdf'),
+            server.enqueue(b'resume bytes', 'a.pdf')
+        )
+        assert first == duplicate
+        assert first[1] is False
+        assert (await server.status(first[0]))[0] == 404
+        assert server.counters['rejected'] == 1
+
+    asyncio.run(run())
+
+def test_duplicate_of_a_queued_upload_shares_its_job(server):
+    async def run():
+        _full_queue(server)
+        uploads = asyncio.gather(
+            server.enqueue(b'resume bytes', 'a.pdf'),
+            server.enqueue(b'resume bytes', 'a.pdf')
+        )
+        await asyncio.sleep(0.05)
+        server.queue.get_nowait()
+        first, duplicate = await uploads
+        assert first == duplicate
+        assert first[1] is True
+        status, payload = await server.status(first[0])
+        assert status == 200
+        assert payload['status'] == 'queued'
+        assert server.counters['accepted'] == 1
+
+    asyncio.run(run())
+
+def test_stored_result_answers_duplicates(server):
+    async def run():
+        server.queue = asyncio.Queue(maxsize=1)
+        resume_id, _ = await server.enqueue(b'resume bytes', 'a.pdf')
+        server.queue.get_nowait()
+        del server.jobs[resume_id]
+        server.store.save(resume_id, {'name': 'A'})
+
+        assert await server.enqueue(b'resume bytes', 'a.pdf') == (resume_id, True)
+        assert server.queue.empty()
+        status, payload = await server.status(resume_id)
+        assert (status, payload['status'], payload['result']) == (200, 'done', {'name': 'A'})
+
+    asyncio.run(run())
+
+def _request(server, raw):
+    async def run():
+        server.queue = asyncio.Queue(maxsize=1)
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await server.handle_request(reader)
+
+    return asyncio.run(run())
+
+@pytest.mark.parametrize('raw', [
+    b'POST /resumes HTTP/1.1\r\nContent-Length: abc\r\n\r\n',
+    b'POST /resumes HTTP/1.1\r\nContent-Length: 100\r\n\r\nshort',
+])
+def test_malformed_uploads_are_rejected(server, raw):
+    status, payload, _ = _request(server, raw)
+    assert status == 400
+    assert 'error' in payload
+
+def test_upload_is_queued(server):
+    status, payload, _ = _request(server, b'POST /resumes HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello')
+    assert status == 202
+    assert server.jobs[payload['id']]['status'] == 'queued'
@@ -0,0 +1,55 @@
+import threading
+import pytest
+import job_profile
+from job_profile import compile_job_profile, detect_education_levels, highest_education_level
+
+@pytest.mark.parametrize('text', [
+    "Mastering Python",
+    "Paid with Mastercard",
+    "Planned a bachelorette party",
+    "Many PhDs on the team",
+    "Certified Scrum Master",
+    "Worked as a scrum master in a master data team",
+])
+def test_words_containing_degree_names_are_not_degrees(text):
+    assert detect_education_levels(text) == []
+
+@pytest.mark.parametrize('text, level', [
+    ("PhD in Physics", 'phd'),
+    ("Ph.D. in Physics", 'phd'),
+    ("Master's degree in CS", 'master'),
+    ("Masters in Computer Science", 'master'),
+    ("Master of Science, Data Science", 'master'),
+    ("Scrum Master with a master degree in physics", 'master'),
+    ("M.S. in Statistics", 'master'),
+    ("MBA from XYZ", 'master'),
+    ("Bachelors in Engineering", 'bachelor'),
+    ("B.Tech, 2019", 'bachelor'),
+    ("Diploma in Electronics", 'diploma'),
+])
+def test_degrees_are_detected(text, level):
+    assert detect_education_levels(text) == [level]
+
+def test_highest_education_level():
+    assert highest_education_level("B.Sc and later an M.Sc") == 3
+    assert highest_education_level("no formal degree") == 0
+
+def test_profile_cache_is_thread_safe(monkeypatch):
+    monkeypatch.setattr(job_profile, '_PROFILE_CACHE_SIZE', 2)
+    errors = []
+
+    def compile_many(worker):
+        try:
+            for i in range(300):
+                profile = compile_job_profile(f"python developer {i % 5}")
+                assert profile.description == f"python developer {i % 5}"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=compile_many, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(job_profile._PROFILE_CACHE) <= 2
@@ -0,0 +1,36 @@
+import numpy as np
+from resume_dedup import MinHashDeduplicator, get_shingles, _MERSENNE_PRIME
+
+RESUME = ("Senior data scientist with eight years of experience building forecasting "
+          "models in Python, leading a team of analysts and shipping recommendation systems")
+
+def test_empty_texts_are_not_grouped_together():
+    representatives, duplicates = MinHashDeduplicator().deduplicate(['', '   ', '!!!', RESUME])
+    assert representatives == [0, 1, 2, 3]
+    assert all(not members for members in duplicates.values())
+
+def test_near_duplicates_are_grouped():
+    texts = [RESUME, RESUME + " today", "Registered nurse caring for patients in intensive care units"]
+    representatives, duplicates = MinHashDeduplicator().deduplicate(texts)
+    assert representatives == [0, 2]
+    assert duplicates[0] == [1]
+
+def test_duplicates_behind_a_failing_first_bucket_member_are_found():
+    deduplicator = MinHashDeduplicator()
+    rng = np.random.RandomState(0)
+    signatures = rng.randint(0, 2**31, size=(3, deduplicator.num_perm)).astype(np.uint64)
+    signatures[2] = signatures[1]
+    # Row 0 shares only the first band with the others and fails verification
+    signatures[0, :deduplicator.rows] = signatures[1, :deduplicator.rows]
+    assert sorted(deduplicator.group_signatures(signatures)) == [[0], [1, 2]]
+
+def test_signature_matches_exact_universal_hash():
+    deduplicator = MinHashDeduplicator()
+    shingles = get_shingles(RESUME)
+    assert (shingles < _MERSENNE_PRIME).all()
+    p = int(_MERSENNE_PRIME)
+    expected = [
+        min((int(a) * int(x) + int(b)) % p for x in shingles)
+        for a, b in zip(deduplicator.perm_a, deduplicator.perm_b)
+    ]
+    assert deduplicator.signature(RESUME).tolist() == expected
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from resume_scorer import ResumeScorer
+
+def _scorer():
+    scorer = ResumeScorer()
+    scorer.set_job_requirements({
+        'description': "Python developer with 3 years of experience and a bachelor's degree",
+        'skills': ['python', 'sql'],
+        'experience': 3,
+        'education': ['bachelor'],
+    })
+    return scorer
+
+def test_score_many_handles_missing_cells():
+    resumes = pd.DataFrame([
+        {'text': "Python developer, bachelor's degree", 'skills': ['python', 'sql'],
+         'experience': 4.0, 'education': ['bachelor']},
+        {'text': np.nan, 'skills': ['python'], 'experience': 2.0, 'education': ['bachelor']},
+        {'text': "Python developer", 'skills': np.nan, 'experience': 2.0, 'education': ['bachelor']},
+        {'text': "Python developer with 5 years of experience", 'skills': ['sql'],
+         'experience': np.nan, 'education': ['bachelor']},
+        {'text': "Python developer", 'skills': ['python'], 'experience': 1.0, 'education': np.nan},
+    ])
+    
+    scores = _scorer().score_many(resumes)
+    
+    assert len(scores) == len(resumes)
+    assert not scores[['total_score', 'skills_match', 'experience_match',
+                       'education_match', 'text_similarity']].isna().any().any()
+    assert scores.loc[1, 'text_similarity'] == 0
+    assert scores.loc[2, 'skills_match'] == 0
+    assert scores.loc[3, 'experience_match'] == 100
+    assert scores.loc[4, 'education_match'] == 0
+    assert scores.loc[0, 'total_score'] == scores['total_score'].max()
+
+def test_score_many_matches_single_resume_scores():
+    resume = {'text': "SQL analyst", 'skills': ['sql'], 'experience': None, 'education': None}
+    scorer = _scorer()
+    
+    detailed = scorer.get_detailed_score(resume)
+    
+    assert detailed['breakdown']['skills_match'] == 50
+    assert detailed['matched_skills'] == {'sql'}
@@ -0,0 +1,101 @@
+import json
+import threading
+import http.client
+import pytest
+from scoring_service import MicroBatcher, ScoringService, create_server
+
+def test_micro_batcher_fails_only_the_bad_item():
+    calls = []
+
+    def process_batch(items):
+        calls.append(list(items))
+        if 'bad' in items:
+            raise ValueError("bad item")
+        return [item.upper() for item in items]
+
+    # A long wait makes every submission below join one batch
+    batcher = MicroBatcher(process_batch, max_wait=0.5)
+    results = {}
+
+    def submit(item):
+        try:
+            results[item] = batcher.submit(item, timeout=10)
+        except ValueError as e:
+            results[item] = e
+
+    threads = [threading.Thread(target=submit, args=(item,)) for item in ['a', 'bad', 'c']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results['a'] == 'A'
+    assert results['c'] == 'C'
+    assert isinstance(results['bad'], ValueError)
+    assert len(calls[0]) == 3
+
+@pytest.fixture(scope='module')
+def service():
+    return ScoringService()
+
+def test_score_resolves_ids_while_resumes_are_uploaded(service):
+    first_id, _ = service.add_resume("Python developer with Django and SQL")
+    errors = []
+
+    def upload():
+        for i in range(200):
+            service.add_resume(f"Java developer number {i} with Spring")
+
+    def score():
+        try:
+            for _ in range(200):
+                scores = service.score("Python developer", resume_ids=[service.ids[-1], first_id])
+                assert scores[1]['id'] == first_id
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=upload), threading.Thread(target=score)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+@pytest.fixture(scope='module')
+def server(service):
+    server = create_server(port=0, service=service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _post(server, path, payload):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=30)
+    try:
+        connection.request('POST', path, json.dumps(payload))
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+@pytest.mark.parametrize('path, payload', [
+    ('/top-k', {'job_description': "Python developer", 'must_have': [1]}),
+    ('/top-k', {'job_description': "Python developer", 'must_have': 'python'}),
+    ('/top-k', {'job_description': "Python developer", 'k': 'ten'}),
+    ('/score', {'job_description': "Python developer", 'resume_ids': [['abc']]}),
+    ('/score', {'job_description': "Python developer", 'text': 42}),
+    ('/score', {'job_description': ["Python developer"]}),
+])
+def test_malformed_payloads_are_rejected(server, path, payload):
+    status, body = _post(server, path, payload)
+    assert status == 400
+    assert 'error' in body
+
+def test_top_k_with_must_have(server, service):
+    service.add_resume("Python developer with Django and SQL")
+    status, body = _post(server, '/top-k', {
+        'job_description': "Python developer", 'k': 5, 'must_have': ['Python']
+    })
+    assert status == 200
+    assert body['results']
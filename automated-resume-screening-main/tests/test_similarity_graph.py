@@ -0,0 +1,45 @@
+import tracemalloc
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from similarity_calculation import build_similarity_graph
+
+@pytest.fixture(scope='module')
+def vectors():
+    matrix = sp.random(3000, 2000, density=0.01, random_state=0, format='csr', dtype=np.float32)
+    return normalize(matrix)
+
+@pytest.fixture(scope='module')
+def similarities(vectors):
+    scores = (vectors @ vectors.T).toarray()
+    np.fill_diagonal(scores, -np.inf)
+    return scores
+
+def _nbytes(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+@pytest.mark.parametrize('top_k, threshold', [(5, None), (None, 0.3)])
+def test_peak_memory_stays_within_budget(vectors, top_k, threshold):
+    budget_mb = 2
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        graph = build_similarity_graph(vectors, top_k=top_k, threshold=threshold,
+                                       memory_budget_mb=budget_mb)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    # The transposed copy of the input and the returned graph come on top of the budget
+    assert peak <= budget_mb * 2**20 + _nbytes(vectors) + 4 * _nbytes(graph)
+
+def test_top_k_neighbours(vectors, similarities):
+    graph = build_similarity_graph(vectors, top_k=5, memory_budget_mb=1)
+    expected = np.sort(similarities, axis=1)[:, -5:]
+    expected = np.where(expected > 0, expected, 0)
+    assert np.allclose(np.sort(graph.toarray(), axis=1)[:, -5:], expected, atol=1e-6)
+    assert graph.diagonal().max() == 0
+
+def test_threshold_only(vectors, similarities):
+    graph = build_similarity_graph(vectors, top_k=None, threshold=0.2, memory_budget_mb=1)
+    assert np.allclose(graph.toarray(), np.where(similarities > 0.2, similarities, 0), atol=1e-6)
@@ -0,0 +1,30 @@
+import os
+import pandas as pd
+from skills_taxonomy import SkillMatcher, load_skill_matcher
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), '..', 'datasets', 'skills_taxonomy.csv')
+
+def _matcher():
+    taxonomy_df = pd.DataFrame([
+        ('objective-c', 'programming', 'objective c|objc'),
+        ('c', 'programming', None),
+        ('machine learning', 'data_science', 'ml'),
+        ('learning', 'soft_skills', None),
+    ], columns=['skill', 'category', 'aliases'])
+    return SkillMatcher.compile(taxonomy_df, 'test')
+
+def test_tokens_of_a_matched_phrase_are_consumed():
+    found = _matcher().match("Objective-C and machine learning")
+    assert found['programming'] == {'objective-c'}
+    assert found['data_science'] == {'machine learning'}
+    assert found['soft_skills'] == set()
+
+def test_unconsumed_tokens_still_match():
+    found = _matcher().match("C, Objective C and continuous learning")
+    assert found['programming'] == {'c', 'objective-c'}
+    assert found['soft_skills'] == {'learning'}
+
+def test_shipped_taxonomy_has_no_general_category(tmp_path):
+    matcher = load_skill_matcher(TAXONOMY_PATH, cache_dir=str(tmp_path))
+    assert 'general' not in matcher.skills_db
+    assert matcher.match("Objective-C")['programming'] == {'objective-c'}
@@ -0,0 +1,47 @@
+import os
+import socket
+import subprocess
+import sys
+import pytest
+from work_queue import WorkQueue, default_worker_id
+
+@pytest.fixture
+def work_queue(tmp_path):
+    work_queue = WorkQueue(str(tmp_path / 'work_queue.sqlite3'))
+    yield work_queue
+    work_queue.close()
+
+def test_task_whose_leases_keep_expiring_is_failed(work_queue):
+    work_queue.create_run('run', ['a', 'b'])
+    assert work_queue.claim('run', 'worker', lease_seconds=-1) == [('a', 1), ('b', 1)]
+    work_queue.complete('run', 'worker', 'b', {'key': 'b'})
+    # 'a' is never finished, as if it crashed its worker every time
+    for attempt in range(2, 4):
+        assert work_queue.claim('run', 'worker', lease_seconds=-1, max_attempts=3) == [('a', attempt)]
+
+    assert work_queue.claim('run', 'worker', max_attempts=3) == []
+    assert work_queue.progress('run')['failed'] == 1
+    assert list(work_queue.results('run')) == [('b', {'key': 'b'})]
+
+@pytest.mark.skipif(os.name == 'nt', reason="dead workers are left to the lease expiry on Windows")
+def test_leases_of_dead_local_workers_are_reclaimed(work_queue):
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    dead_worker = f"worker-{process.pid}@{socket.gethostname()}"
+    work_queue.create_run('run', ['a', 'b'])
+    work_queue.claim('run', dead_worker, limit=1)
+    work_queue.claim('run', default_worker_id(), limit=1)
+
+    assert work_queue.reclaim_dead_workers('run') == 1
+    assert work_queue.claim('run', default_worker_id()) == [('a', 2)]
+
+def test_prune_deletes_only_finished_runs(work_queue):
+    work_queue.create_run('finished', ['a'])
+    work_queue.claim('finished', 'worker')
+    work_queue.complete('finished', 'worker', 'a', {'key': 'a'})
+    work_queue.create_run('kept', [])
+    work_queue.create_run('running', ['a'])
+
+    assert work_queue.prune(max_age=-1, keep=('kept',)) == ['finished']
+    assert work_queue.runs() == ['kept', 'running']
+    assert list(work_queue.results('finished')) == []